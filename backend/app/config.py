@@ -0,0 +1,52 @@
+"""
+Application configuration loaded from config/config.yaml
+"""
+
+import os
+import logging
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+CONFIG_PATH = os.getenv(
+    "APP_CONFIG",
+    str(Path(__file__).resolve().parents[2] / "config" / "config.yaml")
+)
+
+
+@lru_cache(maxsize=1)
+def get_config() -> dict:
+    """
+    Load the YAML configuration once per process.
+
+    Returns:
+        Parsed configuration, or an empty dict if it cannot be read
+    """
+    try:
+        import yaml
+        with open(CONFIG_PATH, 'r') as f:
+            return yaml.safe_load(f) or {}
+    except Exception as e:
+        logger.warning(f"Could not load config from {CONFIG_PATH}: {e}")
+        return {}
+
+
+def get_setting(key: str, default: Any = None) -> Any:
+    """
+    Look up a dotted configuration key, e.g. "HEATMAP.VIOLATION_RADIUS".
+
+    Args:
+        key: Dotted path into the configuration
+        default: Value returned when the key is missing
+
+    Returns:
+        Configured value or default
+    """
+    value = get_config()
+    for part in key.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return default
+        value = value[part]
+    return value
@@ -0,0 +1,159 @@
+"""
+Archival job: moves closed, old challans and their violations to
+compressed JSON-lines files and deletes them from the hot tables
+"""
+
+import argparse
+import enum
+import gzip
+import json
+import logging
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List
+from sqlalchemy.orm import Session
+from backend.app.config import get_setting
+from backend.app.models.database import Challan, ChallanStatusEnum, Violation
+
+logger = logging.getLogger(__name__)
+
+CLOSED_STATUSES = (ChallanStatusEnum.PAID, ChallanStatusEnum.CANCELLED)
+
+
+def _row_to_dict(row) -> Dict:
+    """Serialize a mapped row column-by-column."""
+    data = {}
+    for column in row.__table__.columns:
+        value = getattr(row, column.name)
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif isinstance(value, enum.Enum):
+            value = value.value
+        data[column.name] = value
+    return data
+
+
+def _append_jsonl_gz(path: Path, rows: List[Dict]):
+    """Append rows as a new gzip member; gzip readers see one stream."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'ab') as raw:
+        with gzip.GzipFile(fileobj=raw, mode='ab') as f:
+            for row in rows:
+                f.write((json.dumps(row) + "\n").encode())
+        raw.flush()
+        os.fsync(raw.fileno())
+
+
+def archive_closed_challans(
+    db: Session,
+    older_than_days: int = None,
+    archive_dir: str = None,
+    batch_size: int = None
+) -> Dict[str, int]:
+    """
+    Archive paid/cancelled challans older than the retention window,
+    together with their violations.
+
+    Rows are written to <archive_dir>/<table>/<YYYY-MM>.jsonl.gz (by
+    month of the row's own timestamp) and fsynced before the delete is
+    committed. A crash between the two can leave a batch archived twice,
+    so restores should de-duplicate on id.
+
+    Args:
+        db: Database session
+        older_than_days: Retention window (DATABASE.ARCHIVE.RETENTION_DAYS)
+        archive_dir: Output directory (DATABASE.ARCHIVE.DIR)
+        batch_size: Challans per batch (DATABASE.ARCHIVE.BATCH_SIZE)
+
+    Returns:
+        Counts of archived challans and violations
+    """
+    older_than_days = older_than_days or get_setting("DATABASE.ARCHIVE.RETENTION_DAYS", 365)
+    archive_dir = Path(archive_dir or get_setting("DATABASE.ARCHIVE.DIR", "data/archive"))
+    batch_size = batch_size or get_setting("DATABASE.ARCHIVE.BATCH_SIZE", 5000)
+
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    stats = {'challans': 0, 'violations': 0}
+    last_id = 0
+
+    logger.info(f"Archiving closed challans issued before {cutoff.isoformat()}")
+
+    while True:
+        challans = db.query(Challan).filter(
+            Challan.status.in_(CLOSED_STATUSES),
+            Challan.issued_date < cutoff,
+            Challan.id > last_id
+        ).order_by(Challan.id).limit(batch_size).all()
+
+        if not challans:
+            break
+        last_id = challans[-1].id
+
+        violation_ids = [c.violation_id for c in challans]
+        violations = db.query(Violation).filter(
+            Violation.id.in_(violation_ids),
+            Violation.timestamp < cutoff
+        ).all()
+
+        for table_name, rows, ts_attr in (
+            ("challans", challans, "issued_date"),
+            ("violations", violations, "timestamp"),
+        ):
+            by_month: Dict[str, List[Dict]] = {}
+            for row in rows:
+                ts = getattr(row, ts_attr) or cutoff
+                by_month.setdefault(ts.strftime("%Y-%m"), []).append(_row_to_dict(row))
+            for month, month_rows in by_month.items():
+                _append_jsonl_gz(archive_dir / table_name / f"{month}.jsonl.gz", month_rows)
+
+        # The timestamp bound lets PostgreSQL prune partitions on delete
+        db.query(Violation).filter(
+            Violation.id.in_([v.id for v in violations]),
+            Violation.timestamp < cutoff
+        ).delete(synchronize_session=False)
+        db.query(Challan).filter(
+            Challan.id.in_([c.id for c in challans]),
+            Challan.issued_date < cutoff
+        ).delete(synchronize_session=False)
+        db.commit()
+        db.expunge_all()
+
+        stats['challans'] += len(challans)
+        stats['violations'] += len(violations)
+        logger.info(f"Archived batch: {len(challans)} challans, {len(violations)} violations")
+
+    if db.get_bind().dialect.name == "postgresql":
+        from backend.app.database.partitioning import drop_empty_partitions
+        with db.get_bind().begin() as conn:
+            drop_empty_partitions(conn, before=cutoff)
+
+    logger.info(f"Archival completed: {stats}")
+    return stats
+
+
+def main():
+    """Run the archival job once (e.g. from cron)."""
+    parser = argparse.ArgumentParser(description="Archive closed, old challans and violations")
+    parser.add_argument("--older-than-days", type=int, help="Retention window in days")
+    parser.add_argument("--archive-dir", type=str, help="Directory for archive files")
+    parser.add_argument("--batch-size", type=int, help="Challans per batch")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    from backend.app.database.database import SessionLocal
+    db = SessionLocal()
+    try:
+        archive_closed_challans(
+            db,
+            older_than_days=args.older_than_days,
+            archive_dir=args.archive_dir,
+            batch_size=args.batch_size
+        )
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -20,16 +20,27 @@ DB_HOST = os.getenv("DB_HOST", "localhost")
 DB_PORT = os.getenv("DB_PORT", "5432")
 DB_NAME = os.getenv("DB_NAME", "traffic_violations")
 
-DATABASE_URL = f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+# DATABASE_URL overrides the PostgreSQL settings, e.g. sqlite:///traffic.db for local testing
+DATABASE_URL = os.getenv(
+    "DATABASE_URL",
+    f"postgresql://{DB_USER}:{DB_PASSWORD}@{DB_HOST}:{DB_PORT}/{DB_NAME}"
+)
 
 # Create engine
-engine = create_engine(
-    DATABASE_URL,
-    echo=False,
-    pool_pre_ping=True,
-    pool_size=20,
-    max_overflow=40
-)
+if DATABASE_URL.startswith("sqlite"):
+    engine = create_engine(
+        DATABASE_URL,
+        echo=False,
+        connect_args={"check_same_thread": False}
+    )
+else:
+    engine = create_engine(
+        DATABASE_URL,
+        echo=False,
+        pool_pre_ping=True,
+        pool_size=20,
+        max_overflow=40
+    )
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -45,16 +56,62 @@ def get_db() -> Generator[Session, None, None]:
         db.close()
 
 
-def init_db():
+def partitioning_enabled() -> bool:
+    """
+    Whether violations/challans use monthly range partitions.
+    DB_PARTITIONED overrides DATABASE.PARTITIONING.ENABLED in config.yaml.
+    """
+    from backend.app.config import get_setting
+    env_value = os.getenv("DB_PARTITIONED")
+    if env_value is not None:
+        return env_value.lower() == "true"
+    return bool(get_setting("DATABASE.PARTITIONING.ENABLED", False))
+
+
+def init_db(partitioned: bool = None):
     """
     Initialize database tables
+    
+    Args:
+        partitioned: Create violations/challans as monthly range partitions
+            (PostgreSQL only). Defaults to partitioning_enabled().
     """
     from backend.app.models.database import Base
     logger.info(f"Initializing database at {DATABASE_URL}")
+    
+    if partitioned is None:
+        partitioned = partitioning_enabled()
+    
+    if partitioned:
+        if engine.dialect.name == "postgresql":
+            from backend.app.database.partitioning import create_partitioned_tables
+            with engine.begin() as conn:
+                create_partitioned_tables(conn, Base.metadata)
+        else:
+            logger.warning(f"Partitioning is only supported on PostgreSQL, not {engine.dialect.name}")
+    
+    # Skips tables that already exist, including the partitioned parents
     Base.metadata.create_all(bind=engine)
+    
+    if partitioned and engine.dialect.name == "postgresql":
+        maintain_partitions()
+    
     logger.info("Database tables created successfully")
 
 
+def maintain_partitions():
+    """
+    Pre-create upcoming monthly partitions. Called at startup and daily
+    by the API; safe to run from several processes.
+    """
+    from backend.app.config import get_setting
+    from backend.app.database.partitioning import ensure_future_partitions
+    
+    months_ahead = get_setting("DATABASE.PARTITIONING.MONTHS_AHEAD", 3)
+    with engine.begin() as conn:
+        return ensure_future_partitions(conn, months_ahead=months_ahead)
+
+
 def drop_db():
     """
     Drop all tables (for testing/cleanup)
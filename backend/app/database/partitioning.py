@@ -0,0 +1,194 @@
+"""
+Monthly range partitioning for the violations and challans tables (PostgreSQL)
+"""
+
+import logging
+import re
+from datetime import datetime
+from typing import List
+from sqlalchemy import Enum, MetaData, inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateIndex, CreateTable
+
+logger = logging.getLogger(__name__)
+
+# Table -> column it is range-partitioned on
+PARTITIONED_TABLES = {
+    "violations": "timestamp",
+    "challans": "issued_date",
+}
+
+
+def month_start(dt: datetime) -> datetime:
+    """First instant of the month containing dt."""
+    return datetime(dt.year, dt.month, 1)
+
+
+def add_months(dt: datetime, months: int) -> datetime:
+    """Shift a month start by a number of months."""
+    index = dt.year * 12 + (dt.month - 1) + months
+    return datetime(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(table_name: str, month: datetime) -> str:
+    """Name of the partition holding a given month, e.g. violations_y2025m01."""
+    return f"{table_name}_y{month.year:04d}m{month.month:02d}"
+
+
+def is_partitioned(conn: Connection, table_name: str) -> bool:
+    """Whether table_name exists as a partitioned parent table."""
+    row = conn.execute(text(
+        "SELECT 1 FROM pg_partitioned_table pt "
+        "JOIN pg_class c ON c.oid = pt.partrelid "
+        "WHERE c.relname = :name"
+    ), {"name": table_name}).first()
+    return row is not None
+
+
+def create_partitioned_tables(conn: Connection, metadata: MetaData):
+    """
+    Create the partitioned parents before metadata.create_all() runs.
+
+    PostgreSQL requires the partition key in every primary key and unique
+    index, so the primary key becomes (id, <partition column>) and unique
+    indexes that do not contain the key are created as plain indexes (with
+    a warning). challans.challan_number loses its unique index this way,
+    which is why EChallanService.generate_challan_number() makes numbers
+    unique by construction. Tables that already exist are left untouched.
+
+    Args:
+        conn: Connection inside a transaction
+        metadata: Declarative metadata holding the table definitions
+    """
+    existing = set(inspect(conn).get_table_names())
+    preparer = conn.dialect.identifier_preparer
+
+    for table_name, column in PARTITIONED_TABLES.items():
+        if table_name in existing:
+            if not is_partitioned(conn, table_name):
+                logger.warning(
+                    f"Table {table_name} already exists unpartitioned; "
+                    f"migrate it manually to enable partitioning"
+                )
+            continue
+
+        table = metadata.tables[table_name]
+        quoted_column = preparer.quote(column)
+
+        for col in table.columns:
+            if isinstance(col.type, Enum):
+                col.type.create(conn, checkfirst=True)
+
+        ddl = str(CreateTable(table).compile(dialect=conn.dialect)).strip()
+        ddl = re.sub(
+            r"PRIMARY KEY \(id\)",
+            f"PRIMARY KEY (id, {quoted_column})",
+            ddl
+        )
+        conn.execute(text(f"{ddl} PARTITION BY RANGE ({quoted_column})"))
+
+        # Catch-all for rows outside the pre-created months
+        conn.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {table_name}_default "
+            f"PARTITION OF {table_name} DEFAULT"
+        ))
+
+        for index in table.indexes:
+            index_ddl = str(CreateIndex(index).compile(dialect=conn.dialect))
+            if index.unique and column not in index.columns:
+                index_ddl = index_ddl.replace("CREATE UNIQUE INDEX", "CREATE INDEX", 1)
+                logger.warning(
+                    f"Unique index {index.name} on {table_name} does not include "
+                    f"the partition key {column}; creating it as a non-unique index"
+                )
+            conn.execute(text(index_ddl))
+
+        logger.info(f"Created partitioned table {table_name} on {column}")
+
+
+def ensure_future_partitions(
+    conn: Connection,
+    months_ahead: int = 3,
+    now: datetime = None
+) -> List[str]:
+    """
+    Create monthly partitions from the current month to months_ahead.
+
+    Safe to call repeatedly; existing partitions are skipped.
+
+    Args:
+        conn: Connection inside a transaction
+        months_ahead: Number of future months to pre-create
+        now: Reference time (defaults to utcnow)
+
+    Returns:
+        Names of partitions that were created
+    """
+    current = month_start(now or datetime.utcnow())
+    existing = set(inspect(conn).get_table_names())
+    created = []
+
+    for table_name in PARTITIONED_TABLES:
+        if table_name not in existing or not is_partitioned(conn, table_name):
+            continue
+
+        for offset in range(months_ahead + 1):
+            start = add_months(current, offset)
+            end = add_months(start, 1)
+            name = partition_name(table_name, start)
+            if name in existing:
+                continue
+
+            # A savepoint keeps one failed partition (e.g. the default
+            # partition already holds rows for that month) from aborting
+            # the rest
+            savepoint = conn.begin_nested()
+            try:
+                conn.execute(text(
+                    f"CREATE TABLE IF NOT EXISTS {name} PARTITION OF {table_name} "
+                    f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+                ))
+                savepoint.commit()
+                created.append(name)
+            except Exception as e:
+                savepoint.rollback()
+                logger.error(f"Could not create partition {name}: {str(e)}")
+
+    if created:
+        logger.info(f"Created partitions: {', '.join(created)}")
+    return created
+
+
+def drop_empty_partitions(conn: Connection, before: datetime) -> List[str]:
+    """
+    Drop monthly partitions that end before `before` and hold no rows.
+
+    Run after archival so fully archived months stop costing planning time.
+
+    Args:
+        conn: Connection inside a transaction
+        before: Only partitions whose month ends on or before this time
+
+    Returns:
+        Names of dropped partitions
+    """
+    dropped = []
+    pattern = re.compile(r"^(?P<table>\w+)_y(?P<year>\d{4})m(?P<month>\d{2})$")
+
+    for name in inspect(conn).get_table_names():
+        match = pattern.match(name)
+        if not match or match.group("table") not in PARTITIONED_TABLES:
+            continue
+
+        start = datetime(int(match.group("year")), int(match.group("month")), 1)
+        if add_months(start, 1) > before:
+            continue
+
+        has_rows = conn.execute(text(f"SELECT 1 FROM {name} LIMIT 1")).first()
+        if has_rows is None:
+            conn.execute(text(f"DROP TABLE {name}"))
+            dropped.append(name)
+
+    if dropped:
+        logger.info(f"Dropped empty partitions: {', '.join(dropped)}")
+    return dropped
@@ -0,0 +1,87 @@
+"""
+Dialect-aware upsert helpers for rollup/counter tables
+"""
+
+from typing import Dict, Any, List, Type
+from sqlalchemy.orm import Session
+
+
+def upsert_increments(
+    db: Session,
+    model: Type,
+    rows: List[Dict[str, Any]],
+    key_columns: List[str],
+    increment_columns: List[str]
+):
+    """
+    Insert rows or add to their counters where the key already exists.
+
+    Uses a single multi-row INSERT ... ON CONFLICT DO UPDATE on PostgreSQL
+    and SQLite so concurrent writers never lose increments. Other dialects
+    fall back to a locked read-modify-write per row. Keys must be distinct
+    within one call.
+
+    Args:
+        db: Database session
+        model: Mapped model class with a unique constraint over key_columns
+        rows: Full column values for each row to insert
+        key_columns: Columns identifying a row
+        increment_columns: Columns added to on conflict
+    """
+    if not rows:
+        return
+
+    dialect = db.get_bind().dialect.name
+
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert
+
+        table = model.__table__
+        stmt = insert(table).values(rows)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=key_columns,
+            set_={
+                col: table.c[col] + stmt.excluded[col]
+                for col in increment_columns
+            }
+        )
+        db.execute(stmt)
+        return
+
+    for values in rows:
+        keys = {col: values[col] for col in key_columns}
+        row = db.query(model).filter_by(**keys).with_for_update().first()
+        if row is None:
+            db.add(model(**values))
+        else:
+            for col in increment_columns:
+                setattr(row, col, (getattr(row, col) or 0) + values[col])
+
+
+def upsert_increment(
+    db: Session,
+    model: Type,
+    keys: Dict[str, Any],
+    increments: Dict[str, Any],
+    values: Dict[str, Any] = None
+):
+    """
+    Insert a row or add to its counters if the key already exists.
+
+    Args:
+        db: Database session
+        model: Mapped model class with a unique constraint over ``keys``
+        keys: Column values identifying the row
+        increments: Column -> amount to add
+        values: Extra columns written only when the row is inserted
+    """
+    upsert_increments(
+        db,
+        model,
+        rows=[{**keys, **increments, **(values or {})}],
+        key_columns=list(keys),
+        increment_columns=list(increments)
+    )
@@ -5,6 +5,7 @@ FastAPI Application Main Entry Point
 from fastapi import FastAPI, Depends, HTTPException, status
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
+import asyncio
 import logging
 import os
 import secrets
@@ -118,11 +119,13 @@ from backend.app.routes.violations import router as violations_router
 from backend.app.routes.challan import router as challan_router
 from backend.app.routes.analytics import router as analytics_router
 from backend.app.routes.camera import router as camera_router
+from backend.app.routes.jobs import router as jobs_router
 
 app.include_router(violations_router)
 app.include_router(challan_router)
 app.include_router(analytics_router)
 app.include_router(camera_router)
+app.include_router(jobs_router)
 
 
 @app.on_event("startup")
@@ -139,25 +142,87 @@ async def startup_event():
         logger.warning(f"Database not available: {str(e)}")
         logger.warning("Running in limited mode without database persistence")
         logger.warning("To enable full features, start a PostgreSQL database on localhost:5432")
+        return
+    
+    from backend.app.database.database import engine, partitioning_enabled
+    if partitioning_enabled() and engine.dialect.name == "postgresql":
+        asyncio.create_task(_partition_maintenance_loop())
+    
+    # Register cameras from camera_locations (the owner process does this
+    # itself when the API runs several workers)
+    from backend.app.services.camera_owner import owner_process_enabled
+    if owner_process_enabled():
+        return
+    try:
+        from backend.app.config import get_setting
+        from backend.app.services.camera_service import get_camera_manager
+        
+        manager = get_camera_manager()
+        if get_setting("CAMERA.SHARED_MEMORY", False):
+            manager.enable_shared_memory()
+        manager.load_from_db()
+        if get_setting("CAMERA.AUTOSTART", False):
+            started = manager.start_all()
+            logger.info(f"Started {sum(started.values())}/{len(started)} cameras")
+    except Exception as e:
+        logger.warning(f"Could not load cameras: {str(e)}")
+
+
+async def _partition_maintenance_loop():
+    """Keep future monthly partitions created while the API runs."""
+    from backend.app.database.database import maintain_partitions
+    
+    while True:
+        await asyncio.sleep(24 * 60 * 60)
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, maintain_partitions)
+        except Exception as e:
+            logger.error(f"Partition maintenance failed: {str(e)}")
 
 
 @app.on_event("shutdown")
 async def shutdown_event():
     """Cleanup on shutdown."""
     logger.info("Shutting down Traffic Violation Detection API")
+    
+    from backend.app.services.camera_owner import owner_process_enabled
+    if not owner_process_enabled():
+        from backend.app.services.camera_service import get_camera_manager
+        get_camera_manager().stop_all()
 
 
 if __name__ == "__main__":
     import uvicorn
+    from backend.app.config import get_setting
     
     host = os.getenv("API_HOST", "0.0.0.0")
     port = int(os.getenv("API_PORT", 8000))
     reload = os.getenv("DEBUG", "True").lower() == "true"
+    # --reload supervises a single worker
+    workers = 1 if reload else int(os.getenv("API_WORKERS", get_setting("API.WORKERS", 1)))
     
-    uvicorn.run(
-        "main:app",
-        host=host,
-        port=port,
-        reload=reload,
-        workers=1
-    )
+    owner = None
+    if workers > 1:
+        # Cameras live in one owner process; every worker talks to it
+        import multiprocessing
+        from backend.app.services.camera_owner import configure_owner, run_owner
+        
+        owner_address = ("127.0.0.1", get_setting("CAMERA.OWNER_PORT", 8765))
+        authkey = configure_owner(owner_address)
+        owner = multiprocessing.Process(
+            target=run_owner, args=(owner_address, authkey), name="camera-owner"
+        )
+        owner.start()
+    
+    try:
+        uvicorn.run(
+            "main:app",
+            host=host,
+            port=port,
+            reload=reload,
+            workers=workers
+        )
+    finally:
+        if owner is not None:
+            owner.terminate()
+            owner.join(timeout=5)
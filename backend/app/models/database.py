@@ -3,7 +3,10 @@ Database models for Traffic Violation Detection System
 """
 
 from datetime import datetime
-from sqlalchemy import Column, Integer, String, Float, DateTime, Boolean, Text, Enum
+from sqlalchemy import (
+    Column, Integer, String, Float, DateTime, Boolean, Text, Enum,
+    Index, UniqueConstraint
+)
 from sqlalchemy.ext.declarative import declarative_base
 import enum
 
@@ -40,6 +43,16 @@ class Violation(Base):
     Traffic Violation Record
     """
     __tablename__ = "violations"
+    __table_args__ = (
+        # Serves bounding-box/radius lookups: geohash prefix ranges, then time
+        Index("ix_violations_geohash_timestamp", "geohash", "timestamp"),
+        # Keyset pagination on (timestamp, id), optionally behind an equality filter
+        Index("ix_violations_timestamp_id", "timestamp", "id"),
+        Index("ix_violations_vehicle_timestamp_id", "vehicle_number", "timestamp", "id"),
+        Index("ix_violations_type_timestamp_id", "violation_type", "timestamp", "id"),
+        Index("ix_violations_severity_timestamp_id", "severity", "timestamp", "id"),
+        Index("ix_violations_camera_timestamp_id", "camera_id", "timestamp", "id"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     
@@ -52,10 +65,12 @@ class Violation(Base):
     latitude = Column(Float)
     longitude = Column(Float)
     location_name = Column(String(255))
-    timestamp = Column(DateTime, default=datetime.utcnow, index=True)
+    geohash = Column(String(12))  # Precision-9 geohash of latitude/longitude
+    camera_id = Column(String(50))
+    timestamp = Column(DateTime, default=datetime.utcnow)
     
     # Vehicle Details
-    vehicle_number = Column(String(20), index=True)
+    vehicle_number = Column(String(20))
     vehicle_type = Column(String(50))  # Two-wheeler, Four-wheeler, etc.
     
     # Evidence
@@ -132,21 +147,30 @@ class Challan(Base):
 
 class ViolationHeatmapData(Base):
     """
-    Aggregated violation data for heatmap visualization
+    Aggregated violation data for heatmap visualization.
+    One row per grid cell x hour x violation type; latitude/longitude
+    are the cell centre snapped to HEATMAP.VIOLATION_RADIUS.
     """
     __tablename__ = "heatmap_data"
+    __table_args__ = (
+        UniqueConstraint(
+            "latitude", "longitude", "date", "hour", "violation_type",
+            name="uq_heatmap_cell_hour"
+        ),
+        Index("ix_heatmap_date_cell", "date", "latitude", "longitude"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     
-    latitude = Column(Float, index=True)
-    longitude = Column(Float, index=True)
+    latitude = Column(Float, nullable=False)
+    longitude = Column(Float, nullable=False)
     
     violation_count = Column(Integer, default=0)
-    violation_type = Column(Enum(ViolationTypeEnum))
+    violation_type = Column(Enum(ViolationTypeEnum), nullable=False)
     
     # Time aggregation
-    date = Column(DateTime, index=True)
-    hour = Column(Integer)  # 0-23
+    date = Column(DateTime, nullable=False)  # Day bucket (midnight UTC)
+    hour = Column(Integer, nullable=False)  # 0-23
     
     severity_score = Column(Float, default=0.0)  # Higher = more severe area
     
@@ -156,6 +180,34 @@ class ViolationHeatmapData(Base):
         return f"<HeatmapData(lat={self.latitude}, lng={self.longitude}, count={self.violation_count})>"
 
 
+class AnalyticsCounter(Base):
+    """
+    Incrementally maintained counters behind the analytics endpoints.
+    One row per granularity x bucket x metric x dimension value.
+    """
+    __tablename__ = "analytics_counters"
+    __table_args__ = (
+        UniqueConstraint(
+            "granularity", "bucket", "metric", "dimension", "dimension_value",
+            name="uq_analytics_counter"
+        ),
+        Index("ix_analytics_counter_lookup", "metric", "granularity", "dimension", "bucket"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    
+    granularity = Column(String(10), nullable=False)  # DAY, HOUR
+    bucket = Column(DateTime, nullable=False)  # Start of the day/hour (UTC)
+    metric = Column(String(30), nullable=False)  # violations, challans, revenue, severity
+    dimension = Column(String(20), nullable=False)  # all, type, location, camera, zone, zone_type
+    dimension_value = Column(String(255), nullable=False, default="")  # "" for dimension "all"
+    
+    value = Column(Float, default=0.0)
+    
+    def __repr__(self):
+        return f"<AnalyticsCounter({self.metric}/{self.dimension}={self.dimension_value}, {self.granularity} {self.bucket}: {self.value})>"
+
+
 class CameraLocation(Base):
     """
     Registered CCTV Camera Locations
@@ -173,6 +225,10 @@ class CameraLocation(Base):
     
     rtsp_url = Column(String(500))  # RTSP stream URL
     is_active = Column(Boolean, default=True)
+    priority = Column(Float, default=1.0)  # Relative share of live inference
+    roi = Column(Text)  # JSON polygons of enforced lanes, pixels or 0-1 fractions
+    tile_size = Column(Integer)  # Tiled detection tile side; NULL uses DETECTION.TILING.TILE_SIZE
+    inference_profile = Column(Text)  # JSON {"helmet": {"imgsz": 416}, "plate": {...}}
     
     # Coverage details
     coverage_area = Column(String(255))
@@ -196,13 +252,42 @@ class ProcessingQueue(Base):
     source_type = Column(String(20))  # IMAGE, VIDEO
     camera_id = Column(String(50))
     
+    # Location used when camera_id is not a registered CameraLocation
+    latitude = Column(Float)
+    longitude = Column(Float)
+    location_name = Column(String(255))
+    
     status = Column(String(50), default="PENDING")  # PENDING, PROCESSING, COMPLETED, FAILED
     priority = Column(Integer, default=0)
     
+    # Worker lease and retries
+    worker_id = Column(String(100))
+    attempts = Column(Integer, default=0)
+    max_attempts = Column(Integer, default=3)
+    available_at = Column(DateTime, default=datetime.utcnow)  # Not claimed before this (retry backoff)
+    started_at = Column(DateTime)
+    heartbeat_at = Column(DateTime)
+    
+    # Progress reported by the worker while the job runs
+    frames_processed = Column(Integer, default=0)
+    total_frames = Column(Integer)
+    fps = Column(Float)
+    violations_found = Column(Integer, default=0)
+    
     processed_at = Column(DateTime)
     error_message = Column(Text)
+    result = Column(Text)  # JSON statistics from the pipeline
     
     created_at = Column(DateTime, default=datetime.utcnow)
     
     def __repr__(self):
         return f"<ProcessingQueue(id={self.id}, status={self.status})>"
+
+
+# Claim order: highest priority first, then oldest
+Index(
+    "ix_processing_queue_claim",
+    ProcessingQueue.status,
+    ProcessingQueue.priority.desc(),
+    ProcessingQueue.created_at
+)
@@ -2,27 +2,34 @@
 API Routes for Analytics & Heatmap Endpoints
 """
 
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.orm import Session
 from typing import Optional
 from datetime import datetime, timedelta
 import logging
+from backend.app.database.database import get_db
+from backend.app.models.database import ViolationTypeEnum
 
 router = APIRouter(prefix="/api/analytics", tags=["analytics"])
 logger = logging.getLogger(__name__)
 
 
 @router.get("/heatmap/data")
-async def get_heatmap_data(
+def get_heatmap_data(
     days: int = Query(7, ge=1, le=365),
     violation_type: Optional[str] = None,
     min_lat: Optional[float] = None,
     max_lat: Optional[float] = None,
     min_lng: Optional[float] = None,
-    max_lng: Optional[float] = None
+    max_lng: Optional[float] = None,
+    db: Session = Depends(get_db)
 ):
     """
     Get violation heatmap data for visualization.
     
+    Served from the grid-cell x hour rollups in heatmap_data, so the cost
+    depends on the number of cells in range rather than on violation rows.
+    
     Args:
         days: Number of days to look back
         violation_type: Filter by violation type
@@ -32,27 +39,49 @@ async def get_heatmap_data(
         Heatmap data points
     """
     try:
-        # TODO: Query database for heatmap data
-        # Aggregate violations by location
+        from backend.app.services.heatmap import HeatmapService
+        
+        type_filter = None
+        if violation_type:
+            try:
+                type_filter = ViolationTypeEnum(violation_type)
+            except ValueError:
+                raise HTTPException(status_code=400, detail=f"Unknown violation type: {violation_type}")
+        
+        result = HeatmapService.get_heatmap(
+            db,
+            days=days,
+            violation_type=type_filter,
+            min_lat=min_lat,
+            max_lat=max_lat,
+            min_lng=min_lng,
+            max_lng=max_lng
+        )
         
         return {
             "status": "success",
-            "heatmap_data": [],
-            "total_violations": 0,
+            "heatmap_data": result["heatmap_data"],
+            "total_violations": result["total_violations"],
             "period": f"Last {days} days"
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching heatmap data: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/summary")
-async def get_analytics_summary(
-    days: int = Query(7, ge=1, le=365)
+def get_analytics_summary(
+    days: int = Query(7, ge=1, le=365),
+    db: Session = Depends(get_db)
 ):
     """
     Get summary statistics of violations.
     
+    Read from incrementally maintained counters and cached for
+    ANALYTICS.CACHE_TTL_SECONDS, so dashboards can poll frequently.
+    
     Args:
         days: Number of days to look back
         
@@ -60,18 +89,17 @@ async def get_analytics_summary(
         Summary statistics
     """
     try:
-        # TODO: Calculate summary stats from database
+        from backend.app.services.analytics import AnalyticsService, analytics_cache
+        
+        summary = analytics_cache.get_or_compute(
+            ("summary", days),
+            lambda: AnalyticsService.get_summary(db, days)
+        )
         
         return {
             "status": "success",
             "period": f"Last {days} days",
-            "summary": {
-                "total_violations": 0,
-                "total_challans_issued": 0,
-                "total_revenue_collected": 0,
-                "violations_by_type": {},
-                "violations_by_location": {}
-            }
+            "summary": summary
         }
     except Exception as e:
         logger.error(f"Error fetching analytics summary: {str(e)}")
@@ -79,9 +107,10 @@ async def get_analytics_summary(
 
 
 @router.get("/trends")
-async def get_violation_trends(
+def get_violation_trends(
     days: int = Query(30, ge=1, le=365),
-    violation_type: Optional[str] = None
+    violation_type: Optional[str] = None,
+    db: Session = Depends(get_db)
 ):
     """
     Get violation trends over time.
@@ -94,30 +123,42 @@ async def get_violation_trends(
         Trend data for visualization
     """
     try:
-        # TODO: Query database and calculate trends
+        from backend.app.services.analytics import AnalyticsService, analytics_cache
+        
+        if violation_type:
+            try:
+                violation_type = ViolationTypeEnum(violation_type).value
+            except ValueError:
+                raise HTTPException(status_code=400, detail=f"Unknown violation type: {violation_type}")
+        
+        trends = analytics_cache.get_or_compute(
+            ("trends", days, violation_type),
+            lambda: AnalyticsService.get_trends(db, days, violation_type)
+        )
         
         return {
             "status": "success",
             "period": f"Last {days} days",
-            "trends": {
-                "daily_violations": [],
-                "hourly_violations": [],
-                "location_trends": []
-            }
+            "trends": trends
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error fetching trends: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/high-risk-zones")
-async def get_high_risk_zones(
+def get_high_risk_zones(
     days: int = Query(30, ge=1, le=365),
-    limit: int = Query(10, ge=1, le=50)
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db)
 ):
     """
     Get locations with highest violation frequency.
     
+    Zones are geohash cells (precision 6, roughly 1.2 km x 0.6 km).
+    
     Args:
         days: Number of days to analyze
         limit: Number of zones to return
@@ -126,12 +167,17 @@ async def get_high_risk_zones(
         List of high-risk zones
     """
     try:
-        # TODO: Query database for violation hotspots
+        from backend.app.services.analytics import AnalyticsService, analytics_cache
+        
+        zones = analytics_cache.get_or_compute(
+            ("high-risk-zones", days, limit),
+            lambda: AnalyticsService.get_high_risk_zones(db, days, limit)
+        )
         
         return {
             "status": "success",
             "period": f"Last {days} days",
-            "high_risk_zones": []
+            "high_risk_zones": zones
         }
     except Exception as e:
         logger.error(f"Error fetching high-risk zones: {str(e)}")
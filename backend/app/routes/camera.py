@@ -2,9 +2,14 @@
 Real-time camera and photo capture API endpoints
 """
 
-from fastapi import APIRouter, HTTPException, Form
+from fastapi import APIRouter, HTTPException, Form, Query, WebSocket, WebSocketDisconnect
 from fastapi.responses import StreamingResponse, JSONResponse
+from starlette.concurrency import run_in_threadpool
+import anyio
+import asyncio
 import logging
+import struct
+import time
 from typing import Optional
 import base64
 from datetime import datetime
@@ -12,23 +17,158 @@ from datetime import datetime
 router = APIRouter(prefix="/api/camera", tags=["camera"])
 logger = logging.getLogger(__name__)
 
+DEFAULT_CAMERA_ID = "default"
+
+# Live viewers block a thread while they wait for frames. They get their
+# own limiter, sized to the viewer cap, so they never exhaust the shared
+# threadpool that sync routes and run_in_threadpool depend on.
+_viewers = 0
+_viewer_limiter = None
+
+
+def _max_viewers() -> int:
+    from backend.app.config import get_setting
+    
+    return get_setting("CAMERA.MAX_VIEWERS", 64)
+
+
+def _claim_viewer() -> bool:
+    """
+    Take a viewer slot if one is free.
+
+    Checks and counts in one step with no await in between, so a burst of
+    requests cannot all pass the check before any of them is counted.
+    """
+    global _viewers
+    if _viewers >= _max_viewers():
+        return False
+    _viewers += 1
+    return True
+
+
+def _release_viewer():
+    global _viewers
+    _viewers = max(0, _viewers - 1)
+
+
+async def _stream_call(method, *args):
+    """Run a blocking stream-session call on the viewers' own threads."""
+    global _viewer_limiter
+    if _viewer_limiter is None:
+        _viewer_limiter = anyio.CapacityLimiter(_max_viewers())
+    return await anyio.to_thread.run_sync(method, *args, limiter=_viewer_limiter)
+
+
+class _ViewerStream(StreamingResponse):
+    """
+    Streaming response that owns a viewer slot and stream session
+
+    Both are released when the response finishes, including when the
+    client disconnects before the body generator ever starts.
+    """
+    
+    def __init__(self, content, session, **kwargs):
+        super().__init__(content, **kwargs)
+        self.session = session
+    
+    async def __call__(self, scope, receive, send):
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            _release_viewer()
+            # Runs even when the client disconnect cancelled the stream
+            with anyio.CancelScope(shield=True):
+                await _stream_call(self.session.close)
+
+
+def _backend():
+    """Cameras in this process, or the camera owner process when the API runs several workers."""
+    from backend.app.services.camera_owner import get_camera_backend
+    
+    return get_camera_backend()
+
+
+async def _camera_call(method, *args, **kwargs):
+    """Run a camera backend call off the event loop, mapping its errors to HTTP."""
+    from backend.app.services.camera_owner import CameraNotFound, FrameUnavailable, OwnerUnavailable
+    
+    try:
+        return await run_in_threadpool(method, *args, **kwargs)
+    except CameraNotFound as e:
+        raise HTTPException(status_code=404, detail=f"Camera {e.args[0]} not found")
+    except FrameUnavailable as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except OwnerUnavailable as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+@router.get("/list")
+async def list_cameras():
+    """List registered cameras and their capture status"""
+    try:
+        cameras = await _camera_call(_backend().list_cameras)
+        return {
+            "status": "success",
+            "total": len(cameras),
+            "cameras": cameras
+        }
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error listing cameras: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/reload")
+async def reload_cameras():
+    """Register cameras from active camera_locations rows"""
+    try:
+        registered = await _camera_call(_backend().reload)
+        return {
+            "status": "success",
+            "registered": registered
+        }
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error reloading cameras: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
 
 @router.post("/start")
 async def start_camera():
     """Start real-time camera capture"""
+    return await start_camera_by_id(DEFAULT_CAMERA_ID)
+
+
+@router.post("/{camera_id}/start")
+async def start_camera_by_id(camera_id: str):
+    """
+    Start capture for one camera
+    
+    Only cameras registered from CameraLocation rows (rtsp_url is the
+    source) or the default device can be started; callers cannot point
+    the server at a source of their own.
+    
+    Args:
+        camera_id: Camera ID
+    """
     try:
-        from backend.app.services.camera_service import start_camera
-        
-        success = start_camera()
+        success = await _camera_call(_backend().start, camera_id)
         if success:
             return {
                 "status": "success",
-                "message": "Camera started successfully",
-                "stream_url": "/api/camera/stream"
+                "message": f"Camera {camera_id} started successfully",
+                "stream_url": "/api/camera/stream" if camera_id == DEFAULT_CAMERA_ID
+                else f"/api/camera/{camera_id}/stream"
             }
         else:
             raise HTTPException(status_code=500, detail="Failed to start camera")
-            
+    
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error starting camera: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -37,15 +177,21 @@ async def start_camera():
 @router.post("/stop")
 async def stop_camera():
     """Stop camera capture"""
+    return await stop_camera_by_id(DEFAULT_CAMERA_ID)
+
+
+@router.post("/{camera_id}/stop")
+async def stop_camera_by_id(camera_id: str):
+    """Stop capture for one camera"""
     try:
-        from backend.app.services.camera_service import stop_camera
-        
-        stop_camera()
+        await _camera_call(_backend().stop, camera_id)
         return {
             "status": "success",
-            "message": "Camera stopped successfully"
+            "message": f"Camera {camera_id} stopped successfully"
         }
-        
+    
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error stopping camera: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -54,89 +200,256 @@ async def stop_camera():
 @router.get("/stream")
 async def camera_stream():
     """Stream real-time camera feed (MJPEG)"""
+    return await camera_stream_by_id(DEFAULT_CAMERA_ID, width=None, quality=80)
+
+
+@router.get("/{camera_id}/stream")
+async def camera_stream_by_id(
+    camera_id: str,
+    width: Optional[int] = Query(None, ge=64, le=3840),
+    quality: int = Query(80, ge=10, le=100)
+):
+    """
+    Stream one camera's feed (MJPEG)
+    
+    Each frame is JPEG-encoded once and shared by every viewer; a viewer
+    that falls behind skips to the newest frame. Viewers beyond
+    CAMERA.MAX_VIEWERS get 503.
+    
+    Args:
+        camera_id: Camera ID
+        width: Downscale to this width (default full size)
+        quality: JPEG quality
+    """
     try:
-        import cv2
-        from backend.app.services.camera_service import get_camera
-        
-        camera = get_camera()
+        status = await _camera_call(_backend().status, camera_id)
+        if status["status"] == "stopped":
+            raise HTTPException(status_code=400, detail=f"Camera {camera_id} is not running")
+        if not _claim_viewer():
+            raise HTTPException(status_code=503, detail="Too many live viewers")
+        try:
+            session = _backend().session()
+        except Exception:
+            _release_viewer()
+            raise
         
-        def generate_stream():
+        async def generate_stream():
             """Generate MJPEG stream"""
+            last = 0
             while True:
-                frame = camera.get_frame()
-                if frame is None:
+                update = await _stream_call(session.next_frame, camera_id, last, 1.0, width, quality)
+                if update["sequence"] is None:
+                    if update["closed"] or not update["running"]:
+                        break
                     continue
-                
-                # Encode frame to JPEG
-                ret, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 80])
-                if not ret:
-                    continue
-                
+                last = update["sequence"]
+                jpeg = update["jpeg"]
                 # Yield frame in MJPEG format
                 yield (b'--frame\r\n'
                        b'Content-Type: image/jpeg\r\n'
-                       b'Content-Length: ' + str(len(buffer)).encode() + b'\r\n\r\n'
-                       + buffer.tobytes() + b'\r\n')
+                       b'Content-Length: ' + str(len(jpeg)).encode() + b'\r\n\r\n'
+                       + jpeg + b'\r\n')
         
-        return StreamingResponse(
+        # The slot and session are released when the response finishes
+        return _ViewerStream(
             generate_stream(),
+            session,
             media_type="multipart/x-mixed-replace; boundary=frame"
         )
-        
+    
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error streaming camera: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _ws_settings(current: dict, requested: dict) -> dict:
+    """Clamp client-negotiated stream settings."""
+    settings = dict(current)
+    if "width" in requested:
+        width = requested["width"]
+        settings["width"] = min(3840, max(64, int(width))) if width else None
+    if "fps" in requested:
+        settings["fps"] = min(30.0, max(0.5, float(requested["fps"])))
+    if "quality" in requested:
+        settings["quality"] = min(100, max(10, int(requested["quality"])))
+    for flag in ("overlay", "frames"):
+        if flag in requested:
+            value = requested[flag]
+            settings[flag] = value if isinstance(value, bool) else str(value).lower() in ("1", "true", "yes")
+    return settings
+
+
+@router.websocket("/ws")
+async def camera_websocket(websocket: WebSocket):
+    """Push the default camera's frames over a WebSocket"""
+    await camera_websocket_by_id(websocket, DEFAULT_CAMERA_ID)
+
+
+@router.websocket("/{camera_id}/ws")
+async def camera_websocket_by_id(websocket: WebSocket, camera_id: str):
+    """
+    Push one camera's frames over a WebSocket
+    
+    Binary messages are JPEG frames prefixed with the frame sequence
+    number (4 bytes, big-endian). Text messages are JSON: "detection"
+    carries a violation/challan result, "overlay" (with overlay=true)
+    carries per-frame boxes, classes, confidences, plate text and track
+    ids for the client to draw, "status" reports the camera stopping.
+    Query parameters width, fps, quality, overlay and frames (false for
+    metadata only) set the initial stream; the client may send the same
+    keys as JSON at any time to renegotiate. Frames the client is too
+    slow for are skipped. Viewers beyond CAMERA.MAX_VIEWERS are closed
+    with code 1013.
+    """
+    await websocket.accept()
+    if not _claim_viewer():
+        await websocket.send_json({"type": "status", "status": "too_many_viewers", "camera_id": camera_id})
+        await websocket.close(code=1013)
+        return
+    try:
+        await _serve_websocket(websocket, camera_id)
+    finally:
+        _release_viewer()
+
+
+async def _serve_websocket(websocket: WebSocket, camera_id: str):
+    """Body of camera_websocket_by_id; the caller holds a viewer slot."""
+    from backend.app.services.camera_owner import CameraNotFound
+    
+    session = _backend().session()
+    try:
+        last_event = await _stream_call(session.event_version, camera_id)
+    except CameraNotFound:
+        await _stream_call(session.close)
+        await websocket.send_json({"type": "status", "status": "not_found", "camera_id": camera_id})
+        await websocket.close(code=1008)
+        return
+    
+    try:
+        settings = _ws_settings(
+            {"width": None, "fps": 10.0, "quality": 70, "overlay": False, "frames": True},
+            dict(websocket.query_params)
+        )
+    except ValueError:
+        await _stream_call(session.close)
+        await websocket.close(code=1003)
+        return
+    
+    connected = True
+    
+    async def receive_settings():
+        nonlocal settings, connected
+        try:
+            while True:
+                message = await websocket.receive_json()
+                settings = _ws_settings(settings, message)
+        except (WebSocketDisconnect, ValueError, TypeError):
+            connected = False
+    
+    receiver = asyncio.create_task(receive_settings())
+    subscribed = False
+    last_sequence = 0
+    last_overlay = 0
+    
+    try:
+        while connected:
+            if settings["overlay"] != subscribed:
+                if subscribed:
+                    await _stream_call(session.overlay_unsubscribe, camera_id)
+                    subscribed = False
+                elif await _stream_call(session.overlay_subscribe, camera_id):
+                    subscribed = True
+                else:
+                    settings["overlay"] = False
+                    await websocket.send_json({"type": "status", "status": "overlay_unavailable", "camera_id": camera_id})
+            
+            started = time.monotonic()
+            update = await _stream_call(
+                session.next_frame, camera_id, last_sequence, 1.0,
+                settings["width"], settings["quality"], settings["frames"],
+                last_overlay, last_event
+            )
+            if update["sequence"] is None:
+                if update["closed"] or not update["running"]:
+                    await websocket.send_json({"type": "status", "status": "stopped", "camera_id": camera_id})
+                    break
+                continue
+            
+            last_sequence = update["sequence"]
+            if update["jpeg"] is not None:
+                await websocket.send_bytes(struct.pack(">I", last_sequence & 0xFFFFFFFF) + update["jpeg"])
+            
+            if "overlay" in update:
+                last_overlay = update["overlay_version"]
+                await websocket.send_json({"type": "overlay", **update["overlay"]})
+            
+            if "event" in update:
+                last_event = update["event_version"]
+                await websocket.send_json({"type": "detection", **update["event"]})
+            
+            # Pace to the negotiated rate; frames in between are skipped
+            delay = 1.0 / settings["fps"] - (time.monotonic() - started)
+            if delay > 0:
+                await asyncio.sleep(delay)
+    
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logger.error(f"Error in camera websocket: {str(e)}")
+    finally:
+        receiver.cancel()
+        # Releases the overlay subscription
+        await _stream_call(session.close)
+        if connected:
+            try:
+                await websocket.close()
+            except Exception:
+                pass
+
+
 @router.post("/capture")
 async def capture_photo(
-    latitude: float = Form(default=28.7041),
-    longitude: float = Form(default=77.1025),
-    location_name: str = Form(default="Delhi")
+    latitude: Optional[float] = Form(default=None),
+    longitude: Optional[float] = Form(default=None),
+    location_name: Optional[str] = Form(default=None)
+):
+    """Capture photo from the default camera"""
+    return await capture_photo_by_id(DEFAULT_CAMERA_ID, latitude, longitude, location_name)
+
+
+@router.post("/{camera_id}/capture")
+async def capture_photo_by_id(
+    camera_id: str,
+    latitude: Optional[float] = Form(default=None),
+    longitude: Optional[float] = Form(default=None),
+    location_name: Optional[str] = Form(default=None)
 ):
     """
     Capture photo and generate E-challan if violation detected
     
     Args:
-        latitude: Location latitude
-        longitude: Location longitude
-        location_name: Location name
-        
+        camera_id: Camera ID
+        latitude: Location latitude (defaults to the camera's)
+        longitude: Location longitude (defaults to the camera's)
+        location_name: Location name (defaults to the camera's)
+    
     Returns:
         Photo with violation and E-challan info
     """
     try:
-        from backend.app.services.camera_service import get_camera, RealtimeDetectionPipeline
-        import numpy as np
-        
-        camera = get_camera()
-        frame = camera.get_frame()
-        
-        if frame is None:
-            raise HTTPException(status_code=400, detail="No camera frame available")
-        
-        # Save photo
-        photo_path = camera.capture_photo()
-        if not photo_path:
-            raise HTTPException(status_code=500, detail="Failed to capture photo")
-        
-        # Process for violations
-        pipeline = RealtimeDetectionPipeline()
-        pipeline.initialize_services()
-        
-        result = pipeline.process_frame(
-            frame,
-            latitude=latitude,
-            longitude=longitude,
-            location_name=location_name
+        # Saves the latest frame and analyses it for violations
+        result = await _camera_call(
+            _backend().detect, camera_id, latitude, longitude, location_name, capture=True
         )
-        
-        # Add photo path to result
-        result["photo_path"] = photo_path
+        photo_path = result["photo_path"]
+        location = result["location"]
         result["timestamp"] = datetime.now().isoformat()
         
         return {
             "status": result["status"],
+            "camera_id": camera_id,
             "photo": photo_path,
             "violations_detected": result["violations_detected"],
             "vehicle_number": result["vehicle_number"],
@@ -146,12 +459,12 @@ async def capture_photo(
             "penalty_amount": result["penalty_amount"],
             "timestamp": result["timestamp"],
             "location": {
-                "latitude": latitude,
-                "longitude": longitude,
-                "name": location_name
+                "latitude": location["latitude"],
+                "longitude": location["longitude"],
+                "name": location["location_name"]
             }
         }
-        
+    
     except HTTPException:
         raise
     except Exception as e:
@@ -162,32 +475,31 @@ async def capture_photo(
 @router.get("/current-frame")
 async def get_current_frame():
     """Get current frame as base64-encoded image"""
+    return await get_current_frame_by_id(DEFAULT_CAMERA_ID)
+
+
+@router.get("/{camera_id}/current-frame")
+async def get_current_frame_by_id(camera_id: str):
+    """Get one camera's current frame as base64-encoded image"""
     try:
-        import cv2
-        from backend.app.services.camera_service import get_camera
-        import base64
-        
-        camera = get_camera()
-        frame = camera.get_frame()
-        
-        if frame is None:
+        # Reuses the stream's encoding of this frame if there is one
+        snapshot = await _camera_call(_backend().snapshot, camera_id)
+        if snapshot is None:
             raise HTTPException(status_code=400, detail="No frame available")
-        
-        # Encode to JPEG
-        ret, buffer = cv2.imencode('.jpg', frame)
-        if not ret:
-            raise HTTPException(status_code=500, detail="Failed to encode frame")
+        sequence, jpeg = snapshot
         
         # Convert to base64
-        img_base64 = base64.b64encode(buffer).decode()
+        img_base64 = base64.b64encode(jpeg).decode()
         
         return {
             "status": "success",
+            "camera_id": camera_id,
+            "sequence": sequence,
             "image": img_base64,
             "format": "jpeg",
             "timestamp": datetime.now().isoformat()
         }
-        
+    
     except HTTPException:
         raise
     except Exception as e:
@@ -197,9 +509,20 @@ async def get_current_frame():
 
 @router.post("/detect-violation")
 async def detect_violation_realtime(
-    latitude: float = Form(default=28.7041),
-    longitude: float = Form(default=77.1025),
-    location_name: str = Form(default="Delhi")
+    latitude: Optional[float] = Form(default=None),
+    longitude: Optional[float] = Form(default=None),
+    location_name: Optional[str] = Form(default=None)
+):
+    """Analyze the default camera's current frame for violations"""
+    return await detect_violation_by_id(DEFAULT_CAMERA_ID, latitude, longitude, location_name)
+
+
+@router.post("/{camera_id}/detect-violation")
+async def detect_violation_by_id(
+    camera_id: str,
+    latitude: Optional[float] = Form(default=None),
+    longitude: Optional[float] = Form(default=None),
+    location_name: Optional[str] = Form(default=None)
 ):
     """
     Analyze current frame for violations without capturing
@@ -208,27 +531,14 @@ async def detect_violation_realtime(
         Violation detection results
     """
     try:
-        from backend.app.services.camera_service import get_camera, RealtimeDetectionPipeline
-        
-        camera = get_camera()
-        frame = camera.get_frame()
-        
-        if frame is None:
-            raise HTTPException(status_code=400, detail="No camera frame available")
-        
-        # Process frame
-        pipeline = RealtimeDetectionPipeline()
-        pipeline.initialize_services()
-        
-        result = pipeline.process_frame(
-            frame,
-            latitude=latitude,
-            longitude=longitude,
-            location_name=location_name
+        result = await _camera_call(
+            _backend().detect, camera_id, latitude, longitude, location_name
         )
+        location = result["location"]
         
         return {
             "status": result["status"],
+            "camera_id": camera_id,
             "violations_detected": result["violations_detected"],
             "vehicle_number": result["vehicle_number"],
             "helmet_violations": result["helmet_violations"],
@@ -237,12 +547,12 @@ async def detect_violation_realtime(
             "penalty_amount": result["penalty_amount"],
             "timestamp": datetime.now().isoformat(),
             "location": {
-                "latitude": latitude,
-                "longitude": longitude,
-                "name": location_name
+                "latitude": location["latitude"],
+                "longitude": location["longitude"],
+                "name": location["location_name"]
             }
         }
-        
+    
     except HTTPException:
         raise
     except Exception as e:
@@ -250,22 +560,48 @@ async def detect_violation_realtime(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/scheduler")
+async def inference_scheduler_status():
+    """Live inference share, served fps and drops per camera"""
+    try:
+        return {
+            "status": "success",
+            "scheduler": await _camera_call(_backend().scheduler)
+        }
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting scheduler status: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/status")
 async def camera_status():
-    """Get camera status"""
+    """Get camera status, with capture health for every registered camera"""
+    try:
+        summary = await _camera_call(_backend().summary, DEFAULT_CAMERA_ID)
+        summary["cameras"] = await _camera_call(_backend().health)
+        return summary
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error getting camera status: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/{camera_id}/status")
+async def camera_status_by_id(camera_id: str):
+    """Get one camera's capture status"""
     try:
-        from backend.app.services.camera_service import get_camera
-        
-        camera = get_camera()
-        frame = camera.get_frame()
-        
         return {
-            "status": "running" if camera.is_running and frame is not None else "stopped",
-            "camera_index": camera.camera_index,
-            "frames_captured": camera.frame_count,
-            "has_frame": frame is not None
+            "status": "success",
+            "camera": await _camera_call(_backend().status, camera_id)
         }
-        
+    
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting camera status: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
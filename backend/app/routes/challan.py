@@ -2,9 +2,11 @@
 API Routes for E-Challan Endpoints
 """
 
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends
+from sqlalchemy.orm import Session
 from typing import Optional
 import logging
+from backend.app.database.database import get_db
 from backend.app.services.echallan import EChallanService, ChallanNotificationService
 from backend.app.models.database import Challan, ChallanStatusEnum
 
@@ -109,11 +111,12 @@ async def update_challan_status(
 
 
 @router.post("/{challan_id}/payment")
-async def record_challan_payment(
+def record_challan_payment(
     challan_id: int,
     amount: float,
     payment_method: str = "ONLINE",
-    transaction_id: Optional[str] = None
+    transaction_id: Optional[str] = None,
+    db: Session = Depends(get_db)
 ):
     """
     Record payment for challan.
@@ -128,12 +131,39 @@ async def record_challan_payment(
         Updated challan with payment info
     """
     try:
-        # TODO: Update challan with payment info
+        from backend.app.services.analytics import AnalyticsService
+        
+        if amount <= 0:
+            raise HTTPException(status_code=400, detail="Payment amount must be positive")
+        
+        # Row lock: concurrent payments for one challan apply one at a time
+        challan = db.query(Challan).filter(Challan.id == challan_id).with_for_update().first()
+        if challan is None:
+            raise HTTPException(status_code=404, detail="Challan not found")
+        
+        previously_paid = challan.paid_amount or 0.0
+        if previously_paid >= challan.penalty_amount:
+            raise HTTPException(status_code=409, detail="Challan is already paid")
+        
+        EChallanService.record_payment(
+            challan,
+            amount=amount,
+            payment_method=payment_method,
+            transaction_id=transaction_id
+        )
+        applied = challan.paid_amount - previously_paid
+        AnalyticsService.record_payment(db, challan, applied)
+        db.commit()
+        
         return {
             "status": "success",
             "message": "Payment recorded successfully",
-            "challan_status": "PAID"
+            "challan_status": challan.status.value,
+            "amount_applied": applied,
+            "balance_amount": max(0.0, challan.penalty_amount - challan.paid_amount)
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error recording payment: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
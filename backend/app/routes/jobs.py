@@ -0,0 +1,344 @@
+"""
+API Routes for Asynchronous Processing Jobs
+"""
+
+from fastapi import APIRouter, HTTPException, Request, Query
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from typing import Optional
+from datetime import datetime
+from pathlib import Path
+import asyncio
+import json
+import logging
+import os
+import uuid
+from backend.app.config import get_setting
+
+router = APIRouter(prefix="/api/jobs", tags=["jobs"])
+logger = logging.getLogger(__name__)
+
+VIDEO_EXTENSIONS = {".mp4", ".avi", ".mkv", ".mov", ".ts", ".h264", ".dav"}
+WRITE_BUFFER_SIZE = 1024 * 1024
+TERMINAL_STATUSES = {"COMPLETED", "FAILED"}
+
+
+class UploadTooLarge(Exception):
+    """Raised when an upload exceeds STORAGE.MAX_VIDEO_SIZE."""
+
+
+async def _save_stream(chunks, destination: Path, max_bytes: int) -> int:
+    """
+    Write an async byte stream to disk in ~1 MB writes off the event loop.
+
+    Writes to a .part file and renames it on success so workers never
+    see a partial upload.
+
+    Returns:
+        Number of bytes written
+    """
+    partial = destination.with_name(destination.name + ".part")
+    written = 0
+    buffer = bytearray()
+    f = await run_in_threadpool(open, partial, "wb")
+    try:
+        async for chunk in chunks:
+            if not chunk:
+                continue
+            written += len(chunk)
+            if written > max_bytes:
+                raise UploadTooLarge()
+            buffer.extend(chunk)
+            if len(buffer) >= WRITE_BUFFER_SIZE:
+                await run_in_threadpool(f.write, bytes(buffer))
+                buffer.clear()
+        if buffer:
+            await run_in_threadpool(f.write, bytes(buffer))
+        await run_in_threadpool(f.close)
+        os.replace(partial, destination)
+        return written
+    except BaseException:
+        f.close()
+        partial.unlink(missing_ok=True)
+        raise
+
+
+class _MultipartUpload:
+    """
+    One file field of a multipart body, parsed as the body arrives.
+
+    Starlette's request.form() spools the whole upload to a temp file
+    before the size limit can be checked; this feeds the request stream
+    through python-multipart's incremental parser instead and hands the
+    field's bytes straight to _save_stream.
+    """
+
+    def __init__(self, request: Request, max_bytes: int, field: str = "file"):
+        from multipart.multipart import MultipartParser, parse_options_header
+
+        _, params = parse_options_header(request.headers.get("content-type", ""))
+        boundary = params.get(b"boundary")
+        if not boundary:
+            raise HTTPException(status_code=400, detail="Missing multipart boundary")
+
+        self.body = request.stream().__aiter__()
+        self.max_bytes = max_bytes
+        self.field = field.encode()
+        self.received = 0
+        self.filename = None
+        self.found = False
+        self.finished = False
+        self.data = []
+        self._headers = {}
+        self._header_field = b""
+        self._header_value = b""
+        self._in_field = False
+        self._parse_options_header = parse_options_header
+        self.parser = MultipartParser(boundary, {
+            'on_part_begin': self._on_part_begin,
+            'on_header_field': lambda data, start, end: self._append_header('_header_field', data[start:end]),
+            'on_header_value': lambda data, start, end: self._append_header('_header_value', data[start:end]),
+            'on_header_end': self._on_header_end,
+            'on_headers_finished': self._on_headers_finished,
+            'on_part_data': self._on_part_data,
+            'on_part_end': self._on_part_end,
+        })
+
+    def _append_header(self, name: str, data: bytes):
+        setattr(self, name, getattr(self, name) + bytes(data))
+
+    def _on_part_begin(self):
+        self._headers = {}
+
+    def _on_header_end(self):
+        self._headers[self._header_field.lower()] = self._header_value
+        self._header_field = b""
+        self._header_value = b""
+
+    def _on_headers_finished(self):
+        _, options = self._parse_options_header(self._headers.get(b"content-disposition", b""))
+        if options.get(b"name") == self.field and not self.found:
+            self.found = True
+            self._in_field = True
+            self.filename = options.get(b"filename", b"").decode("utf-8", "replace") or None
+
+    def _on_part_data(self, data, start: int, end: int):
+        if self._in_field:
+            self.data.append(bytes(data[start:end]))
+
+    def _on_part_end(self):
+        if self._in_field:
+            self._in_field = False
+            self.finished = True
+
+    async def _feed(self) -> bool:
+        """Parse the next body chunk; False at the end of the body."""
+        try:
+            chunk = await self.body.__anext__()
+        except StopAsyncIteration:
+            return False
+        self.received += len(chunk)
+        if self.received > self.max_bytes:
+            raise UploadTooLarge()
+        self.parser.write(chunk)
+        return True
+
+    async def start(self) -> Optional[str]:
+        """
+        Read up to the file field's headers.
+
+        Returns:
+            The uploaded file name
+        """
+        while not self.found:
+            if not await self._feed():
+                raise HTTPException(status_code=400, detail="Missing 'file' field")
+        return self.filename
+
+    async def chunks(self):
+        """Yield the file field's bytes; the rest of the body is not read."""
+        while True:
+            while self.data:
+                yield self.data.pop(0)
+            if self.finished or not await self._feed():
+                return
+
+
+def _load_job(job_id: int) -> Optional[dict]:
+    """Fetch a job in its own short-lived session."""
+    from backend.app.database.database import SessionLocal
+    from backend.app.models.database import ProcessingQueue
+    from backend.app.services.job_queue import JobQueue
+
+    db = SessionLocal()
+    try:
+        job = db.query(ProcessingQueue).filter(ProcessingQueue.id == job_id).first()
+        return JobQueue.to_dict(job) if job else None
+    finally:
+        db.close()
+
+
+@router.post("/video")
+async def submit_video_job(
+    request: Request,
+    filename: Optional[str] = Query(None, description="Original file name (raw uploads)"),
+    camera_id: Optional[str] = None,
+    latitude: Optional[float] = None,
+    longitude: Optional[float] = None,
+    location_name: Optional[str] = None,
+    priority: int = 0
+):
+    """
+    Upload a video and queue it for processing.
+
+    Accepts either a raw body (Content-Type: application/octet-stream,
+    the cheapest path for multi-GB exports) or a multipart form with a
+    "file" field. Either way the body is streamed to STORAGE.UPLOAD_DIR
+    once, under the STORAGE.MAX_VIDEO_SIZE cap, and never held in memory
+    or spooled to a temp file first.
+
+    Args:
+        filename: Original file name for raw uploads
+        camera_id: Camera that recorded the video
+        latitude, longitude, location_name: Location if the camera is not registered
+        priority: Higher runs first
+
+    Returns:
+        Job id and URLs for progress polling/streaming
+    """
+    try:
+        from backend.app.database.database import SessionLocal
+        from backend.app.services.job_queue import JobQueue
+
+        upload_dir = Path(get_setting("STORAGE.UPLOAD_DIR", "data/uploads"))
+        upload_dir.mkdir(parents=True, exist_ok=True)
+        max_bytes = get_setting("STORAGE.MAX_VIDEO_SIZE", 20 * 1024 ** 3)
+
+        try:
+            content_type = request.headers.get("content-type", "")
+            if content_type.startswith("multipart/form-data"):
+                upload = _MultipartUpload(request, max_bytes)
+                filename = filename or await upload.start()
+                chunks = upload.chunks()
+            else:
+                chunks = request.stream()
+
+            suffix = Path(filename or "").suffix.lower() or ".mp4"
+            if suffix not in VIDEO_EXTENSIONS:
+                raise HTTPException(status_code=400, detail=f"Unsupported video type: {suffix}")
+
+            destination = upload_dir / f"{datetime.utcnow():%Y%m%d_%H%M%S}_{uuid.uuid4().hex[:8]}{suffix}"
+            size = await _save_stream(chunks, destination, max_bytes)
+        except UploadTooLarge:
+            raise HTTPException(status_code=413, detail=f"Video exceeds {max_bytes} bytes")
+
+        if size == 0:
+            destination.unlink(missing_ok=True)
+            raise HTTPException(status_code=400, detail="Empty upload")
+
+        def enqueue():
+            db = SessionLocal()
+            try:
+                job = JobQueue.enqueue(
+                    db,
+                    source_path=str(destination),
+                    source_type="VIDEO",
+                    camera_id=camera_id,
+                    priority=priority,
+                    latitude=latitude,
+                    longitude=longitude,
+                    location_name=location_name
+                )
+                return job.id
+            finally:
+                db.close()
+
+        job_id = await run_in_threadpool(enqueue)
+        logger.info(f"Video job {job_id} queued ({size} bytes)")
+
+        return {
+            "status": "success",
+            "job_id": job_id,
+            "bytes_received": size,
+            "status_url": f"/api/jobs/{job_id}",
+            "events_url": f"/api/jobs/{job_id}/events"
+        }
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error submitting video job: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/{job_id}")
+async def get_job(job_id: int):
+    """
+    Get job status and progress.
+
+    Args:
+        job_id: Job ID
+
+    Returns:
+        Job details with frames processed, fps and violations so far
+    """
+    try:
+        job = await run_in_threadpool(_load_job, job_id)
+        if job is None:
+            raise HTTPException(status_code=404, detail="Job not found")
+        return {"status": "success", "job": job}
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error fetching job: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.get("/{job_id}/events")
+async def stream_job_events(job_id: int, request: Request):
+    """
+    Stream job progress as server-sent events.
+
+    Emits a "progress" event whenever the job row changes and a final
+    "done" event when it completes or fails.
+
+    Args:
+        job_id: Job ID
+    """
+    job = await run_in_threadpool(_load_job, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    poll_interval = get_setting("WORKER.PROGRESS_INTERVAL", 1.0)
+    keepalive_every = 15.0
+
+    async def event_stream():
+        last_payload = None
+        idle = 0.0
+        current = job
+        while True:
+            payload = json.dumps(current)
+            if payload != last_payload:
+                event = "done" if current["status"] in TERMINAL_STATUSES else "progress"
+                yield f"event: {event}\ndata: {payload}\n\n"
+                last_payload = payload
+                idle = 0.0
+                if event == "done":
+                    return
+            elif idle >= keepalive_every:
+                yield ": keep-alive\n\n"
+                idle = 0.0
+
+            await asyncio.sleep(poll_interval)
+            idle += poll_interval
+            if await request.is_disconnected():
+                return
+            current = await run_in_threadpool(_load_job, job_id)
+            if current is None:
+                return
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -2,14 +2,61 @@
 API Routes for Violation Detection Endpoints
 """
 
-from fastapi import APIRouter, UploadFile, File, Form, HTTPException
-from typing import Optional
+from fastapi import APIRouter, UploadFile, File, Form, HTTPException, Depends, Query
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.orm import Session
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+from datetime import datetime, timedelta
+from pathlib import Path
+import asyncio
+import json
 import logging
-from backend.app.models.database import Violation
+import shutil
+import tempfile
+import threading
+import zipfile
+from backend.app.config import get_setting
+from backend.app.database.database import SessionLocal, get_db
+from backend.app.models.database import Violation, ViolationTypeEnum, ViolationSeverityEnum
 
 router = APIRouter(prefix="/api/violations", tags=["violations"])
 logger = logging.getLogger(__name__)
 
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".webp"}
+
+# cv2.imdecode releases the GIL, so a small pool decodes in parallel
+_decode_pool = ThreadPoolExecutor(
+    max_workers=get_setting("PERFORMANCE.NUM_WORKERS", 4),
+    thread_name_prefix="image-decode"
+)
+
+# One pipeline (models) shared by batch requests; each request writes
+# through its own session. The lock serializes inference so concurrent
+# requests queue instead of thrashing
+_batch_pipeline = None
+_batch_pipeline_lock = threading.Lock()
+
+
+def _violation_to_dict(violation: Violation) -> dict:
+    """Serialize a violation row for API responses."""
+    return {
+        "id": violation.id,
+        "violation_type": getattr(violation.violation_type, "value", violation.violation_type),
+        "severity": getattr(violation.severity, "value", violation.severity),
+        "vehicle_number": violation.vehicle_number,
+        "latitude": violation.latitude,
+        "longitude": violation.longitude,
+        "location_name": violation.location_name,
+        "camera_id": violation.camera_id,
+        "timestamp": violation.timestamp.isoformat() if violation.timestamp else None,
+        "detection_confidence": violation.detection_confidence,
+        "image_path": violation.image_path,
+        "challan_id": violation.challan_id,
+        "is_processed": violation.is_processed
+    }
+
 
 @router.post("/detect")
 async def detect_violation(
@@ -64,35 +111,326 @@ async def detect_violation(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _spool_uploads(files: List[UploadFile]) -> List[tuple]:
+    """
+    Copy uploads into temporary files owned by the request.
+    
+    The form's UploadFiles are closed by the framework, which newer
+    FastAPI releases do before a StreamingResponse body runs, so the
+    batch reads its own copies.
+    
+    Returns:
+        (filename, content_type, file) triples; close them with _close_spooled()
+    """
+    spooled = []
+    try:
+        for upload in files:
+            copy = tempfile.TemporaryFile()
+            spooled.append((upload.filename, upload.content_type, copy))
+            upload.file.seek(0)
+            shutil.copyfileobj(upload.file, copy, 1024 * 1024)
+            copy.seek(0)
+    except Exception:
+        _close_spooled(spooled)
+        raise
+    return spooled
+
+
+def _close_spooled(spooled: List[tuple]):
+    for _, _, f in spooled:
+        f.close()
+
+
+def _expand_uploads(files: List[tuple], max_images: int) -> List[tuple]:
+    """
+    Flatten spooled images and zip archives into (filename, reader) pairs.
+    
+    Readers are called later on the decode pool so file contents are never
+    all held in memory at once.
+    """
+    max_bytes = get_setting("STORAGE.MAX_EVIDENCE_SIZE", 50 * 1024 * 1024)
+    items = []
+    for filename, content_type, upload in files:
+        name = filename or "upload"
+        if Path(name).suffix.lower() == ".zip" or content_type in ("application/zip", "application/x-zip-compressed"):
+            try:
+                archive = zipfile.ZipFile(upload)
+            except zipfile.BadZipFile:
+                raise HTTPException(status_code=400, detail=f"Invalid zip archive: {name}")
+            for member in archive.infolist():
+                if member.is_dir() or Path(member.filename).suffix.lower() not in IMAGE_EXTENSIONS:
+                    continue
+                if member.file_size > max_bytes:
+                    raise HTTPException(status_code=413, detail=f"{member.filename} exceeds {max_bytes} bytes")
+                items.append((f"{name}/{member.filename}", lambda a=archive, m=member: a.read(m)))
+        else:
+            items.append((name, lambda f=upload: f.read()))
+        
+        if len(items) > max_images:
+            raise HTTPException(status_code=413, detail=f"Batch exceeds {max_images} images")
+    return items
+
+
+def _decode_image(read):
+    """Read and decode one image; returns None if it is not a valid image."""
+    import cv2
+    import numpy as np
+    
+    data = read()
+    if not data:
+        return None
+    return cv2.imdecode(np.frombuffer(data, np.uint8), cv2.IMREAD_COLOR)
+
+
+def _run_batch(db: Session, images: list, latitude: float, longitude: float,
+               location_name: str, camera_id: Optional[str]) -> list:
+    """Run one inference batch through the shared pipeline, writing through db."""
+    global _batch_pipeline
+    with _batch_pipeline_lock:
+        if _batch_pipeline is None:
+            from backend.app.services.processing_worker import default_pipeline_factory
+            _batch_pipeline = default_pipeline_factory()
+        outputs = _batch_pipeline.process_batch(
+            images,
+            latitude=latitude,
+            longitude=longitude,
+            location_name=location_name,
+            camera_id=camera_id,
+            db=db
+        )
+        return [
+            {
+                "violations": [_violation_to_dict(v) for v in output["violations"]],
+                "challans": [c.challan_number for c in output["challans"]]
+            }
+            for output in outputs
+        ]
+
+
+def _ndjson(record: dict) -> bytes:
+    return (json.dumps(record, default=str) + "\n").encode()
+
+
+@router.post("/detect/batch")
+async def detect_violations_batch(
+    files: List[UploadFile] = File(...),
+    latitude: float = Form(...),
+    longitude: float = Form(...),
+    location_name: str = Form(...),
+    camera_id: Optional[str] = Form(None),
+    batch_size: Optional[int] = Form(None)
+):
+    """
+    Detect violations in many images (or zip archives of images) at once.
+    
+    Uploads are copied to temporary files before the response starts.
+    Images are then decoded in a thread pool and run through the detectors
+    in batches, writing through a session opened for this request.
+    Results stream back as newline-delimited JSON, one line per image as
+    soon as its batch completes, followed by a summary line.
+    
+    Args:
+        files: Image files and/or zip archives
+        latitude: Location latitude
+        longitude: Location longitude
+        location_name: Location name
+        camera_id: Camera ID (optional)
+        batch_size: Images per inference batch (PERFORMANCE.BATCH_SIZE)
+        
+    Returns:
+        application/x-ndjson stream of per-image results
+    """
+    spooled = []
+    try:
+        spooled = await run_in_threadpool(_spool_uploads, files)
+        items = _expand_uploads(spooled, get_setting("PERFORMANCE.MAX_BATCH_IMAGES", 1000))
+        if not items:
+            raise HTTPException(status_code=400, detail="No images found in upload")
+        
+        batch_size = max(1, batch_size or get_setting("PERFORMANCE.BATCH_SIZE", 16))
+        batches = [items[i:i + batch_size] for i in range(0, len(items), batch_size)]
+    except HTTPException:
+        _close_spooled(spooled)
+        raise
+    except Exception as e:
+        _close_spooled(spooled)
+        logger.error(f"Error reading batch upload: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+    
+    async def stream_results():
+        db = SessionLocal()
+        try:
+            async for line in batch_results(db):
+                yield line
+        finally:
+            await run_in_threadpool(db.close)
+            _close_spooled(spooled)
+    
+    async def batch_results(db):
+        loop = asyncio.get_running_loop()
+        summary = {"summary": True, "images": len(items), "processed": 0, "failed": 0, "violations_detected": 0}
+        
+        def decode(batch):
+            return [loop.run_in_executor(_decode_pool, _decode_image, read) for _, read in batch]
+        
+        # Decode batch N+1 while batch N is in inference
+        next_decodes = decode(batches[0])
+        for number, batch in enumerate(batches):
+            decoded = await asyncio.gather(*next_decodes, return_exceptions=True)
+            next_decodes = decode(batches[number + 1]) if number + 1 < len(batches) else []
+            
+            valid = []
+            for offset, ((name, _), image) in enumerate(zip(batch, decoded)):
+                index = number * batch_size + offset
+                if image is None or isinstance(image, Exception):
+                    summary["failed"] += 1
+                    yield _ndjson({"index": index, "filename": name, "status": "error",
+                                   "error": "Invalid image file"})
+                else:
+                    valid.append((index, name, image))
+            if not valid:
+                continue
+            
+            try:
+                outputs = await run_in_threadpool(
+                    _run_batch, db, [image for _, _, image in valid],
+                    latitude, longitude, location_name, camera_id
+                )
+            except Exception as e:
+                logger.error(f"Error processing batch: {str(e)}")
+                summary["failed"] += len(valid)
+                for index, name, _ in valid:
+                    yield _ndjson({"index": index, "filename": name, "status": "error", "error": str(e)})
+                continue
+            
+            for (index, name, _), output in zip(valid, outputs):
+                summary["processed"] += 1
+                summary["violations_detected"] += len(output["violations"])
+                yield _ndjson({
+                    "index": index,
+                    "filename": name,
+                    "status": "success",
+                    "violations_detected": len(output["violations"]),
+                    "violations": output["violations"],
+                    "challans": output["challans"]
+                })
+        
+        yield _ndjson(summary)
+    
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
+
+
 @router.get("/list")
-async def list_violations(
-    skip: int = 0,
-    limit: int = 100,
-    vehicle_number: Optional[str] = None
+def list_violations(
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    vehicle_number: Optional[str] = None,
+    violation_type: Optional[ViolationTypeEnum] = None,
+    severity: Optional[ViolationSeverityEnum] = None,
+    camera_id: Optional[str] = None,
+    start_time: Optional[datetime] = None,
+    end_time: Optional[datetime] = None,
+    db: Session = Depends(get_db)
 ):
     """
-    List all violations with optional filters.
+    List violations newest first with optional filters.
+    
+    Uses keyset pagination on (timestamp, id): pass the returned
+    next_cursor to fetch the following page.
     
     Args:
-        skip: Number of records to skip
+        cursor: Opaque cursor from the previous page
         limit: Maximum records to return
         vehicle_number: Filter by vehicle number
+        violation_type: Filter by violation type
+        severity: Filter by severity
+        camera_id: Filter by camera
+        start_time: Only violations at or after this time
+        end_time: Only violations before this time
         
     Returns:
-        List of violations
+        Page of violations and the cursor for the next page
     """
     try:
-        # TODO: Query database for violations
+        from backend.app.services.pagination import keyset_paginate
+        
+        query = db.query(Violation)
+        if vehicle_number:
+            query = query.filter(Violation.vehicle_number == vehicle_number)
+        if violation_type:
+            query = query.filter(Violation.violation_type == violation_type)
+        if severity:
+            query = query.filter(Violation.severity == severity)
+        if camera_id:
+            query = query.filter(Violation.camera_id == camera_id)
+        if start_time:
+            query = query.filter(Violation.timestamp >= start_time)
+        if end_time:
+            query = query.filter(Violation.timestamp < end_time)
+        
+        try:
+            violations, next_cursor = keyset_paginate(
+                query, Violation.timestamp, Violation.id, cursor=cursor, limit=limit
+            )
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
         return {
             "status": "success",
-            "total": 0,
-            "violations": []
+            "count": len(violations),
+            "violations": [_violation_to_dict(v) for v in violations],
+            "next_cursor": next_cursor
         }
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error listing violations: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/nearby")
+def list_nearby_violations(
+    latitude: float,
+    longitude: float,
+    radius_m: float = Query(500, gt=0, le=50000),
+    days: int = Query(7, ge=1, le=365),
+    limit: int = Query(100, ge=1, le=1000),
+    db: Session = Depends(get_db)
+):
+    """
+    List violations within a radius of a point.
+    
+    Args:
+        latitude: Centre latitude
+        longitude: Centre longitude
+        radius_m: Search radius in meters
+        days: Number of days to look back
+        limit: Maximum records to return
+        
+    Returns:
+        Violations ordered by distance
+    """
+    try:
+        from backend.app.services.spatial_index import SpatialIndex
+        
+        violations = SpatialIndex.query_radius(
+            db,
+            latitude=latitude,
+            longitude=longitude,
+            radius_m=radius_m,
+            since=datetime.utcnow() - timedelta(days=days),
+            limit=limit
+        )
+        return {
+            "status": "success",
+            "total": len(violations),
+            "violations": [_violation_to_dict(v) for v in violations]
+        }
+    except Exception as e:
+        logger.error(f"Error listing nearby violations: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/{violation_id}")
 async def get_violation(violation_id: int):
     """
@@ -0,0 +1,269 @@
+"""
+Analytics Service
+Incremental counters for dashboard statistics and a TTL response cache
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session
+from backend.app.config import get_setting
+from backend.app.database.upsert import upsert_increments
+from backend.app.models.database import AnalyticsCounter, Challan, Violation
+from backend.app.services import geohash
+from backend.app.services.cache import TTLCache
+from backend.app.services.heatmap import HeatmapService
+from backend.app.services.spatial_index import ZONE_PRECISION
+
+logger = logging.getLogger(__name__)
+
+DAY = "DAY"
+HOUR = "HOUR"
+
+# Shared by the analytics routes. Writes in this process invalidate it;
+# other API workers see new data once their entries expire.
+analytics_cache = TTLCache(
+    ttl_seconds=get_setting("ANALYTICS.CACHE_TTL_SECONDS", 5)
+)
+
+# Session.info flag set when a transaction changes the counters
+_COUNTERS_CHANGED = "analytics_counters_changed"
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_after_commit(session: Session):
+    # Invalidating before the commit would let a concurrent reader cache
+    # the pre-commit counters for a full TTL
+    if session.info.pop(_COUNTERS_CHANGED, False):
+        analytics_cache.invalidate()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_on_rollback(session: Session):
+    session.info.pop(_COUNTERS_CHANGED, None)
+
+
+def _day(ts: datetime) -> datetime:
+    return datetime(ts.year, ts.month, ts.day)
+
+
+def _hour(ts: datetime) -> datetime:
+    return datetime(ts.year, ts.month, ts.day, ts.hour)
+
+
+def _enum_value(value) -> Optional[str]:
+    return getattr(value, 'value', value)
+
+
+class AnalyticsService:
+    """
+    Service for maintaining and reading analytics counters
+    """
+
+    @staticmethod
+    def _bump(db: Session, entries: List[tuple]):
+        """
+        Add to a set of counters in one statement.
+
+        Args:
+            db: Database session
+            entries: (granularity, bucket, metric, dimension, value, amount)
+        """
+        rows = [
+            {
+                'granularity': granularity,
+                'bucket': bucket,
+                'metric': metric,
+                'dimension': dimension,
+                'dimension_value': value or "",
+                'value': amount
+            }
+            for granularity, bucket, metric, dimension, value, amount in entries
+        ]
+        upsert_increments(
+            db,
+            AnalyticsCounter,
+            rows=rows,
+            key_columns=['granularity', 'bucket', 'metric', 'dimension', 'dimension_value'],
+            increment_columns=['value']
+        )
+        db.info[_COUNTERS_CHANGED] = True
+
+    @staticmethod
+    def record_violation(db: Session, violation: Violation):
+        """
+        Count a violation by day and hour, per type, location and camera.
+
+        Must run in the same transaction that persists the violation.
+        """
+        ts = violation.timestamp or datetime.utcnow()
+        vtype = _enum_value(violation.violation_type)
+        entries = []
+
+        for granularity, bucket in ((DAY, _day(ts)), (HOUR, _hour(ts))):
+            entries.append((granularity, bucket, 'violations', 'all', None, 1))
+            entries.append((granularity, bucket, 'violations', 'type', vtype, 1))
+            if violation.location_name:
+                entries.append((granularity, bucket, 'violations', 'location', violation.location_name, 1))
+            if violation.camera_id:
+                entries.append((granularity, bucket, 'violations', 'camera', violation.camera_id, 1))
+
+        if violation.geohash:
+            zone = violation.geohash[:ZONE_PRECISION]
+            weight = HeatmapService.SEVERITY_WEIGHTS.get(violation.severity, 1.0)
+            entries.append((DAY, _day(ts), 'violations', 'zone', zone, 1))
+            entries.append((DAY, _day(ts), 'violations', 'zone_type', f"{zone}:{vtype}", 1))
+            entries.append((DAY, _day(ts), 'severity', 'zone', zone, weight))
+
+        AnalyticsService._bump(db, entries)
+
+    @staticmethod
+    def record_challan(db: Session, challan: Challan):
+        """Count an issued challan. Run in the transaction that persists it."""
+        ts = challan.issued_date or datetime.utcnow()
+        AnalyticsService._bump(db, [
+            (DAY, _day(ts), 'challans', 'all', None, 1),
+            (DAY, _day(ts), 'challans', 'type', _enum_value(challan.violation_type), 1),
+        ])
+
+    @staticmethod
+    def record_payment(db: Session, challan: Challan, amount: float):
+        """
+        Add collected revenue. Run in the transaction that records the payment.
+
+        Args:
+            db: Database session
+            challan: Challan the payment belongs to
+            amount: Newly collected amount (not the running total)
+        """
+        if not amount:
+            return
+        ts = challan.payment_date or datetime.utcnow()
+        AnalyticsService._bump(db, [
+            (DAY, _day(ts), 'revenue', 'all', None, amount),
+            (DAY, _day(ts), 'revenue', 'type', _enum_value(challan.violation_type), amount),
+        ])
+
+    @staticmethod
+    def _totals(
+        db: Session,
+        metric: str,
+        dimension: str,
+        since: datetime,
+        granularity: str = DAY,
+        limit: Optional[int] = None
+    ) -> Dict[str, float]:
+        """Sum a counter per dimension value since a bucket."""
+        C = AnalyticsCounter
+        total = func.sum(C.value).label('total')
+        query = db.query(C.dimension_value, total).filter(
+            C.metric == metric,
+            C.granularity == granularity,
+            C.dimension == dimension,
+            C.bucket >= since
+        ).group_by(C.dimension_value).order_by(total.desc())
+        if limit:
+            query = query.limit(limit)
+        return {row.dimension_value: float(row.total or 0) for row in query}
+
+    @staticmethod
+    def _since_day(days: int) -> datetime:
+        return _day(datetime.utcnow()) - timedelta(days=days - 1)
+
+    @staticmethod
+    def get_summary(db: Session, days: int) -> Dict:
+        """Totals and breakdowns for the last `days` days."""
+        since = AnalyticsService._since_day(days)
+        totals = AnalyticsService._totals
+
+        return {
+            'total_violations': int(totals(db, 'violations', 'all', since).get("", 0)),
+            'total_challans_issued': int(totals(db, 'challans', 'all', since).get("", 0)),
+            'total_revenue_collected': round(totals(db, 'revenue', 'all', since).get("", 0.0), 2),
+            'violations_by_type': {k: int(v) for k, v in totals(db, 'violations', 'type', since).items()},
+            'violations_by_location': {
+                k: int(v) for k, v in totals(db, 'violations', 'location', since, limit=20).items()
+            },
+            'violations_by_camera': {
+                k: int(v) for k, v in totals(db, 'violations', 'camera', since, limit=20).items()
+            }
+        }
+
+    @staticmethod
+    def get_trends(db: Session, days: int, violation_type: Optional[str] = None) -> Dict:
+        """Daily series, hour-of-day distribution and top locations."""
+        C = AnalyticsCounter
+        since = AnalyticsService._since_day(days)
+
+        if violation_type:
+            dimension, value = 'type', violation_type
+        else:
+            dimension, value = 'all', ""
+
+        def series(granularity: str):
+            return db.query(C.bucket, C.value).filter(
+                C.metric == 'violations',
+                C.granularity == granularity,
+                C.dimension == dimension,
+                C.dimension_value == value,
+                C.bucket >= since
+            ).order_by(C.bucket).all()
+
+        daily = [
+            {'date': row.bucket.date().isoformat(), 'violations': int(row.value)}
+            for row in series(DAY)
+        ]
+
+        by_hour = [0] * 24
+        for row in series(HOUR):
+            by_hour[row.bucket.hour] += int(row.value)
+        hourly = [{'hour': hour, 'violations': count} for hour, count in enumerate(by_hour)]
+
+        locations = AnalyticsService._totals(db, 'violations', 'location', since, limit=10)
+        location_trends = [
+            {'location': name, 'violations': int(count)} for name, count in locations.items()
+        ]
+
+        return {
+            'daily_violations': daily,
+            'hourly_violations': hourly,
+            'location_trends': location_trends
+        }
+
+    @staticmethod
+    def get_high_risk_zones(db: Session, days: int, limit: int) -> List[Dict]:
+        """Geohash zones ranked by violation count."""
+        since = AnalyticsService._since_day(days)
+        counts = AnalyticsService._totals(db, 'violations', 'zone', since, limit=limit)
+        if not counts:
+            return []
+
+        severity = AnalyticsService._totals(db, 'severity', 'zone', since)
+
+        C = AnalyticsCounter
+        primary: Dict[str, tuple] = {}
+        type_rows = db.query(C.dimension_value, func.sum(C.value).label('total')).filter(
+            C.metric == 'violations',
+            C.granularity == DAY,
+            C.dimension == 'zone_type',
+            C.bucket >= since,
+            func.substr(C.dimension_value, 1, ZONE_PRECISION).in_(list(counts))
+        ).group_by(C.dimension_value)
+        for row in type_rows:
+            zone, vtype = row.dimension_value.split(":", 1)
+            if zone not in primary or row.total > primary[zone][1]:
+                primary[zone] = (vtype, row.total)
+
+        zones = []
+        for zone, count in counts.items():
+            lat, lng = geohash.decode(zone)
+            zones.append({
+                'zone': zone,
+                'latitude': round(lat, 6),
+                'longitude': round(lng, 6),
+                'violations': int(count),
+                'severity_score': round(severity.get(zone, 0.0) / count, 2) if count else 0.0,
+                'primary_violation': primary.get(zone, (None, 0))[0]
+            })
+        return zones
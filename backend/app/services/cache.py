@@ -0,0 +1,75 @@
+"""
+In-process TTL cache for read-heavy API responses
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+
+class TTLCache:
+    """
+    Thread-safe cache whose entries expire after a fixed TTL.
+
+    Concurrent misses on the same key are collapsed: one caller computes
+    the value while the others wait for it.
+    """
+    
+    def __init__(self, ttl_seconds: float = 5.0, max_entries: int = 1024):
+        """
+        Initialize cache.
+        
+        Args:
+            ttl_seconds: Lifetime of an entry
+            max_entries: Entries kept before the oldest are evicted
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._key_locks: Dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._generation = 0
+    
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Return the cached value for key, computing it on a miss.
+        
+        Args:
+            key: Cache key
+            compute: Zero-argument function producing the value
+            
+        Returns:
+            Cached or freshly computed value
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                return entry[1]
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        
+        with key_lock:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry and entry[0] > time.monotonic():
+                    return entry[1]
+                generation = self._generation
+            
+            value = compute()
+            
+            with self._lock:
+                # Drop results computed across an invalidation; they may
+                # predate the write that triggered it
+                if generation == self._generation:
+                    if len(self._entries) >= self.max_entries:
+                        oldest = min(self._entries, key=lambda k: self._entries[k][0])
+                        self._entries.pop(oldest, None)
+                    self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+                self._key_locks.pop(key, None)
+            return value
+    
+    def invalidate(self):
+        """Drop all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._generation += 1
@@ -0,0 +1,528 @@
+"""
+Camera Owner Process
+Keeps cameras and live detection in one process and serves them to API workers over local IPC
+"""
+
+import argparse
+import logging
+import os
+import queue
+import secrets
+import signal
+import sys
+import threading
+from multiprocessing.connection import Client, Listener
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+ADDRESS_ENV = "CAMERA_OWNER_ADDRESS"
+AUTHKEY_ENV = "CAMERA_OWNER_AUTHKEY"
+
+# Operations API workers may invoke on the owner
+OPS = {
+    "list_cameras", "reload", "start", "stop", "status", "summary", "health",
+    "snapshot", "next_frame", "event_version", "overlay_subscribe",
+    "overlay_unsubscribe", "detect", "scheduler"
+}
+
+
+class CameraNotFound(KeyError):
+    """No camera is registered under the requested id."""
+
+
+class FrameUnavailable(ValueError):
+    """The camera has not produced a frame yet."""
+
+
+class OwnerUnavailable(ConnectionError):
+    """The camera owner process cannot be reached."""
+
+
+# Errors re-raised with their own type on the API side
+_REMOTE_ERRORS = {cls.__name__: cls for cls in (CameraNotFound, FrameUnavailable, ValueError)}
+
+
+class LocalCameraBackend:
+    """
+    Camera operations against this process's CameraManager
+
+    Used directly when the API runs a single worker, and by the owner
+    process to serve API workers. Each session tracks the overlay
+    subscriptions and viewer slots it holds so that close() releases
+    them even if the client disappears.
+    """
+
+    def __init__(self, manager=None):
+        """
+        Initialize backend.
+
+        Args:
+            manager: CameraManager (the process-wide one by default)
+        """
+        from backend.app.services.camera_service import get_camera_manager
+
+        self.manager = manager or get_camera_manager()
+        self.overlay_cameras: List[str] = []
+        # Broadcasters this session counts as a viewer of, by camera id
+        self.viewing: Dict[str, Any] = {}
+
+    def session(self) -> "LocalCameraBackend":
+        """Backend for one long-lived client (stream or WebSocket)."""
+        return LocalCameraBackend(self.manager)
+
+    def close(self):
+        """Release this session's overlay subscriptions and viewer slots."""
+        for camera_id in list(self.overlay_cameras):
+            self.overlay_unsubscribe(camera_id)
+        for broadcaster in self.viewing.values():
+            with broadcaster.condition:
+                broadcaster.viewers -= 1
+        self.viewing = {}
+
+    def _camera(self, camera_id: str):
+        camera = self.manager.get(camera_id)
+        if camera is None:
+            raise CameraNotFound(camera_id)
+        return camera
+
+    def list_cameras(self) -> List[Dict[str, Any]]:
+        """Status of every registered camera."""
+        return self.manager.status()
+
+    def reload(self) -> int:
+        """Register cameras from active camera_locations rows."""
+        return self.manager.load_from_db()
+
+    def start(self, camera_id: str) -> bool:
+        """Start a registered camera."""
+        self._camera(camera_id)
+        return self.manager.start(camera_id)
+
+    def stop(self, camera_id: str):
+        """Stop a camera."""
+        self._camera(camera_id)
+        self.manager.stop(camera_id)
+
+    def status(self, camera_id: str) -> Dict[str, Any]:
+        """One camera's capture status."""
+        return self._camera(camera_id).status()
+
+    def summary(self, camera_id: str) -> Dict[str, Any]:
+        """Short status used by the legacy /api/camera/status endpoint."""
+        camera = self._camera(camera_id)
+        has_frame = camera.ring.latest() is not None
+        return {
+            "status": "running" if camera.is_running and has_frame else "stopped",
+            # Device indexes only; stream URLs often carry credentials
+            "camera_index": camera.camera_index if isinstance(camera.camera_index, int) else None,
+            "frames_captured": camera.frame_count,
+            "has_frame": has_frame,
+            "health": camera.health()
+        }
+
+    def health(self) -> List[Dict[str, Any]]:
+        """Capture health of every registered camera."""
+        return [
+            {"camera_id": status["camera_id"], **status["health"]}
+            for status in self.manager.status()
+        ]
+
+    def snapshot(self, camera_id: str, width: Optional[int] = None,
+                 quality: int = 80) -> Optional[Tuple[int, bytes]]:
+        """
+        Latest frame as JPEG, reusing the stream's encoding if there is one.
+
+        Returns:
+            (sequence, jpeg) or None if no frame is available
+        """
+        broadcaster = self._camera(camera_id).broadcaster
+        latest = broadcaster.latest()
+        if latest is None:
+            return None
+        jpeg = broadcaster.encoded(latest[0], latest[1], width, quality)
+        return (latest[0], jpeg) if jpeg is not None else None
+
+    def next_frame(self, camera_id: str, after: int = 0, timeout: float = 1.0,
+                   width: Optional[int] = None, quality: int = 80, frames: bool = True,
+                   overlay_after: int = 0, event_after: int = 0) -> Dict[str, Any]:
+        """
+        Wait for a frame newer than `after`.
+
+        Args:
+            camera_id: Camera ID
+            after: Last sequence number the client has
+            timeout: Seconds to wait
+            width: JPEG width (None for full size)
+            quality: JPEG quality
+            frames: False to skip encoding (metadata-only clients)
+            overlay_after: Last overlay version the client has
+            event_after: Last detection event version the client has
+
+        Returns:
+            {"sequence", "jpeg", "running", "closed"} plus "overlay"/"event"
+            (with their versions) when newer ones exist; sequence is None on timeout
+        """
+        camera = self._camera(camera_id)
+        broadcaster = camera.broadcaster
+        if self.viewing.get(camera_id) is not broadcaster:
+            if camera_id in self.viewing:
+                # Camera was re-registered since this session started
+                with self.viewing[camera_id].condition:
+                    self.viewing[camera_id].viewers -= 1
+            with broadcaster.condition:
+                broadcaster.viewers += 1
+            self.viewing[camera_id] = broadcaster
+
+        if frames:
+            item = broadcaster.wait_for_jpeg(after, timeout, width, quality)
+        else:
+            item = broadcaster.wait_for_frame(after, timeout)
+        update = {
+            "sequence": item[0] if item else None,
+            "jpeg": item[1] if item and frames else None,
+            "running": camera.is_running,
+            "closed": broadcaster.closed
+        }
+        if item is None:
+            return update
+
+        overlay, overlay_version = broadcaster.overlay, broadcaster.overlay_version
+        if camera_id in self.overlay_cameras and overlay is not None and overlay_version != overlay_after:
+            update["overlay"] = overlay
+            update["overlay_version"] = overlay_version
+        event, event_version = broadcaster.event, broadcaster.event_version
+        if event is not None and event_version != event_after:
+            update["event"] = event
+            update["event_version"] = event_version
+        return update
+
+    def event_version(self, camera_id: str) -> int:
+        """Current detection event version (events before it are not replayed)."""
+        return self._camera(camera_id).broadcaster.event_version
+
+    def overlay_subscribe(self, camera_id: str) -> bool:
+        """
+        Start live overlay metadata for this session.
+
+        Returns:
+            False if detection models are unavailable
+        """
+        if camera_id in self.overlay_cameras:
+            return True
+        if not self._camera(camera_id).annotator.subscribe():
+            return False
+        self.overlay_cameras.append(camera_id)
+        return True
+
+    def overlay_unsubscribe(self, camera_id: str):
+        """Stop live overlay metadata for this session."""
+        if camera_id in self.overlay_cameras:
+            self.overlay_cameras.remove(camera_id)
+            camera = self.manager.get(camera_id)
+            if camera is not None:
+                camera.annotator.unsubscribe()
+
+    def scheduler(self) -> Optional[Dict[str, Any]]:
+        """Live inference scheduler counters, or None before any overlay was requested."""
+        from backend.app.services import camera_service
+
+        scheduler = camera_service._live_scheduler
+        return scheduler.stats() if scheduler is not None else None
+
+    def detect(self, camera_id: str, latitude: Optional[float] = None,
+               longitude: Optional[float] = None, location_name: Optional[str] = None,
+               capture: bool = False) -> Dict[str, Any]:
+        """
+        Analyze the camera's latest frame for violations.
+
+        Args:
+            camera_id: Camera ID
+            latitude, longitude, location_name: Override the camera's location
+            capture: Also save the frame as evidence
+
+        Returns:
+            RealtimeDetectionPipeline result plus "sequence", "location" and "photo_path"
+        """
+        from datetime import datetime
+        from backend.app.services.camera_service import RealtimeDetectionPipeline
+
+        camera = self._camera(camera_id)
+        latest = camera.broadcaster.latest()
+        if latest is None:
+            raise FrameUnavailable("No camera frame available")
+        sequence, frame = latest
+
+        photo_path = None
+        if capture:
+            photo_path = camera.capture_photo()
+            if not photo_path:
+                raise RuntimeError("Failed to capture photo")
+
+        # Explicit values win; otherwise use the camera's registered location
+        registered = camera.location
+        location = {
+            "latitude": latitude if latitude is not None else registered["latitude"],
+            "longitude": longitude if longitude is not None else registered["longitude"],
+            "location_name": location_name or registered["location_name"]
+        }
+
+        pipeline = RealtimeDetectionPipeline()
+        pipeline.initialize_services()
+        if pipeline.helmet_detector is not None and camera.layout.enabled:
+            from backend.app.services.tiling import TiledDetector
+
+            pipeline.helmet_detector = TiledDetector(pipeline.helmet_detector, camera.layout)
+        pipeline.helmet_options = camera.profile["helmet"]
+        pipeline.plate_options = camera.profile["plate"]
+        result = pipeline.process_frame(frame, **location)
+
+        # Share the result with live viewers of the camera
+        camera.broadcaster.publish_event(sequence, {
+            "violations_detected": result["violations_detected"],
+            "vehicle_number": result["vehicle_number"],
+            "echallan_generated": result["echallan_generated"],
+            "echallan_number": result["echallan_number"],
+            "penalty_amount": result["penalty_amount"],
+            "timestamp": datetime.now().isoformat()
+        })
+
+        result["sequence"] = sequence
+        result["location"] = location
+        result["photo_path"] = photo_path
+        return result
+
+
+class RemoteCameraBackend:
+    """
+    Camera operations forwarded to the owner process
+
+    Exposes the same methods as LocalCameraBackend. Short calls share a
+    pool of connections; session() opens a dedicated connection for a
+    stream, and the owner releases that session's subscriptions when the
+    connection closes.
+    """
+
+    def __init__(self, address: Tuple[str, int], authkey: bytes, dedicated: bool = False):
+        """
+        Initialize backend.
+
+        Args:
+            address: Owner (host, port)
+            authkey: Shared secret for the connection handshake
+            dedicated: Hold one connection for this object's lifetime
+        """
+        self.address = address
+        self.authkey = authkey
+        self.dedicated = dedicated
+        self._connection = None
+        self._pool: "queue.LifoQueue" = queue.LifoQueue()
+
+    def session(self) -> "RemoteCameraBackend":
+        """Backend for one long-lived client (stream or WebSocket)."""
+        return RemoteCameraBackend(self.address, self.authkey, dedicated=True)
+
+    def _checkout(self):
+        if self.dedicated and self._connection is not None:
+            return self._connection
+        if not self.dedicated:
+            try:
+                return self._pool.get_nowait()
+            except queue.Empty:
+                pass
+        try:
+            return Client(self.address, authkey=self.authkey)
+        except OSError as e:
+            raise OwnerUnavailable(f"Camera owner unavailable at {self.address}: {e}")
+
+    def _call(self, op: str, args: tuple, kwargs: dict):
+        connection = self._checkout()
+        try:
+            connection.send((op, args, kwargs))
+            ok, value = connection.recv()
+        except (EOFError, OSError) as e:
+            connection.close()
+            if self.dedicated:
+                self._connection = None
+            raise OwnerUnavailable(f"Camera owner connection lost: {e}")
+
+        if self.dedicated:
+            self._connection = connection
+        else:
+            self._pool.put(connection)
+        if not ok:
+            name, detail = value
+            raise _REMOTE_ERRORS.get(name, RuntimeError)(detail)
+        return value
+
+    def __getattr__(self, op: str):
+        if op not in OPS:
+            raise AttributeError(op)
+        return lambda *args, **kwargs: self._call(op, args, kwargs)
+
+    def close(self):
+        """Close this backend's connections."""
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
+
+
+class CameraOwnerServer:
+    """
+    Serves LocalCameraBackend operations over multiprocessing.connection
+
+    One thread per API-worker connection; each connection is its own
+    session, closed (and its overlay subscriptions released) on disconnect.
+    """
+
+    def __init__(self, address: Tuple[str, int], authkey: bytes, backend: Optional[LocalCameraBackend] = None):
+        """
+        Initialize server.
+
+        Args:
+            address: (host, port) to listen on; use a loopback host
+            authkey: Shared secret clients must present
+            backend: Backend to serve (a new LocalCameraBackend by default)
+        """
+        self.backend = backend or LocalCameraBackend()
+        self.listener = Listener(address, authkey=authkey)
+        self.address = self.listener.address
+
+    def serve_forever(self):
+        """Accept connections until the process exits."""
+        logger.info(f"Camera owner listening on {self.address[0]}:{self.address[1]}")
+        while True:
+            try:
+                connection = self.listener.accept()
+            except Exception as e:
+                # Failed handshakes (wrong authkey) must not stop the server
+                logger.warning(f"Rejected camera owner connection: {str(e)}")
+                continue
+            threading.Thread(target=self._serve, args=(connection,), daemon=True).start()
+
+    def _serve(self, connection):
+        session = self.backend.session()
+        try:
+            while True:
+                op, args, kwargs = connection.recv()
+                try:
+                    if op not in OPS:
+                        raise ValueError(f"Unknown camera operation: {op}")
+                    reply = (True, getattr(session, op)(*args, **kwargs))
+                except (CameraNotFound, FrameUnavailable, ValueError) as e:
+                    reply = (False, (type(e).__name__, e.args[0] if e.args else ""))
+                except Exception as e:
+                    logger.error(f"Camera operation {op} failed: {str(e)}")
+                    reply = (False, ("RuntimeError", str(e)))
+                connection.send(reply)
+        except (EOFError, OSError):
+            pass
+        finally:
+            session.close()
+            connection.close()
+
+
+def parse_address(value: str) -> Tuple[str, int]:
+    """Parse "host:port"."""
+    host, _, port = value.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+def run_owner(address: Tuple[str, int], authkey: bytes):
+    """
+    Owner process entry point: load and start cameras, then serve API workers.
+
+    Args:
+        address: (host, port) to listen on
+        authkey: Shared secret
+    """
+    from backend.app.config import get_setting
+    from backend.app.services.camera_service import get_camera_manager
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+    # This process is the owner; it must not forward to itself
+    os.environ.pop(ADDRESS_ENV, None)
+    # Stop cameras cleanly when the API terminates us
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+
+    manager = get_camera_manager()
+    if get_setting("CAMERA.SHARED_MEMORY", False):
+        manager.enable_shared_memory()
+    try:
+        manager.load_from_db()
+        if get_setting("CAMERA.AUTOSTART", False):
+            started = manager.start_all()
+            logger.info(f"Started {sum(started.values())}/{len(started)} cameras")
+    except Exception as e:
+        logger.warning(f"Could not load cameras: {str(e)}")
+
+    server = CameraOwnerServer(address, authkey)
+    try:
+        server.serve_forever()
+    finally:
+        manager.stop_all()
+
+
+def owner_process_enabled() -> bool:
+    """True when cameras live in a separate owner process."""
+    return bool(os.getenv(ADDRESS_ENV))
+
+
+def configure_owner(address: Tuple[str, int]) -> bytes:
+    """
+    Export the owner address and a fresh authkey to this process's
+    environment, so API workers started afterwards connect to the owner.
+
+    Returns:
+        The authkey
+    """
+    authkey = os.getenv(AUTHKEY_ENV) or secrets.token_hex(16)
+    os.environ[ADDRESS_ENV] = f"{address[0]}:{address[1]}"
+    os.environ[AUTHKEY_ENV] = authkey
+    return authkey.encode()
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_camera_backend():
+    """
+    Camera backend for this process: the owner process if
+    CAMERA_OWNER_ADDRESS is set, otherwise the local CameraManager.
+    """
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            if owner_process_enabled():
+                _backend = RemoteCameraBackend(
+                    parse_address(os.environ[ADDRESS_ENV]),
+                    os.getenv(AUTHKEY_ENV, "").encode()
+                )
+            else:
+                _backend = LocalCameraBackend()
+        return _backend
+
+
+def main():
+    """Run a standalone camera owner."""
+    from backend.app.config import get_setting
+
+    parser = argparse.ArgumentParser(description="Own the cameras for multi-worker API deployments")
+    parser.add_argument("--address", help="host:port to listen on (default: 127.0.0.1:CAMERA.OWNER_PORT)")
+    args = parser.parse_args()
+
+    address = parse_address(args.address or os.getenv(ADDRESS_ENV) or f"127.0.0.1:{get_setting('CAMERA.OWNER_PORT', 8765)}")
+    authkey = os.getenv(AUTHKEY_ENV)
+    if not authkey:
+        parser.error(f"{AUTHKEY_ENV} must be set (API workers need the same value)")
+    run_owner(address, authkey.encode())
+
+
+if __name__ == "__main__":
+    main()
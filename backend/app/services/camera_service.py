@@ -2,12 +2,18 @@
 Real-time camera capture and processing service
 """
 
-from typing import Optional, Tuple, Dict, Any
+from typing import Optional, Tuple, Dict, Any, List
 import logging
+import random
 import threading
+import time
+from collections import deque
 from pathlib import Path
 from datetime import datetime
 import os
+from backend.app.services.frame_broadcast import FrameBroadcaster
+from backend.app.services.frame_ring import FrameRing, DEFAULT_CAPACITY
+from backend.app.services.overlay import ObjectTracker
 
 # Lazy imports for type hints
 try:
@@ -18,70 +24,570 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+DEFAULT_CAMERA_ID = "default"
+
+# Capture states reported by CameraCapture.status()
+STATE_STOPPED = "stopped"
+STATE_STARTING = "starting"
+STATE_RUNNING = "running"
+STATE_STALLED = "stalled"
+STATE_RECONNECTING = "reconnecting"
+
+# Seconds over which fps and drop rate are measured
+GAUGE_WINDOW = 2.0
+
+
+def _parse_source(source):
+    """Device index for digit strings ("0"), otherwise the URL/path as given."""
+    if isinstance(source, str) and source.strip().isdigit():
+        return int(source.strip())
+    return source
+
+
+# Detection models shared by every camera's live annotator
+_live_models = None
+_live_models_lock = threading.Lock()
+_live_scheduler = None
+
+
+def get_live_models():
+    """
+    Load the helmet and plate models used for live overlays (once).
+    
+    Returns:
+        (helmet_detector, plate_pipeline), or None if the models are unavailable
+    """
+    global _live_models
+    with _live_models_lock:
+        if _live_models is None:
+            from backend.app.config import get_setting
+            
+            try:
+                from backend.app.services.helmet_detection import create_helmet_detector
+                from backend.app.services.plate_ocr import NumberPlateRecognitionPipeline
+                
+                _live_models = (
+                    create_helmet_detector(),
+                    NumberPlateRecognitionPipeline(
+                        plate_detector_model=get_setting("MODELS.PLATE_DETECTION", "models/plate_detection/best.pt")
+                    )
+                )
+            except Exception as e:
+                logger.warning(f"Live overlay models unavailable: {e}")
+                _live_models = False
+        return _live_models or None
+
+
+def _infer_live_batch(frames: list, camera_ids: List[str]) -> list:
+    """Overlay metadata for a batch of frames from any mix of cameras."""
+    from backend.app.services.inference_profile import parse_profile, run_grouped
+    from backend.app.services.overlay import detection_metadata
+    from backend.app.services.tiling import detect_tiled
+    
+    helmet_detector, plate_pipeline = get_live_models()
+    # Each camera's ROI crops / tiles go through the detector in one batch,
+    # split only where cameras' inference profiles differ
+    cameras = [get_camera_manager().cameras.get(camera_id) for camera_id in camera_ids]
+    layouts = [getattr(camera, "layout", None) for camera in cameras]
+    profiles = [getattr(camera, "profile", None) or parse_profile(None) for camera in cameras]
+    helmet_results = detect_tiled(helmet_detector, frames, layouts,
+                                  options=[profile["helmet"] for profile in profiles])
+    plate_results = run_grouped(plate_pipeline.process_batch, frames,
+                                [profile["plate"] for profile in profiles])
+    return [
+        detection_metadata(frame.shape, helmets, plates)
+        for frame, helmets, plates in zip(frames, helmet_results, plate_results)
+    ]
+
+
+def get_inference_scheduler():
+    """
+    Scheduler that shares the live models between every camera's annotator.
+    
+    Returns:
+        FairInferenceScheduler (created on first use)
+    """
+    global _live_scheduler
+    with _live_models_lock:
+        if _live_scheduler is None:
+            from backend.app.services.inference_scheduler import FairInferenceScheduler
+            
+            _live_scheduler = FairInferenceScheduler(_infer_live_batch)
+        return _live_scheduler
+
+
+class LiveAnnotator:
+    """
+    Feeds a camera's newest frames to the shared inference scheduler while
+    any viewer wants overlays, and publishes compact per-frame metadata
+    (boxes, classes, confidences, plate text, track ids) to the camera's
+    broadcaster.
+    Viewers draw the overlays, so frames are never annotated or
+    re-encoded server-side for live viewing.
+    """
+    
+    def __init__(self, camera: "CameraCapture"):
+        """Initialize annotator
+        
+        Args:
+            camera: Camera whose frames are analysed
+        """
+        self.camera = camera
+        self.tracker = ObjectTracker()
+        self.subscribers = 0
+        self.frames_annotated = 0
+        self.thread = None
+        self.lock = threading.Lock()
+    
+    def subscribe(self) -> bool:
+        """
+        Register a viewer that wants overlays; starts the loop if needed.
+        
+        Returns:
+            False if detection models are unavailable
+        """
+        if get_live_models() is None:
+            return False
+        with self.lock:
+            self.subscribers += 1
+            if self.thread is None:
+                self.thread = threading.Thread(
+                    target=self._run, name=f"annotate-{self.camera.camera_id}", daemon=True
+                )
+                self.thread.start()
+        return True
+    
+    def unsubscribe(self):
+        """Remove a viewer; the loop exits when none are left."""
+        with self.lock:
+            self.subscribers = max(0, self.subscribers - 1)
+    
+    def stop(self):
+        """Drop all subscribers."""
+        with self.lock:
+            self.subscribers = 0
+    
+    def _run(self):
+        """Offer each new frame to the inference scheduler, which keeps only the newest."""
+        scheduler = get_inference_scheduler()
+        broadcaster = self.camera.broadcaster
+        last = 0
+        
+        while True:
+            with self.lock:
+                # Checked under the lock so a concurrent subscribe() either
+                # sees this thread exit or keeps it running
+                if self.subscribers == 0 or not self.camera.is_running:
+                    self.thread = None
+                    return
+            
+            latest = broadcaster.wait_for_frame(last, timeout=1.0)
+            if latest is None:
+                continue
+            last, frame = latest
+            scheduler.submit(
+                self.camera.camera_id, last, frame, self._publish,
+                captured_at=self._captured_at(frame),
+                weight=self.camera.priority
+            )
+    
+    def _captured_at(self, frame) -> Optional[float]:
+        """
+        Capture time of a published frame, from its ring entry.
+        
+        The scheduler's deadline counts from capture, so a frame that sat
+        in the broadcaster is not treated as fresh. Ring timestamps are
+        epoch seconds and the scheduler uses the monotonic clock.
+        
+        Returns:
+            Monotonic capture time, or None (now) if the frame left the ring
+        """
+        for _, timestamp, entry in reversed(self.camera.ring.since(0)):
+            if entry is frame:
+                return time.monotonic() - max(0.0, time.time() - timestamp)
+        return None
+    
+    def _publish(self, sequence: int, frame, metadata: Dict):
+        """Scheduler callback: assign track ids and hand the frame's detections to viewers."""
+        # The scheduler's single worker runs every callback, so the tracker needs no lock
+        self.tracker.update(metadata['objects'])
+        self.camera.broadcaster.publish_overlay(sequence, metadata)
+        self.frames_annotated += 1
+
+
 class CameraCapture:
     """
     Real-time camera capture and processing
     """
     
-    def __init__(self, camera_index: int = 0):
+    def __init__(
+        self,
+        camera_index=0,
+        camera_id: str = DEFAULT_CAMERA_ID,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None,
+        location_name: Optional[str] = None,
+        priority: Optional[float] = None,
+        roi=None,
+        tile_size: Optional[int] = None,
+        inference_profile=None
+    ):
         """Initialize camera capture
         
         Args:
-            camera_index: Camera device index (0 for default/built-in)
+            camera_index: Capture source: device index (0 for default/built-in),
+                RTSP/HTTP URL, or path to a video file (looped, played at its fps)
+            camera_id: Camera identifier used to tag frames and violations
+            latitude: Camera latitude
+            longitude: Camera longitude
+            location_name: Camera location name
+            priority: Share of live inference relative to other cameras
+                (CAMERA.DEFAULT_PRIORITY)
+            roi: Polygons of the enforced lanes; helmet detection runs on
+                their crops only (see tiling.parse_roi)
+            tile_size: Split regions into overlapping tiles of this size
+                (DETECTION.TILING.TILE_SIZE)
+            inference_profile: Per-stage imgsz / iou / max_det overrides
+                (see inference_profile.parse_profile)
         """
-        self.camera_index = camera_index
+        from backend.app.services.inference_profile import parse_profile
+        from backend.app.services.tiling import RegionLayout
+        from backend.app.config import get_setting
+        
+        self.camera_index = _parse_source(camera_index)
+        self.camera_id = camera_id
+        self.latitude = latitude
+        self.longitude = longitude
+        self.location_name = location_name
+        self.priority = priority or get_setting("CAMERA.DEFAULT_PRIORITY", 1)
+        self.layout = RegionLayout(roi, tile_size)
+        self.profile = parse_profile(inference_profile)
+        self.is_file = isinstance(self.camera_index, str) and os.path.isfile(self.camera_index)
         self.cap = None
+        self.capture_thread = None
         self.is_running = False
-        self.current_frame = None
         self.frame_count = 0
+        self.started_at = None
         self.lock = threading.Lock()
+        self.ring = FrameRing(get_setting("VIDEO.BUFFER_SIZE", DEFAULT_CAPACITY))
+        self.broadcaster = FrameBroadcaster()
+        self.annotator = LiveAnnotator(self)
+        # Optional SharedFrameRing feeding inference processes
+        self.transport = None
+        
+        # Supervisor state
+        self.reconnect_initial_delay = get_setting("CAMERA.RECONNECT_INITIAL_DELAY", 1.0)
+        self.reconnect_max_delay = get_setting("CAMERA.RECONNECT_MAX_DELAY", 30.0)
+        self.stall_timeout = get_setting("CAMERA.STALL_TIMEOUT", 5.0)
+        self.max_read_failures = get_setting("CAMERA.MAX_READ_FAILURES", 5)
+        self.state = STATE_STOPPED
+        self.state_since = None
+        self.transitions = deque(maxlen=20)
+        self.reconnects = 0
+        self.read_failures = 0
+        self.last_frame_at = None
+        self.fps = 0.0
+        self.drop_rate = 0.0
+        self._stop_event = threading.Event()
+        self._reconnect_requested = False
+        self._window_start = time.monotonic()
+        self._window_frames = 0
+        self._window_failures = 0
+    
+    @property
+    def location(self) -> Dict[str, Any]:
+        """Camera coordinates, falling back to the configured map centre."""
+        from backend.app.config import get_setting
+        
+        center = get_setting("HEATMAP.MAP_CENTER", [28.7041, 77.1025])
+        return {
+            "latitude": self.latitude if self.latitude is not None else center[0],
+            "longitude": self.longitude if self.longitude is not None else center[1],
+            "location_name": self.location_name or self.camera_id
+        }
+        
+    def _set_state(self, state: str, reason: Optional[str] = None):
+        """Record a state transition."""
+        with self.lock:
+            if state == self.state:
+                return
+            self.state = state
+            self.state_since = datetime.now()
+            self.transitions.append({
+                "state": state,
+                "at": self.state_since.isoformat(),
+                "reason": reason
+            })
+        log = logger.warning if state in (STATE_STALLED, STATE_RECONNECTING) else logger.info
+        log(f"Camera {self.camera_id} {state}" + (f": {reason}" if reason else ""))
+    
+    def _open(self):
+        """
+        Open the capture source.
+        
+        Returns:
+            cv2.VideoCapture, or None if the source could not be opened
+        """
+        import cv2
         
+        if isinstance(self.camera_index, int):
+            cap = cv2.VideoCapture(self.camera_index)
+        else:
+            # Bound blocking opens and reads so a dead stream cannot hang the loop
+            timeout_ms = int(self.stall_timeout * 1000)
+            cap = cv2.VideoCapture(self.camera_index, cv2.CAP_ANY, [
+                cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, timeout_ms,
+                cv2.CAP_PROP_READ_TIMEOUT_MSEC, timeout_ms
+            ])
+        if not cap.isOpened():
+            cap.release()
+            return None
+        
+        if isinstance(self.camera_index, int):
+            # Set camera properties
+            cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
+            cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
+            cap.set(cv2.CAP_PROP_FPS, 30)
+        if not self.is_file:
+            # Keep only the newest frame in the driver/decoder queue
+            cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+        return cap
+    
     def start(self) -> bool:
         """Start camera capture"""
         try:
-            import cv2
-            import numpy as np
+            if self.is_running:
+                return True
             
-            self.cap = cv2.VideoCapture(self.camera_index)
-            if not self.cap.isOpened():
-                logger.error(f"Failed to open camera {self.camera_index}")
+            self.cap = self._open()
+            if self.cap is None:
+                logger.error(f"Failed to open camera {self.camera_id} ({self.camera_index})")
                 return False
             
-            # Set camera properties
-            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
-            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
-            self.cap.set(cv2.CAP_PROP_FPS, 30)
-            
+            self._stop_event.clear()
+            self._reconnect_requested = False
             self.is_running = True
+            self.started_at = datetime.now()
+            self.last_frame_at = time.monotonic()
+            self._set_state(STATE_STARTING)
             
             # Start capture thread
-            self.capture_thread = threading.Thread(target=self._capture_loop, daemon=True)
+            self.capture_thread = threading.Thread(
+                target=self._capture_loop, name=f"capture-{self.camera_id}", daemon=True
+            )
             self.capture_thread.start()
             
-            logger.info(f"Camera {self.camera_index} started successfully")
+            logger.info(f"Camera {self.camera_id} ({self.camera_index}) started successfully")
             return True
             
         except Exception as e:
-            logger.error(f"Error starting camera: {str(e)}")
+            logger.error(f"Error starting camera {self.camera_id}: {str(e)}")
             return False
     
     def _capture_loop(self):
-        """Continuous capture loop"""
-        import numpy as np
+        """
+        Continuous capture loop
+        
+        Read failures are retried with a short pause, and after
+        CAMERA.MAX_READ_FAILURES in a row (or a stall reported by the
+        watchdog) the source is reopened with exponential backoff, so a
+        dead camera sleeps instead of spinning.
+        """
+        import cv2
+        
+        # Video files stand in for cameras: play at native rate and loop
+        frame_interval = 0.0
+        if self.is_file:
+            fps = self.cap.get(cv2.CAP_PROP_FPS) or 25.0
+            frame_interval = 1.0 / fps
+        next_frame_at = time.monotonic()
+        failures = 0
         
         while self.is_running:
+            if self._reconnect_requested or failures >= self.max_read_failures:
+                reason = "stalled" if self._reconnect_requested else f"{failures} consecutive read failures"
+                if not self._reconnect(reason):
+                    break
+                failures = 0
+                next_frame_at = time.monotonic()
+                continue
+            
+            # read() without a destination decodes into a new array, which
+            # is published read-only and never written again, so consumers
+            # share it without copying
             ret, frame = self.cap.read()
+            now = time.monotonic()
             if ret:
+                failures = 0
+                timestamp = time.time()
+                sequence = self.ring.write(frame, timestamp)
+                if self.transport is not None:
+                    self._write_transport(sequence, timestamp, frame)
                 with self.lock:
-                    self.current_frame = frame
                     self.frame_count += 1
-            else:
-                logger.warning("Failed to read frame from camera")
+                    self.last_frame_at = now
+                    self._window_frames += 1
+                self.broadcaster.publish(frame)
+                if self.state != STATE_RUNNING:
+                    self._set_state(STATE_RUNNING)
+                self._update_gauges(now)
+                if frame_interval:
+                    next_frame_at += frame_interval
+                    delay = next_frame_at - time.monotonic()
+                    if delay > 0:
+                        time.sleep(delay)
+                    else:
+                        next_frame_at = time.monotonic()
+                continue
+            
+            failures += 1
+            if self.is_file and failures == 1:
+                # End of file: rewind and loop
+                self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+                continue
+            with self.lock:
+                self.read_failures += 1
+                self._window_failures += 1
+            self._update_gauges(now)
+            if failures == 1:
+                logger.warning(f"Failed to read frame from camera {self.camera_id}")
+            self._stop_event.wait(min(0.1 * failures, 1.0))
     
-    def get_frame(self) -> Optional["np.ndarray"]:
-        """Get current frame"""
+    def _write_transport(self, sequence: int, timestamp: float, frame):
+        """Copy a frame into the shared-memory ring for inference processes."""
+        try:
+            self.transport.write(self.camera_id, sequence, timestamp, frame)
+        except ValueError as e:
+            # Frame larger than a slot: detach instead of failing every frame
+            logger.error(f"Camera {self.camera_id} detached from shared memory: {str(e)}")
+            self.transport = None
+    
+    def _reconnect(self, reason: str) -> bool:
+        """
+        Reopen the source with exponential backoff until it works or the
+        camera is stopped.
+        
+        Returns:
+            True once reconnected, False if stopped meanwhile
+        """
+        self._set_state(STATE_RECONNECTING, reason)
+        if self.cap:
+            self.cap.release()
+            self.cap = None
+        
+        delay = self.reconnect_initial_delay
+        attempt = 0
+        while self.is_running:
+            # Jitter keeps cameras behind one failed switch from retrying in lockstep
+            if self._stop_event.wait(delay * random.uniform(0.8, 1.2)):
+                return False
+            attempt += 1
+            cap = self._open()
+            if cap is not None:
+                self.cap = cap
+                self._reconnect_requested = False
+                with self.lock:
+                    self.reconnects += 1
+                    self.last_frame_at = time.monotonic()
+                self._set_state(STATE_STARTING, f"reconnected after {attempt} attempt(s)")
+                return True
+            delay = min(delay * 2, self.reconnect_max_delay)
+            logger.warning(f"Camera {self.camera_id} reconnect attempt {attempt} failed; retrying in {delay:.0f}s")
+        return False
+    
+    def _update_gauges(self, now: float):
+        """Roll the fps / drop-rate window."""
+        with self.lock:
+            elapsed = now - self._window_start
+            if elapsed < GAUGE_WINDOW:
+                return
+            attempts = self._window_frames + self._window_failures
+            self.fps = round(self._window_frames / elapsed, 1)
+            self.drop_rate = round(self._window_failures / attempts, 3) if attempts else 0.0
+            self._window_start = now
+            self._window_frames = 0
+            self._window_failures = 0
+    
+    def check_stall(self, now: Optional[float] = None) -> bool:
+        """
+        Watchdog check: flag the camera as stalled if no frame arrived
+        within CAMERA.STALL_TIMEOUT, and ask the capture loop to reconnect.
+        
+        Returns:
+            True if the camera is stalled
+        """
+        now = now if now is not None else time.monotonic()
+        self._update_gauges(now)
+        if not self.is_running or self.state not in (STATE_STARTING, STATE_RUNNING):
+            return self.state == STATE_STALLED
+        age = now - (self.last_frame_at or now)
+        if age <= self.stall_timeout:
+            return False
+        self._set_state(STATE_STALLED, f"no frame for {age:.1f}s")
+        self._reconnect_requested = True
+        return True
+    
+    def get_frame(self, copy: bool = False) -> Optional["np.ndarray"]:
+        """Get current frame
+        
+        Args:
+            copy: Return a writable copy instead of the shared read-only frame
+        """
+        latest = self.ring.latest()
+        if latest is None:
+            return None
+        return self.ring.copy(latest[2]) if copy else latest[2]
+    
+    def get_frames_since(self, sequence: int) -> List[Tuple[int, float, "np.ndarray"]]:
+        """Buffered (sequence, timestamp, frame) newer than a sequence number"""
+        return self.ring.since(sequence)
+    
+    def get_frames_window(self, start: float, end: Optional[float] = None) -> List[Tuple[int, float, "np.ndarray"]]:
+        """Buffered (sequence, timestamp, frame) captured between two epoch times"""
+        return self.ring.window(start, end)
+    
+    def get_recent_frames(self, seconds: float) -> List[Tuple[int, float, "np.ndarray"]]:
+        """Buffered frames from the last `seconds`, e.g. pre-event evidence"""
+        return self.ring.window(time.time() - seconds)
+    
+    def health(self) -> Dict[str, Any]:
+        """Supervisor gauges and recent state transitions."""
         with self.lock:
-            return self.current_frame.copy() if self.current_frame is not None else None
+            return {
+                "state": self.state,
+                "state_since": self.state_since.isoformat() if self.state_since else None,
+                "fps": self.fps,
+                "drop_rate": self.drop_rate,
+                "read_failures": self.read_failures,
+                "reconnects": self.reconnects,
+                "last_frame_age": round(time.monotonic() - self.last_frame_at, 2)
+                    if self.is_running and self.last_frame_at else None,
+                "transitions": list(self.transitions)
+            }
+    
+    def status(self) -> Dict[str, Any]:
+        """Capture state for status endpoints."""
+        ring = self.ring.stats()
+        return {
+            "camera_id": self.camera_id,
+            # Stream URLs are not echoed back; they often carry credentials
+            "source_type": "device" if isinstance(self.camera_index, int) else ("file" if self.is_file else "stream"),
+            "status": self.state,
+            "frames_captured": self.frame_count,
+            "has_frame": ring["buffered"] > 0,
+            "health": self.health(),
+            "buffer": ring,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "broadcast": self.broadcaster.stats(),
+            "overlay_subscribers": self.annotator.subscribers,
+            "priority": self.priority,
+            "roi_polygons": len(self.layout.roi),
+            "tile_size": self.layout.tile_size or None,
+            "inference_profile": self.profile,
+            "inference": _live_scheduler.camera_stats(self.camera_id) if _live_scheduler else None,
+            "shared_memory": self.transport is not None,
+            **self.location
+        }
     
     def capture_photo(self, output_dir: str = "data/evidence") -> Optional[str]:
         """Capture and save current frame
@@ -105,7 +611,7 @@ class CameraCapture:
             
             # Generate filename with timestamp
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")[:-3]
-            filename = f"violation_{timestamp}.jpg"
+            filename = f"violation_{self.camera_id}_{timestamp}.jpg"
             filepath = os.path.join(output_dir, filename)
             
             # Save image
@@ -125,12 +631,24 @@ class CameraCapture:
     def stop(self):
         """Stop camera capture"""
         try:
+            was_running = self.is_running
             self.is_running = False
+            self._stop_event.set()
             if self.capture_thread and self.capture_thread.is_alive():
-                self.capture_thread.join(timeout=2)
+                # Reads are bounded by the stall timeout
+                self.capture_thread.join(timeout=self.stall_timeout + 1)
             if self.cap:
                 self.cap.release()
-            logger.info("Camera stopped")
+                self.cap = None
+            if was_running:
+                self._set_state(STATE_STOPPED)
+            with self.lock:
+                self.fps = 0.0
+                self.drop_rate = 0.0
+            self.ring.clear()
+            self.broadcaster.close()
+            self.annotator.stop()
+            logger.info(f"Camera {self.camera_id} stopped")
         except Exception as e:
             logger.error(f"Error stopping camera: {str(e)}")
     
@@ -139,6 +657,223 @@ class CameraCapture:
         self.stop()
 
 
+class CameraManager:
+    """
+    Registry of capture workers, one per camera
+    
+    Cameras come from active CameraLocation rows (rtsp_url is the source,
+    which may also be a local video file) plus the built-in "default"
+    device camera. Each running camera holds one capture thread and a
+    fixed-size frame ring (VIDEO.BUFFER_SIZE), so memory stays bounded
+    per camera. A single watchdog thread flags stalled cameras so their
+    capture loops reconnect. Optionally, frames are also published to a
+    shared-memory ring for inference in other processes.
+    """
+    
+    def __init__(self, max_cameras: Optional[int] = None):
+        """Initialize manager
+        
+        Args:
+            max_cameras: Maximum cameras running at once (CAMERA.MAX_CAMERAS)
+        """
+        from backend.app.config import get_setting
+        
+        self.max_cameras = max_cameras or get_setting("CAMERA.MAX_CAMERAS", 32)
+        self.cameras: Dict[str, CameraCapture] = {}
+        self.lock = threading.Lock()
+        self.watchdog = None
+        self.transport = None
+    
+    def register(
+        self,
+        camera_id: str,
+        source,
+        latitude: Optional[float] = None,
+        longitude: Optional[float] = None,
+        location_name: Optional[str] = None,
+        priority: Optional[float] = None,
+        roi=None,
+        tile_size: Optional[int] = None,
+        inference_profile=None
+    ) -> CameraCapture:
+        """Add or replace a camera definition; a running camera is restarted."""
+        with self.lock:
+            existing = self.cameras.get(camera_id)
+        was_running = existing is not None and existing.is_running
+        if existing is not None:
+            existing.stop()
+        
+        camera = CameraCapture(
+            camera_index=source,
+            camera_id=camera_id,
+            latitude=latitude,
+            longitude=longitude,
+            location_name=location_name,
+            priority=priority,
+            roi=roi,
+            tile_size=tile_size,
+            inference_profile=inference_profile
+        )
+        camera.transport = self.transport
+        with self.lock:
+            self.cameras[camera_id] = camera
+        if was_running:
+            camera.start()
+        return camera
+    
+    def load_from_db(self, db=None) -> int:
+        """
+        Register every active CameraLocation with a stream URL.
+        
+        Returns:
+            Number of cameras registered
+        """
+        from backend.app.database.database import SessionLocal
+        from backend.app.models.database import CameraLocation
+        
+        own_session = db is None
+        db = db or SessionLocal()
+        try:
+            rows = db.query(CameraLocation).filter(
+                CameraLocation.is_active == True,
+                CameraLocation.rtsp_url.isnot(None)
+            ).all()
+            for row in rows:
+                self.register(
+                    row.camera_id,
+                    row.rtsp_url,
+                    latitude=row.latitude,
+                    longitude=row.longitude,
+                    location_name=row.location_name or row.camera_name,
+                    priority=row.priority,
+                    roi=row.roi,
+                    tile_size=row.tile_size,
+                    inference_profile=row.inference_profile
+                )
+            logger.info(f"Registered {len(rows)} cameras from camera_locations")
+            return len(rows)
+        finally:
+            if own_session:
+                db.close()
+    
+    def get(self, camera_id: str = DEFAULT_CAMERA_ID) -> Optional[CameraCapture]:
+        """Camera by id; the default device camera is created on demand."""
+        with self.lock:
+            camera = self.cameras.get(camera_id)
+            if camera is None and camera_id == DEFAULT_CAMERA_ID:
+                from backend.app.config import get_setting
+                
+                camera = CameraCapture(
+                    camera_index=get_setting("CAMERA.DEFAULT_SOURCE", 0),
+                    camera_id=DEFAULT_CAMERA_ID
+                )
+                camera.transport = self.transport
+                self.cameras[camera_id] = camera
+            return camera
+    
+    def start(self, camera_id: str = DEFAULT_CAMERA_ID) -> bool:
+        """Start one camera's capture worker."""
+        camera = self.get(camera_id)
+        if camera is None:
+            raise KeyError(camera_id)
+        if not camera.is_running and self.running_count() >= self.max_cameras:
+            logger.error(f"Cannot start {camera_id}: {self.max_cameras} cameras already running")
+            return False
+        started = camera.start()
+        if started:
+            self._ensure_watchdog()
+        return started
+    
+    def _ensure_watchdog(self):
+        """Start the stall watchdog if it is not running."""
+        with self.lock:
+            if self.watchdog is None:
+                self.watchdog = threading.Thread(target=self._watch, name="camera-watchdog", daemon=True)
+                self.watchdog.start()
+    
+    def _watch(self):
+        """One thread checks every running camera for stalls once a second."""
+        while True:
+            time.sleep(1.0)
+            with self.lock:
+                running = [camera for camera in self.cameras.values() if camera.is_running]
+                if not running:
+                    self.watchdog = None
+                    return
+            for camera in running:
+                try:
+                    camera.check_stall()
+                except Exception as e:
+                    logger.error(f"Watchdog check failed for {camera.camera_id}: {str(e)}")
+    
+    def stop(self, camera_id: str = DEFAULT_CAMERA_ID):
+        """Stop one camera's capture worker."""
+        camera = self.get(camera_id)
+        if camera is None:
+            raise KeyError(camera_id)
+        camera.stop()
+    
+    def start_all(self) -> Dict[str, bool]:
+        """Start every registered camera except the default device."""
+        with self.lock:
+            camera_ids = [cid for cid in self.cameras if cid != DEFAULT_CAMERA_ID]
+        return {camera_id: self.start(camera_id) for camera_id in camera_ids}
+    
+    def stop_all(self):
+        """Stop every camera and free the shared-memory ring."""
+        with self.lock:
+            cameras = list(self.cameras.values())
+        for camera in cameras:
+            camera.stop()
+        self.disable_shared_memory()
+    
+    def enable_shared_memory(self, slots: Optional[int] = None, slot_bytes: Optional[int] = None):
+        """
+        Publish every camera's frames into one shared-memory ring.
+        
+        Inference processes started with multiprocessing attach to it via
+        SharedFrameRing.attach(manager.transport.handle()).
+        
+        Args:
+            slots: Frame slots (CAMERA.SHM_SLOTS)
+            slot_bytes: Bytes per slot (CAMERA.SHM_SLOT_BYTES)
+        
+        Returns:
+            The SharedFrameRing
+        """
+        from backend.app.config import get_setting
+        from backend.app.services.shm_transport import SharedFrameRing
+        
+        with self.lock:
+            if self.transport is None:
+                self.transport = SharedFrameRing.create(
+                    slots or get_setting("CAMERA.SHM_SLOTS", 32),
+                    slot_bytes or get_setting("CAMERA.SHM_SLOT_BYTES", 1920 * 1080 * 3)
+                )
+            for camera in self.cameras.values():
+                camera.transport = self.transport
+            return self.transport
+    
+    def disable_shared_memory(self):
+        """Detach cameras from the shared-memory ring and free it."""
+        with self.lock:
+            transport, self.transport = self.transport, None
+            for camera in self.cameras.values():
+                camera.transport = None
+        if transport is not None:
+            transport.close()
+    
+    def running_count(self) -> int:
+        with self.lock:
+            return sum(1 for camera in self.cameras.values() if camera.is_running)
+    
+    def status(self) -> List[Dict[str, Any]]:
+        """Status of every registered camera."""
+        with self.lock:
+            cameras = list(self.cameras.values())
+        return [camera.status() for camera in cameras]
+
+
 class RealtimeDetectionPipeline:
     """
     Real-time detection pipeline for camera feed
@@ -150,6 +885,9 @@ class RealtimeDetectionPipeline:
         self.plate_ocr = None
         self.violation_service = None
         self.echallan_service = None
+        # Camera inference profile (imgsz / iou / max_det) per stage
+        self.helmet_options = {}
+        self.plate_options = {}
         
     def initialize_services(self):
         """Initialize detection services"""
@@ -226,7 +964,7 @@ class RealtimeDetectionPipeline:
             
             # Detect helmets (or use mock detection)
             if self.helmet_detector:
-                helmet_detections = self.helmet_detector.detect(frame)
+                helmet_detections = self.helmet_detector.detect(frame, **self.helmet_options)
                 violations = self.helmet_detector.detect_violations(helmet_detections)
                 result["helmet_violations"] = len(violations)
                 result["violations_detected"] += len(violations)
@@ -238,7 +976,7 @@ class RealtimeDetectionPipeline:
             
             # Detect number plate (or use mock)
             if self.plate_ocr:
-                plate_results = self.plate_ocr.process_image(frame)
+                plate_results = self.plate_ocr.process_image(frame, **self.plate_options)
                 if plate_results and plate_results.get("plates"):
                     result["vehicle_number"] = plate_results["plates"][0] if plate_results["plates"] else None
                     result["plate_detections"] = plate_results["plates"]
@@ -294,27 +1032,30 @@ class RealtimeDetectionPipeline:
         return result
 
 
-# Global camera instance
-_camera_instance: Optional[CameraCapture] = None
+# Global camera manager
+_camera_manager: Optional[CameraManager] = None
+_camera_manager_lock = threading.Lock()
+
+
+def get_camera_manager() -> CameraManager:
+    """Get or create the camera manager"""
+    global _camera_manager
+    with _camera_manager_lock:
+        if _camera_manager is None:
+            _camera_manager = CameraManager()
+        return _camera_manager
 
 
-def get_camera() -> CameraCapture:
-    """Get or create camera instance"""
-    global _camera_instance
-    if _camera_instance is None:
-        _camera_instance = CameraCapture(camera_index=0)
-    return _camera_instance
+def get_camera(camera_id: str = DEFAULT_CAMERA_ID) -> Optional[CameraCapture]:
+    """Get camera instance (the default device camera if no id is given)"""
+    return get_camera_manager().get(camera_id)
 
 
-def start_camera() -> bool:
-    """Start global camera"""
-    camera = get_camera()
-    return camera.start()
+def start_camera(camera_id: str = DEFAULT_CAMERA_ID) -> bool:
+    """Start a camera"""
+    return get_camera_manager().start(camera_id)
 
 
-def stop_camera():
-    """Stop global camera"""
-    global _camera_instance
-    if _camera_instance:
-        _camera_instance.stop()
-        _camera_instance = None
+def stop_camera(camera_id: str = DEFAULT_CAMERA_ID):
+    """Stop a camera"""
+    get_camera_manager().stop(camera_id)
@@ -3,9 +3,12 @@ Complete End-to-End Violation Processing Pipeline
 """
 
 import logging
+import threading
+import time
 import cv2
 from pathlib import Path
-from backend.app.services.helmet_detection import HelmetDetector
+from typing import Callable, Dict, List
+from backend.app.services.helmet_detection import create_helmet_detector
 from backend.app.services.plate_ocr import NumberPlateRecognitionPipeline
 from backend.app.services.violation_detection import ProcessingPipeline, ViolationDetectionService
 from backend.app.services.echallan import EChallanService
@@ -32,11 +35,12 @@ class CompletePipeline:
         Initialize complete pipeline.
         
         Args:
-            helmet_model_path: Path to helmet detection model
+            helmet_model_path: Path to helmet detection model (ignored when
+                DETECTION.HELMET.MODE is "cascade")
             plate_model_path: Path to plate detection model
             auto_issue_challan: Automatically issue E-challan
         """
-        self.helmet_detector = HelmetDetector(helmet_model_path)
+        self.helmet_detector = create_helmet_detector(helmet_model_path)
         self.plate_pipeline = NumberPlateRecognitionPipeline(
             plate_detector_model=plate_model_path
         )
@@ -46,6 +50,8 @@ class CompletePipeline:
         )
         self.auto_issue_challan = auto_issue_challan
         self.db = SessionLocal()
+        # Pipelines using a camera's ROI / tiling, by camera id
+        self._camera_pipelines: Dict[str, ProcessingPipeline] = {}
     
     def process_image(
         self,
@@ -53,7 +59,9 @@ class CompletePipeline:
         latitude: float,
         longitude: float,
         location_name: str,
-        save_evidence: bool = True
+        save_evidence: bool = True,
+        camera_id: str = None,
+        persist: bool = True
     ):
         """
         Process single image for complete violation detection and E-challan.
@@ -64,6 +72,9 @@ class CompletePipeline:
             longitude: Location longitude
             location_name: Location name
             save_evidence: Save evidence images
+            camera_id: Camera that captured the image
+            persist: Save violations (and challans) now; False returns them
+                unsaved for the caller to store with store_violations()
             
         Returns:
             Violations and challans generated
@@ -77,7 +88,7 @@ class CompletePipeline:
             return None
         
         # Process frame
-        results = self.processing_pipeline.process_frame(
+        results = self._pipeline(camera_id).process_frame(
             frame=image,
             latitude=latitude,
             longitude=longitude,
@@ -85,33 +96,23 @@ class CompletePipeline:
             save_evidence=save_evidence
         )
         
-        # Store violations in database
-        violations = []
-        for violation_data in results['violations']:
-            violation = ViolationDetectionService.create_violation(
+        violations = [
+            ViolationDetectionService.create_violation(
                 violation_type=violation_data.get('type'),
                 vehicle_number=violation_data.get('vehicle_number', 'UNKNOWN'),
                 latitude=latitude,
                 longitude=longitude,
                 location_name=location_name,
                 image_path=image_path if save_evidence else None,
-                detection_confidence=violation_data.get('confidence', 0.0)
+                detection_confidence=violation_data.get('confidence', 0.0),
+                camera_id=camera_id
             )
-            self.db.add(violation)
-            self.db.commit()
-            violations.append(violation)
-            logger.info(f"Created violation: {violation.id}")
-            
-            # Auto-issue E-challan if enabled
-            if self.auto_issue_challan:
-                challan = EChallanService.create_challan(
-                    violation_id=violation.id,
-                    violation=violation,
-                    evidence_image_url=image_path
-                )
-                self.db.add(challan)
-                self.db.commit()
-                logger.info(f"Auto-issued challan: {challan.challan_number}")
+            for violation_data in results['violations']
+        ]
+        
+        # Store violations in database
+        if persist:
+            self.store_violations(violations)
         
         return {
             'violations_found': len(violations),
@@ -119,6 +120,115 @@ class CompletePipeline:
             'detections': results
         }
     
+    def store_violations(self, violations: List[Violation], db: Session = None,
+                         commit: bool = True) -> List[Challan]:
+        """
+        Save violations and, if auto-issue is on, their challans.
+        
+        Args:
+            violations: Violations created by create_violation()
+            db: Session to write through (defaults to the pipeline's)
+            commit: Commit the transaction (False to stage the writes)
+        
+        Returns:
+            Challans issued
+        """
+        db = db or self.db
+        challans = []
+        try:
+            for violation in violations:
+                ViolationDetectionService.persist_violation(db, violation, commit=False)
+                logger.info(f"Created violation: {violation.id}")
+                
+                # Auto-issue E-challan if enabled
+                if self.auto_issue_challan:
+                    challan = EChallanService.create_challan(
+                        violation_id=violation.id,
+                        violation=violation,
+                        evidence_image_url=violation.image_path
+                    )
+                    EChallanService.persist_challan(db, challan, commit=False)
+                    challans.append(challan)
+                    logger.info(f"Auto-issued challan: {challan.challan_number}")
+            if commit:
+                db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        return challans
+    
+    def process_batch(
+        self,
+        images: List,
+        latitude: float,
+        longitude: float,
+        location_name: str,
+        camera_id: str = None,
+        db: Session = None
+    ) -> List[Dict]:
+        """
+        Process decoded images as one inference batch.
+        
+        Violations (and challans, if auto-issue is on) for the whole batch
+        are committed in one transaction.
+        
+        Args:
+            images: Decoded BGR images
+            latitude: Location latitude
+            longitude: Location longitude
+            location_name: Location name
+            camera_id: Camera that captured the images
+            db: Session to write through (defaults to the pipeline's)
+        
+        Returns:
+            Per-image violations and challans, in input order
+        """
+        db = db or self.db
+        batch_results = self._pipeline(camera_id, db).process_batch(
+            frames=images,
+            latitude=latitude,
+            longitude=longitude,
+            location_name=location_name
+        )
+        
+        outputs = []
+        try:
+            for results in batch_results:
+                violations = []
+                challans = []
+                for violation_data in results['violations']:
+                    violation = ViolationDetectionService.create_violation(
+                        violation_type=violation_data.get('type'),
+                        vehicle_number=violation_data.get('vehicle_number', 'UNKNOWN'),
+                        latitude=latitude,
+                        longitude=longitude,
+                        location_name=location_name,
+                        detection_confidence=violation_data.get('confidence', 0.0),
+                        camera_id=camera_id
+                    )
+                    ViolationDetectionService.persist_violation(db, violation, commit=False)
+                    violations.append(violation)
+        
+                    if self.auto_issue_challan:
+                        challan = EChallanService.create_challan(
+                            violation_id=violation.id,
+                            violation=violation
+                        )
+                        EChallanService.persist_challan(db, challan, commit=False)
+                        challans.append(challan)
+        
+                outputs.append({
+                    'violations': violations,
+                    'challans': challans,
+                    'detections': results
+                })
+            db.commit()
+        except Exception:
+            db.rollback()
+            raise
+        
+        return outputs
+    
     def process_video(
         self,
         video_path: str,
@@ -126,7 +236,12 @@ class CompletePipeline:
         longitude: float,
         location_name: str,
         output_path: str = None,
-        frame_skip: int = 5
+        frame_skip: int = None,
+        camera_id: str = None,
+        progress_callback: Callable[[Dict], None] = None,
+        queue_depth: Callable[[], int] = None,
+        persist: bool = True,
+        stop_event: threading.Event = None
     ):
         """
         Process video file for violations.
@@ -137,7 +252,18 @@ class CompletePipeline:
             longitude: Location longitude
             location_name: Location name
             output_path: Output video path with annotations
-            frame_skip: Process every nth frame
+            frame_skip: Process every nth frame; None adapts it to measured
+                throughput between VIDEO.MIN_FRAME_SKIP and VIDEO.MAX_FRAME_SKIP
+            camera_id: Camera that recorded the video
+            progress_callback: Called after each processed frame with
+                frames_processed, total_frames, fps and violations_found
+            queue_depth: Returns the current work backlog; a backlog makes
+                adaptive sampling back off
+            persist: Commit violations after each processed frame; False
+                returns them unsaved in stats['violations'] so the caller
+                can store the whole video in one transaction
+            stop_event: Stops processing early when set; stats['stopped']
+                is then True
             
         Returns:
             Statistics
@@ -148,6 +274,8 @@ class CompletePipeline:
         fps = cap.get(cv2.CAP_PROP_FPS)
         width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
         height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+        sampler = self._sampler(fps, camera_id, frame_skip, queue_depth)
+        pipeline = self._pipeline(camera_id)
         
         writer = None
         if output_path:
@@ -159,11 +287,19 @@ class CompletePipeline:
             'processed_frames': 0,
             'total_violations': 0,
             'unique_vehicles': set(),
-            'challans_issued': 0
+            'challans_issued': 0,
+            'stopped': False
         }
+        pending = []
+        
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) or None
+        start_time = time.time()
         
-        frame_count = 0
         while True:
+            if stop_event is not None and stop_event.is_set():
+                stats['stopped'] = True
+                break
+            
             ret, frame = cap.read()
             if not ret:
                 break
@@ -171,62 +307,71 @@ class CompletePipeline:
             stats['total_frames'] += 1
             
             # Process every nth frame
-            if frame_count % frame_skip == 0:
+            if sampler.should_process():
                 stats['processed_frames'] += 1
                 
                 # Process frame
-                results = self.processing_pipeline.process_frame(
+                results = pipeline.process_frame(
                     frame=frame,
                     latitude=latitude,
                     longitude=longitude,
                     location_name=location_name
                 )
+                sampler.record(results['timings'], self._activity(results))
                 
                 # Count violations
                 stats['total_violations'] += len(results['violations'])
                 
-                # Store in database
+                violations = []
                 for violation_data in results['violations']:
                     vehicle_num = violation_data.get('vehicle_number', 'UNKNOWN')
                     stats['unique_vehicles'].add(vehicle_num)
                     
-                    violation = ViolationDetectionService.create_violation(
+                    violations.append(ViolationDetectionService.create_violation(
                         violation_type=violation_data.get('type'),
                         vehicle_number=vehicle_num,
                         latitude=latitude,
                         longitude=longitude,
                         location_name=location_name,
-                        detection_confidence=violation_data.get('confidence', 0.0)
-                    )
-                    self.db.add(violation)
-                    
-                    if self.auto_issue_challan:
-                        challan = EChallanService.create_challan(
-                            violation_id=violation.id,
-                            violation=violation
-                        )
-                        self.db.add(challan)
-                        stats['challans_issued'] += 1
+                        detection_confidence=violation_data.get('confidence', 0.0),
+                        camera_id=camera_id
+                    ))
+                if self.auto_issue_challan:
+                    stats['challans_issued'] += len(violations)
                 
-                self.db.commit()
+                # Store in database
+                if persist:
+                    self.store_violations(violations)
+                else:
+                    pending.extend(violations)
                 
-                # Draw on frame
-                if results['helmet_detections']:
+                # Draw on frame (only needed for the output video)
+                if writer and results['helmet_detections']:
                     frame = self.helmet_detector.draw_detections(
                         frame, results['helmet_detections']
                     )
+                
+                if progress_callback:
+                    elapsed = time.time() - start_time
+                    progress_callback({
+                        'frames_processed': stats['total_frames'],
+                        'total_frames': total_frames,
+                        'fps': round(stats['total_frames'] / elapsed, 2) if elapsed > 0 else None,
+                        'violations_found': stats['total_violations']
+                    })
             
             if writer:
                 writer.write(frame)
-            
-            frame_count += 1
         
         cap.release()
         if writer:
             writer.release()
         
         stats['unique_vehicles'] = len(stats['unique_vehicles'])
+        stats['sampling'] = sampler.telemetry()
         logger.info(f"Video processing completed: {stats}")
+        if not persist:
+            stats['violations'] = pending
         return stats
     
     def process_rtsp_stream(
@@ -235,21 +380,35 @@ class CompletePipeline:
         latitude: float,
         longitude: float,
         location_name: str,
-        duration_seconds: int = 300
+        duration_seconds: int = 300,
+        live: bool = True,
+        max_lag: float = None
     ):
         """
         Process live RTSP stream.
         
+        In live mode a reader thread drains the stream continuously and
+        detection always runs on the newest frame, dropping any that
+        arrive meanwhile, so decisions reflect what is happening now.
+        Capture-to-decision latency is recorded per frame; frames older
+        than max_lag are skipped, and violations decided later than
+        max_lag after capture are discarded rather than enforced.
+        
         Args:
             rtsp_url: RTSP stream URL
             latitude: Location latitude
             longitude: Location longitude
             location_name: Location name
             duration_seconds: How long to process
+            live: Freshest-frame scheduling; False processes frames in
+                order with adaptive frame skipping
+            max_lag: Maximum capture-to-decision seconds (VIDEO.MAX_LAG_SECONDS)
             
         Returns:
             Statistics
         """
+        from backend.app.config import get_setting
+        
         logger.info(f"Connecting to RTSP stream: {rtsp_url}")
         
         cap = cv2.VideoCapture(rtsp_url)
@@ -257,28 +416,100 @@ class CompletePipeline:
             logger.error(f"Failed to open RTSP stream: {rtsp_url}")
             return None
         
-        fps = cap.get(cv2.CAP_PROP_FPS)
-        total_frames = int(fps * duration_seconds)
-        
         stats = {
             'stream_url': rtsp_url,
             'duration': duration_seconds,
+            'mode': 'live' if live else 'sequential',
             'total_frames_processed': 0,
             'total_violations': 0,
             'challans_issued': 0
         }
         
-        import time
+        try:
+            if live:
+                # The reader thread keeps up; a deep decoder queue only adds lag
+                cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+                if max_lag is None:
+                    max_lag = get_setting("VIDEO.MAX_LAG_SECONDS", 1.0)
+                self._process_live(cap, stats, latitude, longitude, location_name,
+                                   duration_seconds, max_lag)
+            else:
+                self._process_sequential(cap, stats, latitude, longitude, location_name,
+                                         duration_seconds)
+        finally:
+            cap.release()
+        
+        logger.info(f"RTSP stream processing completed: {stats}")
+        return stats
+    
+    def _pipeline(self, camera_id: str = None, db: Session = None) -> ProcessingPipeline:
+        """
+        Processing pipeline for a camera's frames.
+        
+        Cameras with ROI polygons or a tile size in camera_locations (or a
+        global DETECTION.TILING.TILE_SIZE) detect helmets on those crops,
+        and their inference_profile sets the detectors' input size.
+        """
+        from backend.app.models.database import CameraLocation
+        from backend.app.services.inference_profile import parse_profile
+        from backend.app.services.tiling import RegionLayout, TiledDetector
+        
+        key = camera_id or ""
+        if key not in self._camera_pipelines:
+            row = None
+            if camera_id:
+                row = (db or self.db).query(CameraLocation).filter(CameraLocation.camera_id == camera_id).first()
+            layout = RegionLayout(row.roi if row else None, row.tile_size if row else None)
+            profile = parse_profile(row.inference_profile if row else None)
+            if layout.enabled or any(profile.values()):
+                self._camera_pipelines[key] = ProcessingPipeline(
+                    helmet_detector=TiledDetector(self.helmet_detector, layout) if layout.enabled else self.helmet_detector,
+                    plate_ocr_pipeline=self.plate_pipeline,
+                    helmet_options=profile["helmet"],
+                    plate_options=profile["plate"]
+                )
+            else:
+                self._camera_pipelines[key] = self.processing_pipeline
+        return self._camera_pipelines[key]
+    
+    @staticmethod
+    def _sampler(fps: float, camera_id: str = None, frame_skip: int = None,
+                 queue_depth: Callable[[], int] = None):
+        """Adaptive frame-skip controller, or a fixed one if frame_skip is given."""
+        from backend.app.services.frame_skip import FrameSkipController
+        
+        return FrameSkipController(
+            source_fps=fps or None,
+            camera_id=camera_id,
+            initial_skip=frame_skip,
+            min_skip=frame_skip,
+            max_skip=frame_skip,
+            queue_depth=queue_depth
+        )
+    
+    @staticmethod
+    def _activity(results: Dict) -> int:
+        """Riders detected in a frame, used as the traffic signal for sampling."""
+        detections = results.get('helmet_detections') or {}
+        return len(detections.get('helmets', [])) + len(detections.get('no_helmets', []))
+    
+    def _record_violations(self, stats: Dict, results: Dict):
+        stats['total_violations'] += len(results['violations'])
+        if self.auto_issue_challan:
+            stats['challans_issued'] += len(results['violations'])
+    
+    def _process_sequential(self, cap, stats: Dict, latitude: float, longitude: float,
+                            location_name: str, duration_seconds: int):
+        """Read every frame in order and process an adaptively sampled subset."""
+        sampler = self._sampler(cap.get(cv2.CAP_PROP_FPS))
         start_time = time.time()
         
-        frame_count = 0
         while (time.time() - start_time) < duration_seconds:
             ret, frame = cap.read()
             if not ret:
                 break
             
-            # Process every 5th frame for real-time performance
-            if frame_count % 5 == 0:
+            if sampler.should_process():
                 stats['total_frames_processed'] += 1
                 
                 results = self.processing_pipeline.process_frame(
@@ -287,17 +518,62 @@ class CompletePipeline:
                     longitude=longitude,
                     location_name=location_name
                 )
+                sampler.record(results['timings'], self._activity(results))
+                self._record_violations(stats, results)
+        
+        stats['sampling'] = sampler.telemetry()
+    
+    def _process_live(self, cap, stats: Dict, latitude: float, longitude: float,
+                      location_name: str, duration_seconds: int, max_lag: float):
+        """Always process the newest frame, bounding capture-to-decision lag."""
+        from backend.app.services.live_reader import LatencyStats, LatestFrameReader
+        
+        reader = LatestFrameReader(cap).start()
+        latency = LatencyStats()
+        stats.update({
+            'frames_dropped': 0,
+            'frames_stale': 0,
+            'late_decisions': 0,
+            'max_lag_seconds': max_lag
+        })
+        
+        start_time = time.time()
+        last = 0
+        try:
+            while (time.time() - start_time) < duration_seconds:
+                item = reader.latest(last, timeout=1.0)
+                if item is None:
+                    if reader.ended:
+                        break
+                    continue
+                sequence, captured_at, frame = item
+                stats['frames_dropped'] += sequence - last - 1
+                last = sequence
                 
-                stats['total_violations'] += len(results['violations'])
+                if time.monotonic() - captured_at > max_lag:
+                    # Already too old before inference started
+                    stats['frames_stale'] += 1
+                    continue
                 
-                if self.auto_issue_challan:
-                    stats['challans_issued'] += len(results['violations'])
-            
-            frame_count += 1
-        
-        cap.release()
-        logger.info(f"RTSP stream processing completed: {stats}")
-        return stats
+                stats['total_frames_processed'] += 1
+                results = self.processing_pipeline.process_frame(
+                    frame=frame,
+                    latitude=latitude,
+                    longitude=longitude,
+                    location_name=location_name
+                )
+                decision_lag = time.monotonic() - captured_at
+                latency.add(decision_lag)
+                
+                if decision_lag > max_lag:
+                    # Do not enforce on a scene that is no longer current
+                    stats['late_decisions'] += 1
+                    continue
+                self._record_violations(stats, results)
+        finally:
+            reader.stop()
+            stats['frames_read'] = reader.sequence
+            stats['latency'] = latency.summary()
 
 
 def main():
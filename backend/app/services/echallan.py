@@ -3,13 +3,14 @@ E-Challan Generation and Management Service
 """
 
 import logging
-import random
-import string
+import uuid
 from datetime import datetime, timedelta
 from typing import Optional
+from sqlalchemy.orm import Session
 from backend.app.models.database import (
     Challan, ChallanStatusEnum, Violation, ViolationTypeEnum
 )
+from backend.app.services.analytics import AnalyticsService
 
 logger = logging.getLogger(__name__)
 
@@ -23,11 +24,14 @@ class EChallanService:
     def generate_challan_number() -> str:
         """
         Generate unique E-challan number.
-        Format: ECH-YYYYMMDD-XXXXX
+        Format: ECH-YYYYMMDD-<32 hex digits of a UUID4>
+        
+        Unique by construction: a partitioned challans table cannot keep
+        a unique index on challan_number, so nothing in the database
+        would reject a repeated number.
         """
         date_str = datetime.now().strftime("%Y%m%d")
-        random_str = ''.join(random.choices(string.digits, k=5))
-        return f"ECH-{date_str}-{random_str}"
+        return f"ECH-{date_str}-{uuid.uuid4().hex.upper()}"
     
     @staticmethod
     def create_challan(
@@ -82,6 +86,27 @@ class EChallanService:
         logger.info(f"Created challan {challan.challan_number} for violation {violation_id}")
         return challan
     
+    @staticmethod
+    def persist_challan(db: Session, challan: Challan, commit: bool = True) -> Challan:
+        """
+        Save a challan and count it in the analytics counters.
+        
+        Args:
+            db: Database session
+            challan: Challan created by create_challan()
+            commit: Commit the transaction (False to batch several writes)
+            
+        Returns:
+            Persisted challan
+        """
+        db.add(challan)
+        db.flush()
+        AnalyticsService.record_challan(db, challan)
+        
+        if commit:
+            db.commit()
+        return challan
+    
     @staticmethod
     def mark_as_served(challan: Challan) -> Challan:
         """Mark challan as served."""
@@ -100,6 +125,9 @@ class EChallanService:
         """
         Record payment for challan.
         
+        Payments add up; any part of a payment beyond the outstanding
+        balance is not applied.
+        
         Args:
             challan: Challan to update
             amount: Payment amount
@@ -109,15 +137,17 @@ class EChallanService:
         Returns:
             Updated challan
         """
-        challan.paid_amount = amount
+        previously_paid = challan.paid_amount or 0.0
+        applied = min(amount, max(0.0, challan.penalty_amount - previously_paid))
+        challan.paid_amount = previously_paid + applied
         challan.payment_method = payment_method
         challan.payment_date = datetime.utcnow()
         challan.transaction_id = transaction_id
         
-        if amount >= challan.penalty_amount:
+        if challan.paid_amount >= challan.penalty_amount:
             challan.status = ChallanStatusEnum.PAID
         
-        logger.info(f"Recorded payment of {amount} for challan {challan.challan_number}")
+        logger.info(f"Recorded payment of {applied} for challan {challan.challan_number}")
         return challan
     
     @staticmethod
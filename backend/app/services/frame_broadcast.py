@@ -0,0 +1,223 @@
+"""
+Frame Broadcast Service
+Encode-once fan-out of a camera's frames to any number of viewers
+"""
+
+import logging
+import threading
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_JPEG_QUALITY = 80
+
+
+def encode_jpeg(frame, width: Optional[int] = None, quality: int = DEFAULT_JPEG_QUALITY) -> Optional[bytes]:
+    """
+    Encode a BGR frame as JPEG, optionally downscaled to a width.
+
+    Returns:
+        JPEG bytes, or None if encoding failed
+    """
+    import cv2
+
+    if width and frame.shape[1] > width:
+        height = max(1, round(frame.shape[0] * width / frame.shape[1]))
+        frame = cv2.resize(frame, (width, height), interpolation=cv2.INTER_AREA)
+    ret, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+    return buffer.tobytes() if ret else None
+
+
+class FrameBroadcaster:
+    """
+    Latest-frame broadcaster for one camera
+
+    The capture thread publishes each frame with a sequence number and
+    notifies a condition variable. Viewers block until a frame newer than
+    the last one they sent exists, then take the latest, so slow viewers
+    skip frames instead of queueing them. Each (frame, size, quality)
+    variant is encoded at most once, on first request, so encoding cost
+    is flat in the number of viewers and zero when nobody is watching.
+    """
+
+    def __init__(self, encoder: Callable = encode_jpeg):
+        """
+        Initialize broadcaster.
+
+        Args:
+            encoder: Callable(frame, width, quality) -> bytes
+        """
+        self.encoder = encoder
+        self.condition = threading.Condition()
+        self.encode_lock = threading.Lock()
+        self.sequence = 0
+        self.frame = None
+        self.closed = False
+        self.viewers = 0
+        self.encodes = 0
+        self.overlay = None
+        self.overlay_version = 0
+        self.event = None
+        self.event_version = 0
+        self._encoded: Dict[Tuple[Optional[int], int], Tuple[int, bytes]] = {}
+
+    def publish(self, frame) -> int:
+        """
+        Publish a new frame. The frame must not be modified afterwards.
+
+        Returns:
+            Sequence number assigned to the frame
+        """
+        with self.condition:
+            self.sequence += 1
+            self.frame = frame
+            self.closed = False
+            self.condition.notify_all()
+            return self.sequence
+
+    def publish_overlay(self, sequence: int, metadata: Dict) -> int:
+        """
+        Publish per-frame detection metadata (boxes, classes, plates) for
+        viewers to draw themselves.
+
+        Args:
+            sequence: Frame sequence number the metadata describes
+            metadata: Output of overlay.detection_metadata()
+
+        Returns:
+            Overlay version
+        """
+        with self.condition:
+            self.overlay_version += 1
+            self.overlay = {'sequence': sequence, **metadata}
+            return self.overlay_version
+
+    def publish_event(self, sequence: int, event: Dict) -> int:
+        """
+        Publish a detection result (violations, challan) for a frame.
+
+        Args:
+            sequence: Frame sequence number that was analysed
+            event: JSON-serializable result summary
+
+        Returns:
+            Event version
+        """
+        with self.condition:
+            self.event_version += 1
+            self.event = {'sequence': sequence, **event}
+            return self.event_version
+
+    def close(self):
+        """Wake all waiting viewers; used when the camera stops."""
+        with self.condition:
+            self.closed = True
+            self.frame = None
+            self.overlay = None
+            self.event = None
+            self.condition.notify_all()
+        with self.encode_lock:
+            self._encoded.clear()
+
+    def wait_for_frame(self, after: int = 0, timeout: Optional[float] = None) -> Optional[Tuple[int, object]]:
+        """
+        Block until a frame newer than `after` is published.
+
+        Args:
+            after: Last sequence number the caller has seen
+            timeout: Seconds to wait
+
+        Returns:
+            (sequence, frame) of the latest frame, or None on timeout/close
+        """
+        with self.condition:
+            ready = self.condition.wait_for(
+                lambda: self.closed or (self.frame is not None and self.sequence > after),
+                timeout=timeout
+            )
+            if not ready or self.closed:
+                return None
+            return self.sequence, self.frame
+
+    def latest(self) -> Optional[Tuple[int, object]]:
+        """Latest (sequence, frame) without waiting."""
+        with self.condition:
+            if self.frame is None:
+                return None
+            return self.sequence, self.frame
+
+    def encoded(self, sequence: int, frame, width: Optional[int] = None,
+                quality: int = DEFAULT_JPEG_QUALITY) -> Optional[bytes]:
+        """
+        JPEG for a published frame, encoding it only once per variant.
+
+        Args:
+            sequence: Sequence number of the frame
+            frame: The published frame
+            width: Target width (None for full size)
+            quality: JPEG quality
+
+        Returns:
+            JPEG bytes
+        """
+        key = (width, quality)
+        with self.encode_lock:
+            cached = self._encoded.get(key)
+            if cached is not None and cached[0] == sequence:
+                return cached[1]
+            data = self.encoder(frame, width, quality)
+            self.encodes += 1
+            if data is not None:
+                self._encoded[key] = (sequence, data)
+            return data
+
+    def wait_for_jpeg(self, after: int = 0, timeout: Optional[float] = None,
+                      width: Optional[int] = None,
+                      quality: int = DEFAULT_JPEG_QUALITY) -> Optional[Tuple[int, bytes]]:
+        """
+        Block for a newer frame and return it encoded.
+
+        Returns:
+            (sequence, jpeg) or None on timeout/close
+        """
+        latest = self.wait_for_frame(after, timeout)
+        if latest is None:
+            return None
+        sequence, frame = latest
+        data = self.encoded(sequence, frame, width, quality)
+        return (sequence, data) if data is not None else None
+
+    def stream(self, width: Optional[int] = None, quality: int = DEFAULT_JPEG_QUALITY,
+               idle_timeout: float = 1.0, is_active: Callable[[], bool] = None):
+        """
+        Yield (sequence, jpeg) for each frame this viewer keeps up with.
+
+        Args:
+            width: Target width (None for full size)
+            quality: JPEG quality
+            idle_timeout: Seconds between liveness checks while waiting
+            is_active: Return False to end the stream (e.g. camera stopped)
+        """
+        last = 0
+        with self.condition:
+            self.viewers += 1
+        try:
+            while is_active is None or is_active():
+                item = self.wait_for_jpeg(last, idle_timeout, width, quality)
+                if item is None:
+                    if self.closed:
+                        break
+                    continue
+                last = item[0]
+                yield item
+        finally:
+            with self.condition:
+                self.viewers -= 1
+
+    def stats(self) -> Dict:
+        """Broadcast counters for status endpoints."""
+        return {
+            'sequence': self.sequence,
+            'viewers': self.viewers,
+            'encodes': self.encodes
+        }
@@ -0,0 +1,179 @@
+"""
+Frame Ring Buffer
+Fixed-size, copy-free history of a camera's most recent frames
+"""
+
+import logging
+import threading
+import time
+from typing import List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CAPACITY = 10
+
+
+class CopyMeter:
+    """Counts bytes copied, with a per-second rate over the last full second."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.total = 0
+        self._second = int(time.monotonic())
+        self._current = 0
+        self._previous = 0
+
+    def _roll(self, now: int):
+        if now != self._second:
+            self._previous = self._current if now == self._second + 1 else 0
+            self._current = 0
+            self._second = now
+
+    def add(self, nbytes: int):
+        with self.lock:
+            self._roll(int(time.monotonic()))
+            self._current += nbytes
+            self.total += nbytes
+
+    def rate(self) -> int:
+        """Bytes copied during the last complete second."""
+        with self.lock:
+            self._roll(int(time.monotonic()))
+            return self._previous
+
+
+class FrameRing:
+    """
+    Ring buffer of the last N frames with capture timestamps and sequence numbers
+
+    Frames are handed off without copying: write() marks the frame
+    read-only and keeps a reference in the oldest slot, and readers get
+    that same reference. The capture thread never mutates a frame after
+    writing it (each decoded frame is a new array), so readers may hold
+    one as long as they like. Memory stays flat per camera at N frames
+    plus whatever readers still hold. Consumers that need a writable
+    frame call copy(), which is counted in bytes_copied.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        """
+        Initialize ring buffer.
+
+        Args:
+            capacity: Number of frames kept (VIDEO.BUFFER_SIZE)
+        """
+        self.capacity = max(1, int(capacity))
+        self.lock = threading.Lock()
+        self.frames = [None] * self.capacity
+        self.timestamps = [0.0] * self.capacity
+        self.sequences = [0] * self.capacity
+        self.sequence = 0
+        self.copies = CopyMeter()
+
+    def write(self, frame, timestamp: Optional[float] = None) -> int:
+        """
+        Publish a frame into the next slot. The frame is made read-only and
+        must not be modified by the caller afterwards.
+
+        Args:
+            frame: BGR frame
+            timestamp: Capture time (epoch seconds); defaults to now
+
+        Returns:
+            Sequence number assigned to the frame
+        """
+        frame.flags.writeable = False
+        with self.lock:
+            self.sequence += 1
+            slot = self.sequence % self.capacity
+            self.frames[slot] = frame
+            self.timestamps[slot] = timestamp if timestamp is not None else time.time()
+            self.sequences[slot] = self.sequence
+            return self.sequence
+
+    def clear(self):
+        """Forget buffered frames."""
+        with self.lock:
+            self.frames = [None] * self.capacity
+            self.sequences = [0] * self.capacity
+
+    def copy(self, frame):
+        """
+        Writable copy of a published frame, counted in bytes_copied.
+
+        Args:
+            frame: Frame returned by this ring
+
+        Returns:
+            New writable array
+        """
+        self.copies.add(frame.nbytes)
+        return frame.copy()
+
+    def _entry(self, slot: int) -> Tuple[int, float, object]:
+        return self.sequences[slot], self.timestamps[slot], self.frames[slot]
+
+    def _slots(self) -> List[int]:
+        """Occupied slots, oldest first."""
+        first = max(1, self.sequence - self.capacity + 1)
+        return [
+            seq % self.capacity for seq in range(first, self.sequence + 1)
+            if self.sequences[seq % self.capacity] == seq
+        ]
+
+    def latest(self) -> Optional[Tuple[int, float, object]]:
+        """
+        Most recent frame.
+
+        Returns:
+            (sequence, timestamp, frame) or None if empty
+        """
+        with self.lock:
+            slot = self.sequence % self.capacity
+            if self.sequence == 0 or self.sequences[slot] != self.sequence:
+                return None
+            return self._entry(slot)
+
+    def since(self, sequence: int) -> List[Tuple[int, float, object]]:
+        """
+        Buffered frames newer than a sequence number, oldest first.
+
+        Args:
+            sequence: Last sequence number the caller has seen
+
+        Returns:
+            List of (sequence, timestamp, frame); frames already overwritten are omitted
+        """
+        with self.lock:
+            return [self._entry(slot) for slot in self._slots() if self.sequences[slot] > sequence]
+
+    def window(self, start: float, end: Optional[float] = None) -> List[Tuple[int, float, object]]:
+        """
+        Buffered frames captured in [start, end], oldest first.
+
+        Args:
+            start: Window start (epoch seconds)
+            end: Window end (epoch seconds); defaults to now
+
+        Returns:
+            List of (sequence, timestamp, frame)
+        """
+        end = end if end is not None else time.time()
+        with self.lock:
+            return [
+                self._entry(slot) for slot in self._slots()
+                if start <= self.timestamps[slot] <= end
+            ]
+
+    def stats(self):
+        """Buffer counters for status endpoints."""
+        with self.lock:
+            slots = self._slots()
+            return {
+                'capacity': self.capacity,
+                'buffered': len(slots),
+                'sequence': self.sequence,
+                'bytes': sum(int(self.frames[slot].nbytes) for slot in slots),
+                'bytes_copied': self.copies.total,
+                'bytes_copied_per_sec': self.copies.rate()
+            }
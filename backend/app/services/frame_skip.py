@@ -0,0 +1,182 @@
+"""
+Adaptive Frame Sampling
+Chooses how often a camera's frames are analysed from measured throughput
+"""
+
+import logging
+import math
+import time
+from typing import Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Smoothing factor for per-stage latency and activity averages
+EWMA_ALPHA = 0.2
+
+
+class FrameSkipController:
+    """
+    Per-camera frame-skip controller
+
+    Analyses every `skip`-th frame. After every few analysed frames it
+    re-derives the smallest skip the measured per-stage latency can
+    sustain at the source frame rate without exceeding the utilization
+    target: more frames when the node has headroom (e.g. at night, when
+    frames without riders skip plate OCR), fewer when inference slows.
+    Busy scenes (many detections per frame) may use a higher utilization
+    target so fewer violations are missed at peak. A work queue deeper
+    than max_queue_depth counts as overload and backs off
+    multiplicatively; recovery is one step per adjustment so the rate
+    does not oscillate.
+    """
+
+    def __init__(
+        self,
+        source_fps: Optional[float] = None,
+        camera_id: Optional[str] = None,
+        initial_skip: Optional[int] = None,
+        min_skip: Optional[int] = None,
+        max_skip: Optional[int] = None,
+        target_utilization: Optional[float] = None,
+        queue_depth: Optional[Callable[[], int]] = None,
+        max_queue_depth: Optional[int] = None,
+        adjust_every: int = 10
+    ):
+        """
+        Initialize controller.
+
+        Args:
+            source_fps: Frame rate of the source (VIDEO.FPS if unknown)
+            camera_id: Camera the controller samples, for telemetry
+            initial_skip: Starting skip (VIDEO.FRAME_SKIP)
+            min_skip: Lower bound (VIDEO.MIN_FRAME_SKIP)
+            max_skip: Upper bound (VIDEO.MAX_FRAME_SKIP)
+            target_utilization: Share of real time inference may use
+                (VIDEO.TARGET_UTILIZATION)
+            queue_depth: Returns the current backlog (e.g. pending jobs);
+                polled at most every VIDEO.QUEUE_DEPTH_INTERVAL seconds
+            max_queue_depth: Backlog tolerated before backing off
+                (VIDEO.MAX_QUEUE_DEPTH); 0 disables backlog backoff
+            adjust_every: Analysed frames between adjustments
+        """
+        from backend.app.config import get_setting
+
+        self.camera_id = camera_id
+        self.source_fps = source_fps or get_setting("VIDEO.FPS", 30)
+        self.min_skip = min_skip or get_setting("VIDEO.MIN_FRAME_SKIP", 1)
+        self.max_skip = max(self.min_skip, max_skip or get_setting("VIDEO.MAX_FRAME_SKIP", 30))
+        self.skip = self._clamp(initial_skip or get_setting("VIDEO.FRAME_SKIP", 5))
+        self.target_utilization = target_utilization or get_setting("VIDEO.TARGET_UTILIZATION", 0.8)
+        self.busy_utilization = get_setting("VIDEO.BUSY_UTILIZATION", 0.95)
+        self.busy_detections = get_setting("VIDEO.BUSY_DETECTIONS", 3.0)
+        self.max_queue_depth = (
+            max_queue_depth if max_queue_depth is not None else get_setting("VIDEO.MAX_QUEUE_DEPTH", 8)
+        )
+        self.queue_depth = queue_depth
+        self.queue_depth_interval = get_setting("VIDEO.QUEUE_DEPTH_INTERVAL", 5.0)
+        self._queue_polled_at = None
+        self.adjust_every = adjust_every
+
+        self.stage_latency: Dict[str, float] = {}
+        self.activity = 0.0
+        self.last_queue_depth = 0
+        self.frames_seen = 0
+        self.frames_processed = 0
+        self.adjustments = 0
+        self.last_reason = "initial"
+        self._since_processed = None
+
+    def _clamp(self, skip: int) -> int:
+        return max(self.min_skip, min(self.max_skip, int(skip)))
+
+    def should_process(self) -> bool:
+        """Call once per frame read; True if this frame should be analysed."""
+        self.frames_seen += 1
+        if self._since_processed is None or self._since_processed + 1 >= self.skip:
+            self._since_processed = 0
+            return True
+        self._since_processed += 1
+        return False
+
+    def record(self, timings: Dict[str, float], detections: int = 0):
+        """
+        Feed back one analysed frame.
+
+        Args:
+            timings: Seconds spent per stage, e.g. {"helmet": 0.03, "plate": 0.05}
+            detections: Objects detected in the frame (traffic activity)
+        """
+        self.frames_processed += 1
+        for stage, seconds in timings.items():
+            previous = self.stage_latency.get(stage)
+            self.stage_latency[stage] = seconds if previous is None else (
+                EWMA_ALPHA * seconds + (1 - EWMA_ALPHA) * previous
+            )
+        self.activity = EWMA_ALPHA * detections + (1 - EWMA_ALPHA) * self.activity
+
+        if self.frames_processed % self.adjust_every == 0:
+            self._adjust()
+
+    @property
+    def latency(self) -> float:
+        """Smoothed seconds per analysed frame across all stages."""
+        return sum(self.stage_latency.values())
+
+    def _adjust(self):
+        busy = self.activity >= self.busy_detections
+        utilization = self.busy_utilization if busy else self.target_utilization
+        # Smallest skip whose time budget (skip / fps) covers the latency
+        needed = self._clamp(math.ceil(self.latency * self.source_fps / utilization) or 1)
+
+        backlog = self.max_queue_depth > 0 and self._poll_queue_depth() > self.max_queue_depth
+
+        if backlog:
+            skip = self._clamp(max(needed, self.skip * 2))
+            reason = f"backlog of {self.last_queue_depth}"
+        elif needed > self.skip:
+            skip = needed
+            reason = "over budget"
+        elif needed < self.skip:
+            skip = self.skip - 1
+            reason = "busy scene, headroom" if busy else "headroom"
+        else:
+            return
+
+        if skip != self.skip:
+            logger.debug(f"Frame skip {self.camera_id or ''} {self.skip} -> {skip} ({reason})")
+            self.skip = skip
+            self.adjustments += 1
+            self.last_reason = reason
+
+    def _poll_queue_depth(self) -> int:
+        """Backlog, re-read from queue_depth at most once per interval."""
+        now = time.monotonic()
+        if self.queue_depth is not None and (
+            self._queue_polled_at is None or now - self._queue_polled_at >= self.queue_depth_interval
+        ):
+            self._queue_polled_at = now
+            try:
+                self.last_queue_depth = self.queue_depth()
+            except Exception as e:
+                logger.warning(f"Queue depth unavailable: {str(e)}")
+        return self.last_queue_depth
+
+    def telemetry(self) -> Dict:
+        """Sampling state for stats and status endpoints."""
+        budget = self.skip / self.source_fps
+        return {
+            'camera_id': self.camera_id,
+            'frame_skip': self.skip,
+            'min_skip': self.min_skip,
+            'max_skip': self.max_skip,
+            'source_fps': round(self.source_fps, 2),
+            'analysed_fps': round(self.source_fps / self.skip, 2),
+            'stage_ms': {stage: round(seconds * 1000, 1) for stage, seconds in self.stage_latency.items()},
+            'utilization': round(self.latency / budget, 3) if budget else None,
+            'activity': round(self.activity, 2),
+            'queue_depth': self.last_queue_depth,
+            'frames_seen': self.frames_seen,
+            'frames_processed': self.frames_processed,
+            'adjustments': self.adjustments,
+            'last_reason': self.last_reason
+        }
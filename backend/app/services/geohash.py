@@ -0,0 +1,200 @@
+"""
+Geohash encoding and cell-cover utilities
+Pure-Python so it behaves the same on PostgreSQL and SQLite
+"""
+
+import math
+from typing import List, Optional, Tuple
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+_DECODE = {c: i for i, c in enumerate(BASE32)}
+
+EARTH_RADIUS_M = 6371000.0
+
+
+def encode(latitude: float, longitude: float, precision: int = 9) -> str:
+    """
+    Encode a coordinate as a geohash.
+
+    Args:
+        latitude: Latitude in degrees
+        longitude: Longitude in degrees
+        precision: Number of base32 characters
+
+    Returns:
+        Geohash string
+    """
+    lat_lo, lat_hi = -90.0, 90.0
+    lng_lo, lng_hi = -180.0, 180.0
+    chars = []
+    bits = 0
+    value = 0
+    even = True
+
+    while len(chars) < precision:
+        if even:
+            mid = (lng_lo + lng_hi) / 2
+            if longitude >= mid:
+                value = (value << 1) | 1
+                lng_lo = mid
+            else:
+                value <<= 1
+                lng_hi = mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if latitude >= mid:
+                value = (value << 1) | 1
+                lat_lo = mid
+            else:
+                value <<= 1
+                lat_hi = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits = 0
+            value = 0
+
+    return "".join(chars)
+
+
+def decode_bbox(geohash: str) -> Tuple[float, float, float, float]:
+    """
+    Decode a geohash to its cell bounds.
+
+    Returns:
+        (min_lat, max_lat, min_lng, max_lng)
+    """
+    lat_lo, lat_hi = -90.0, 90.0
+    lng_lo, lng_hi = -180.0, 180.0
+    even = True
+
+    for char in geohash:
+        value = _DECODE[char]
+        for shift in range(4, -1, -1):
+            bit = (value >> shift) & 1
+            if even:
+                mid = (lng_lo + lng_hi) / 2
+                if bit:
+                    lng_lo = mid
+                else:
+                    lng_hi = mid
+            else:
+                mid = (lat_lo + lat_hi) / 2
+                if bit:
+                    lat_lo = mid
+                else:
+                    lat_hi = mid
+            even = not even
+
+    return lat_lo, lat_hi, lng_lo, lng_hi
+
+
+def decode(geohash: str) -> Tuple[float, float]:
+    """Decode a geohash to its cell centre (latitude, longitude)."""
+    lat_lo, lat_hi, lng_lo, lng_hi = decode_bbox(geohash)
+    return (lat_lo + lat_hi) / 2, (lng_lo + lng_hi) / 2
+
+
+def cell_size(precision: int) -> Tuple[float, float]:
+    """
+    Cell size in degrees at a given precision.
+
+    Returns:
+        (lat_degrees, lng_degrees)
+    """
+    total_bits = 5 * precision
+    lng_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lng_bits)
+
+
+def covering_cells(
+    min_lat: float,
+    max_lat: float,
+    min_lng: float,
+    max_lng: float,
+    max_cells: int = 32,
+    max_precision: int = 9
+) -> List[str]:
+    """
+    Find the finest set of geohash cells that covers a bounding box
+    without exceeding max_cells.
+
+    Bounding boxes crossing the antimeridian are not supported.
+
+    Args:
+        min_lat, max_lat, min_lng, max_lng: Bounding box in degrees
+        max_cells: Upper bound on the number of cells returned
+        max_precision: Finest precision to consider
+
+    Returns:
+        List of geohash prefixes
+    """
+    best = [""]
+    for precision in range(1, max_precision + 1):
+        lat_step, lng_step = cell_size(precision)
+        lat_start = math.floor((min_lat + 90.0) / lat_step)
+        lat_end = math.floor((min(max_lat, 90.0 - 1e-9) + 90.0) / lat_step)
+        lng_start = math.floor((min_lng + 180.0) / lng_step)
+        lng_end = math.floor((min(max_lng, 180.0 - 1e-9) + 180.0) / lng_step)
+
+        count = (lat_end - lat_start + 1) * (lng_end - lng_start + 1)
+        if count > max_cells:
+            break
+
+        cells = []
+        for i in range(lat_start, lat_end + 1):
+            lat = -90.0 + (i + 0.5) * lat_step
+            for j in range(lng_start, lng_end + 1):
+                lng = -180.0 + (j + 0.5) * lng_step
+                cells.append(encode(lat, lng, precision))
+        best = cells
+
+    return best
+
+
+def prefix_range(prefix: str) -> Tuple[str, Optional[str]]:
+    """
+    Turn a geohash prefix into a half-open string range [lo, hi).
+
+    A range lets a plain b-tree index serve prefix lookups on any
+    database/collation, unlike LIKE 'abc%'.
+
+    Returns:
+        (lo, hi) where hi is None if the prefix has no successor
+    """
+    chars = list(prefix)
+    while chars:
+        idx = _DECODE[chars[-1]]
+        if idx + 1 < len(BASE32):
+            chars[-1] = BASE32[idx + 1]
+            return prefix, "".join(chars)
+        chars.pop()
+    return prefix, None
+
+
+def haversine_m(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance in meters."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+
+def radius_bbox(
+    latitude: float,
+    longitude: float,
+    radius_m: float
+) -> Tuple[float, float, float, float]:
+    """
+    Bounding box enclosing a circle.
+
+    Returns:
+        (min_lat, max_lat, min_lng, max_lng)
+    """
+    dlat = math.degrees(radius_m / EARTH_RADIUS_M)
+    cos_lat = max(math.cos(math.radians(latitude)), 1e-6)
+    dlng = math.degrees(radius_m / (EARTH_RADIUS_M * cos_lat))
+    return latitude - dlat, latitude + dlat, longitude - dlng, longitude + dlng
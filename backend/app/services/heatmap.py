@@ -0,0 +1,168 @@
+"""
+Heatmap Rollup Service
+Maintains grid-cell x hour violation counts in heatmap_data
+"""
+
+import logging
+import math
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from backend.app.config import get_setting
+from backend.app.database.upsert import upsert_increment
+from backend.app.models.database import (
+    Violation, ViolationHeatmapData, ViolationTypeEnum, ViolationSeverityEnum
+)
+
+logger = logging.getLogger(__name__)
+
+METERS_PER_DEGREE_LAT = 111320.0
+
+
+class HeatmapService:
+    """
+    Service for writing and querying heatmap rollups
+    """
+
+    SEVERITY_WEIGHTS = {
+        ViolationSeverityEnum.LOW: 1.0,
+        ViolationSeverityEnum.MEDIUM: 2.0,
+        ViolationSeverityEnum.HIGH: 3.0,
+        ViolationSeverityEnum.CRITICAL: 4.0
+    }
+
+    @staticmethod
+    def cell_size_meters() -> float:
+        """Grid cell edge length, from HEATMAP.VIOLATION_RADIUS."""
+        return float(get_setting("HEATMAP.VIOLATION_RADIUS", 100))
+
+    @staticmethod
+    def snap_to_grid(
+        latitude: float,
+        longitude: float,
+        cell_size_m: float = None
+    ) -> Tuple[float, float]:
+        """
+        Snap a coordinate to the centre of its grid cell.
+
+        Latitude rows have a fixed height; the longitude step of each row
+        is widened by 1/cos(latitude) so cells stay roughly square.
+
+        Args:
+            latitude: Latitude in degrees
+            longitude: Longitude in degrees
+            cell_size_m: Cell edge in meters (defaults to config)
+
+        Returns:
+            (cell_latitude, cell_longitude)
+        """
+        cell_size_m = cell_size_m or HeatmapService.cell_size_meters()
+
+        lat_step = cell_size_m / METERS_PER_DEGREE_LAT
+        cell_lat = (math.floor(latitude / lat_step) + 0.5) * lat_step
+
+        cos_lat = max(math.cos(math.radians(cell_lat)), 1e-6)
+        lng_step = cell_size_m / (METERS_PER_DEGREE_LAT * cos_lat)
+        cell_lng = (math.floor(longitude / lng_step) + 0.5) * lng_step
+
+        return round(cell_lat, 6), round(cell_lng, 6)
+
+    @staticmethod
+    def record_violation(db: Session, violation: Violation):
+        """
+        Add a violation to its cell x hour rollup.
+
+        Must run in the same transaction that persists the violation.
+
+        Args:
+            db: Database session
+            violation: Violation being persisted
+        """
+        if violation.latitude is None or violation.longitude is None:
+            return
+
+        cell_lat, cell_lng = HeatmapService.snap_to_grid(
+            violation.latitude, violation.longitude
+        )
+        ts = violation.timestamp or datetime.utcnow()
+
+        upsert_increment(
+            db,
+            ViolationHeatmapData,
+            keys={
+                'latitude': cell_lat,
+                'longitude': cell_lng,
+                'date': datetime(ts.year, ts.month, ts.day),
+                'hour': ts.hour,
+                'violation_type': ViolationTypeEnum(violation.violation_type)
+            },
+            increments={
+                'violation_count': 1,
+                'severity_score': HeatmapService.SEVERITY_WEIGHTS.get(
+                    violation.severity, 1.0
+                )
+            },
+            values={'created_at': datetime.utcnow()}
+        )
+
+    @staticmethod
+    def get_heatmap(
+        db: Session,
+        days: int = 7,
+        violation_type: Optional[ViolationTypeEnum] = None,
+        min_lat: Optional[float] = None,
+        max_lat: Optional[float] = None,
+        min_lng: Optional[float] = None,
+        max_lng: Optional[float] = None
+    ) -> Dict:
+        """
+        Aggregate rollups per cell for a day range and bounding box.
+
+        Args:
+            db: Database session
+            days: Number of days to look back (including today)
+            violation_type: Filter by violation type
+            min_lat, max_lat, min_lng, max_lng: Bounding box
+
+        Returns:
+            Dictionary with heatmap points and total violations
+        """
+        H = ViolationHeatmapData
+        today = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        since = today - timedelta(days=days - 1)
+
+        query = db.query(
+            H.latitude,
+            H.longitude,
+            func.sum(H.violation_count).label('violation_count'),
+            func.sum(H.severity_score).label('severity_score')
+        ).filter(H.date >= since)
+
+        if violation_type is not None:
+            query = query.filter(H.violation_type == violation_type)
+        if min_lat is not None:
+            query = query.filter(H.latitude >= min_lat)
+        if max_lat is not None:
+            query = query.filter(H.latitude <= max_lat)
+        if min_lng is not None:
+            query = query.filter(H.longitude >= min_lng)
+        if max_lng is not None:
+            query = query.filter(H.longitude <= max_lng)
+
+        points = []
+        total = 0
+        for row in query.group_by(H.latitude, H.longitude):
+            count = int(row.violation_count or 0)
+            total += count
+            point = {
+                'latitude': row.latitude,
+                'longitude': row.longitude,
+                'violation_count': count,
+                'severity_score': round(float(row.severity_score or 0.0), 2)
+            }
+            if violation_type is not None:
+                point['violation_type'] = violation_type.value
+            points.append(point)
+
+        return {'heatmap_data': points, 'total_violations': total}
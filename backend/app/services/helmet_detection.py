@@ -4,6 +4,7 @@ Real-time helmet detection from video/image streams
 """
 
 import logging
+import time
 import cv2
 import numpy as np
 from pathlib import Path
@@ -18,7 +19,8 @@ class HelmetDetector:
     Real-time helmet detection from video/image streams using YOLOv8
     """
     
-    def __init__(self, model_path: str, conf_threshold: float = 0.5, device: str = None):
+    def __init__(self, model_path: str, conf_threshold: float = 0.5, device: str = None,
+                 imgsz: int = None, iou: float = None, max_det: int = None):
         """
         Initialize helmet detector.
         
@@ -26,8 +28,16 @@ class HelmetDetector:
             model_path: Path to trained YOLO model
             conf_threshold: Confidence threshold for detections
             device: Device to run model on ('cuda' or 'cpu')
+            imgsz: Inference input size (DETECTION.HELMET.MODEL_INPUT_SIZE)
+            iou: NMS IoU threshold (DETECTION.HELMET.IOU_THRESHOLD)
+            max_det: Maximum detections per image (DETECTION.HELMET.MAX_DETECTIONS)
         """
+        from backend.app.config import get_setting
+        
         self.conf_threshold = conf_threshold
+        self.imgsz = imgsz or get_setting("DETECTION.HELMET.MODEL_INPUT_SIZE", 640)
+        self.iou = iou or get_setting("DETECTION.HELMET.IOU_THRESHOLD", 0.45)
+        self.max_det = max_det or get_setting("DETECTION.HELMET.MAX_DETECTIONS", 300)
         self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
         
         logger.info(f"Loading helmet detection model from {model_path}")
@@ -38,23 +48,60 @@ class HelmetDetector:
         self.class_names = {0: "helmet", 1: "no_helmet"}
         self.class_colors = {0: (0, 255, 0), 1: (0, 0, 255)}  # Green for helmet, Red for no_helmet
     
-    def detect(self, image: np.ndarray, return_crops: bool = False) -> dict:
+    def _predict_options(self, imgsz: int = None, iou: float = None, max_det: int = None) -> dict:
+        """model.predict() settings; per-call values override the detector's."""
+        return {
+            'conf': self.conf_threshold,
+            'imgsz': imgsz or self.imgsz,
+            'iou': iou or self.iou,
+            'max_det': max_det or self.max_det,
+            'verbose': False
+        }
+    
+    def detect(self, image: np.ndarray, return_crops: bool = False,
+               imgsz: int = None, iou: float = None, max_det: int = None) -> dict:
         """
         Detect helmets in image.
         
         Args:
             image: Input image (BGR format)
             return_crops: If True, return cropped regions
+            imgsz, iou, max_det: Override the detector's inference settings
+                for this call (e.g. from a camera's inference profile)
             
         Returns:
             Dictionary containing detections and metadata
         """
-        results = self.model.predict(source=image, conf=self.conf_threshold, verbose=False)
+        results = self.model.predict(source=image, **self._predict_options(imgsz, iou, max_det))
+        return self._parse_results(image, results, return_crops)
+    
+    def detect_batch(self, images: list, return_crops: bool = False,
+                     imgsz: int = None, iou: float = None, max_det: int = None) -> list:
+        """
+        Detect helmets in several images with one forward pass.
         
+        Args:
+            images: Input images (BGR format)
+            return_crops: If True, return cropped regions
+            imgsz, iou, max_det: Override the detector's inference settings
+            
+        Returns:
+            One detections dictionary per image, in input order
+        """
+        if not images:
+            return []
+        results = self.model.predict(source=list(images), **self._predict_options(imgsz, iou, max_det))
+        return [
+            self._parse_results(image, [result], return_crops)
+            for image, result in zip(images, results)
+        ]
+    
+    def _parse_results(self, image: np.ndarray, results, return_crops: bool) -> dict:
+        """Convert YOLO results for one image into a detections dictionary."""
         detections = {
             'helmets': [],
             'no_helmets': [],
-            'frame': image.copy(),
+            'frame': image,
             'raw_results': results
         }
         
@@ -71,7 +118,8 @@ class HelmetDetector:
                         'confidence': conf,
                         'class_id': class_id,
                         'class_name': class_name,
-                        'area': (x2 - x1) * (y2 - y1)
+                        'area': (x2 - x1) * (y2 - y1),
+                        'track_id': int(box.id[0]) if box.id is not None else None
                     }
                     
                     if return_crops:
@@ -144,20 +192,27 @@ class HelmetDetector:
         return output
     
     def process_video(self, video_path: str, output_path: str = None, 
-                     frame_skip: int = 5) -> dict:
+                     frame_skip: int = None) -> dict:
         """
         Process video file and detect helmets.
         
         Args:
             video_path: Path to input video
             output_path: Path to save output video (optional)
-            frame_skip: Process every nth frame
+            frame_skip: Process every nth frame; None adapts it to
+                measured detection speed (see FrameSkipController)
             
         Returns:
             Dictionary with statistics
         """
+        from backend.app.services.frame_skip import FrameSkipController
+        
         cap = cv2.VideoCapture(video_path)
         fps = cap.get(cv2.CAP_PROP_FPS)
+        sampler = FrameSkipController(
+            source_fps=fps or None, initial_skip=frame_skip,
+            min_skip=frame_skip, max_skip=frame_skip
+        )
         width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
         height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
         
@@ -175,7 +230,6 @@ class HelmetDetector:
             'no_helmets_found': 0
         }
         
-        frame_count = 0
         while True:
             ret, frame = cap.read()
             if not ret:
@@ -184,11 +238,16 @@ class HelmetDetector:
             stats['total_frames'] += 1
             
             # Process every nth frame
-            if frame_count % frame_skip == 0:
+            if sampler.should_process():
                 stats['processed_frames'] += 1
                 
                 # Detect helmets
+                started = time.perf_counter()
                 detections = self.detect(frame)
+                sampler.record(
+                    {'helmet': time.perf_counter() - started},
+                    len(detections['helmets']) + len(detections['no_helmets'])
+                )
                 stats['helmets_found'] += len(detections['helmets'])
                 stats['no_helmets_found'] += len(detections['no_helmets'])
                 stats['total_detections'] += len(detections['helmets']) + len(detections['no_helmets'])
@@ -197,22 +256,45 @@ class HelmetDetector:
                 violations = self.detect_violations(detections)
                 stats['violations'] += len(violations)
                 
-                # Draw on frame
-                frame = self.draw_detections(frame, detections)
+                # Draw on frame (only needed for the output video)
+                if writer:
+                    frame = self.draw_detections(frame, detections)
             
             if writer:
                 writer.write(frame)
-            
-            frame_count += 1
         
         cap.release()
         if writer:
             writer.release()
         
+        stats['sampling'] = sampler.telemetry()
         logger.info(f"Video processing completed: {stats}")
         return stats
 
 
+def create_helmet_detector(model_path: str = None, **kwargs):
+    """
+    Helmet detector selected by DETECTION.HELMET.MODE.
+    
+    Args:
+        model_path: Single-model weights (MODELS.HELMET_DETECTION); unused by the cascade
+        **kwargs: Passed to the detector (conf_threshold, device, imgsz, ...)
+        
+    Returns:
+        HelmetDetector ("single") or CascadeHelmetDetector ("cascade")
+    """
+    from backend.app.config import get_setting
+    
+    if get_setting("DETECTION.HELMET.MODE", "single") == "cascade":
+        from backend.app.services.rider_cascade import CascadeHelmetDetector
+        
+        return CascadeHelmetDetector(**kwargs)
+    return HelmetDetector(
+        model_path or get_setting("MODELS.HELMET_DETECTION", "models/helmet_detection/best.pt"),
+        **kwargs
+    )
+
+
 if __name__ == "__main__":
     # Example usage
     detector = HelmetDetector("models/helmet_detection/best.pt")
@@ -0,0 +1,71 @@
+"""
+Per-Camera Inference Profiles
+Detector settings (input size, NMS IoU, max detections) chosen per camera
+"""
+
+import json
+from typing import Callable, Dict, List, Optional, Sequence
+
+# Detection stages a profile can configure
+STAGES = ("helmet", "plate")
+
+# Settings a profile may override, with their types
+OPTIONS = {"imgsz": int, "iou": float, "max_det": int}
+
+
+def parse_profile(value) -> Dict[str, Dict]:
+    """
+    Normalize a camera's inference profile.
+
+    Args:
+        value: JSON string or dict such as
+            {"helmet": {"imgsz": 416}, "plate": {"imgsz": 640, "iou": 0.5}}
+
+    Returns:
+        {"helmet": {...}, "plate": {...}}; stages without overrides are empty
+    """
+    if isinstance(value, str):
+        value = json.loads(value) if value.strip() else None
+    value = value or {}
+
+    profile = {stage: {} for stage in STAGES}
+    for stage, options in value.items():
+        if stage not in profile:
+            raise ValueError(f"Unknown inference stage: {stage}")
+        for name, setting in (options or {}).items():
+            if name not in OPTIONS:
+                raise ValueError(f"Unknown {stage} inference setting: {name}")
+            if setting is not None:
+                profile[stage][name] = OPTIONS[name](setting)
+    return profile
+
+
+def run_grouped(fn: Callable[..., List], items: Sequence, options: Optional[Sequence[Dict]] = None) -> List:
+    """
+    Call a batched function once per distinct option set, keeping input order.
+
+    A model runs one input size per forward pass, so a batch mixing cameras
+    with different profiles is split into one sub-batch per profile.
+
+    Args:
+        fn: Batched function, called as fn(items, **options)
+        items: Inputs
+        options: One options dict per input (None: no overrides)
+
+    Returns:
+        One result per input, in input order
+    """
+    if not items:
+        return []
+    if options is None:
+        return list(fn(list(items)))
+
+    groups: Dict[tuple, List[int]] = {}
+    for index, item_options in enumerate(options):
+        groups.setdefault(tuple(sorted((item_options or {}).items())), []).append(index)
+
+    results = [None] * len(items)
+    for key, indexes in groups.items():
+        for index, result in zip(indexes, fn([items[i] for i in indexes], **dict(key))):
+            results[index] = result
+    return results
@@ -0,0 +1,322 @@
+"""
+Fair Inference Scheduler
+Shares one node's detector between cameras by weighted fair queuing
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Seconds over which served fps is measured
+RATE_WINDOW = 5.0
+
+# Smoothing factor for the batch latency estimate
+EWMA_ALPHA = 0.2
+
+
+class _Candidate:
+    """Newest frame a camera has offered, waiting for an inference slot."""
+
+    __slots__ = ("sequence", "frame", "captured_at", "deadline", "callback", "tag")
+
+    def __init__(self, sequence, frame, captured_at, deadline, callback, tag):
+        self.sequence = sequence
+        self.frame = frame
+        self.captured_at = captured_at
+        self.deadline = deadline
+        self.callback = callback
+        self.tag = tag
+
+
+class _CameraQueue:
+    """Per-camera scheduling state and counters."""
+
+    def __init__(self, camera_id: str, weight: float):
+        self.camera_id = camera_id
+        self.weight = weight
+        self.finish = 0.0
+        self.pending: Optional[_Candidate] = None
+        self.submitted = 0
+        self.served = 0
+        self.superseded = 0
+        self.expired = 0
+        self.failed = 0
+        self.served_at = deque()
+        self.wait_total = 0.0
+
+    def prune(self, now: float):
+        """Forget serve times older than the rate window."""
+        while self.served_at and self.served_at[0] < now - RATE_WINDOW:
+            self.served_at.popleft()
+
+
+class FairInferenceScheduler:
+    """
+    Central scheduler for live inference across cameras
+
+    Cameras submit their newest frame instead of calling the detector
+    themselves. Each camera holds at most one candidate: a newer frame
+    replaces the waiting one (counted as superseded), so a busy camera
+    never builds a backlog. Slots are assigned by weighted fair queuing:
+    a candidate's virtual finish tag is max(virtual time, the camera's
+    last tag) + 1 / weight and the smallest tags are served first, so
+    over time each backlogged camera gets inference in proportion to its
+    weight and an idle camera cannot bank credit. Candidates older than
+    their deadline are dropped unserved (counted as expired), and the
+    wait for a fuller batch never eats into the tightest deadline. One
+    worker thread runs each batch, which may span several cameras,
+    through a single batched inference call.
+    """
+
+    def __init__(
+        self,
+        infer: Callable[[List, List[str]], List],
+        batch_size: Optional[int] = None,
+        batch_wait: Optional[float] = None,
+        deadline: Optional[float] = None,
+        default_weight: Optional[float] = None,
+        autostart: bool = True
+    ):
+        """
+        Initialize scheduler.
+
+        Args:
+            infer: Called as infer(frames, camera_ids); returns one result per frame
+            batch_size: Frames per batch (CAMERA.INFERENCE_BATCH_SIZE)
+            batch_wait: Seconds to wait for a batch to fill (CAMERA.INFERENCE_BATCH_WAIT)
+            deadline: Seconds after capture a frame is still worth analysing
+                (CAMERA.INFERENCE_DEADLINE)
+            default_weight: Weight of cameras without a priority (CAMERA.DEFAULT_PRIORITY)
+            autostart: Start the worker thread on the first submission;
+                otherwise the caller drives run_once()
+        """
+        from backend.app.config import get_setting
+
+        self.infer = infer
+        self.batch_size = max(1, batch_size or get_setting("CAMERA.INFERENCE_BATCH_SIZE", 4))
+        self.batch_wait = batch_wait if batch_wait is not None else get_setting("CAMERA.INFERENCE_BATCH_WAIT", 0.02)
+        self.deadline = deadline if deadline is not None else get_setting("CAMERA.INFERENCE_DEADLINE", 1.0)
+        self.default_weight = default_weight or get_setting("CAMERA.DEFAULT_PRIORITY", 1)
+
+        self.condition = threading.Condition()
+        self.cameras: Dict[str, _CameraQueue] = {}
+        self.virtual_time = 0.0
+        self.batch_latency = None
+        self.batches = 0
+        self.frames_inferred = 0
+        self.autostart = autostart
+        self.thread = None
+
+    def _queue(self, camera_id: str, weight: Optional[float]) -> _CameraQueue:
+        """Camera's queue, created on first use; caller holds the condition."""
+        queue = self.cameras.get(camera_id)
+        if queue is None:
+            queue = self.cameras[camera_id] = _CameraQueue(camera_id, weight or self.default_weight)
+        elif weight:
+            queue.weight = weight
+        return queue
+
+    def set_weight(self, camera_id: str, weight: float):
+        """Change a camera's share of inference slots."""
+        if weight <= 0:
+            raise ValueError("Weight must be positive")
+        with self.condition:
+            self._queue(camera_id, weight)
+
+    def submit(
+        self,
+        camera_id: str,
+        sequence: int,
+        frame,
+        callback: Callable[[int, object, object], None],
+        captured_at: Optional[float] = None,
+        weight: Optional[float] = None
+    ):
+        """
+        Offer a camera's newest frame for inference.
+
+        Args:
+            camera_id: Camera the frame came from
+            sequence: Camera frame sequence number
+            frame: Frame to analyse (not modified)
+            callback: Called as callback(sequence, frame, result) on the
+                worker thread once the frame has been analysed
+            captured_at: Capture time (monotonic seconds); defaults to now
+            weight: Camera priority, updating its weight if given
+        """
+        captured_at = captured_at if captured_at is not None else time.monotonic()
+        with self.condition:
+            queue = self._queue(camera_id, weight)
+            queue.submitted += 1
+            if queue.pending is not None:
+                # Keep the waiting frame's place in line, but analyse the newer frame
+                queue.superseded += 1
+                tag = queue.pending.tag
+            else:
+                tag = max(self.virtual_time, queue.finish) + 1.0 / queue.weight
+            queue.pending = _Candidate(
+                sequence, frame, captured_at, captured_at + self.deadline, callback, tag
+            )
+            self._ensure_worker()
+            self.condition.notify_all()
+
+    def _ensure_worker(self):
+        """Start the worker thread; caller holds the condition."""
+        if self.autostart and self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="inference-scheduler", daemon=True)
+            self.thread.start()
+
+    def _pending(self) -> List[_CameraQueue]:
+        return [queue for queue in self.cameras.values() if queue.pending is not None]
+
+    def _expire(self, now: float):
+        """Drop candidates past their deadline; caller holds the condition."""
+        for queue in self._pending():
+            if queue.pending.deadline <= now:
+                queue.pending = None
+                queue.expired += 1
+
+    def _select(self, now: float) -> List[_CameraQueue]:
+        """
+        Take the next batch: live candidates with the smallest finish tags,
+        at most one per camera. Caller holds the condition.
+        """
+        self._expire(now)
+        ready = sorted(self._pending(), key=lambda queue: (queue.pending.tag, queue.pending.deadline))
+        return ready[:self.batch_size]
+
+    def _fill_wait(self, now: float) -> float:
+        """Seconds to wait for more candidates before running a partial batch."""
+        pending = self._pending()
+        if not pending or len(pending) >= self.batch_size:
+            return 0.0
+        slack = min(queue.pending.deadline for queue in pending) - now - (self.batch_latency or 0.0)
+        return max(0.0, min(self.batch_wait, slack))
+
+    def next_batch(self, timeout: Optional[float] = None) -> List:
+        """
+        Block until a batch is due and claim it (used by the worker).
+
+        Args:
+            timeout: Seconds to wait for any candidate
+
+        Returns:
+            List of (camera_id, candidate); empty on timeout
+        """
+        with self.condition:
+            if not self.condition.wait_for(lambda: bool(self._pending()), timeout=timeout):
+                return []
+            wait = self._fill_wait(time.monotonic())
+            if wait > 0:
+                self.condition.wait_for(lambda: len(self._pending()) >= self.batch_size, timeout=wait)
+
+            now = time.monotonic()
+            batch = []
+            for queue in self._select(now):
+                candidate, queue.pending = queue.pending, None
+                queue.finish = candidate.tag
+                queue.wait_total += now - candidate.captured_at
+                self.virtual_time = max(self.virtual_time, candidate.tag)
+                batch.append((queue.camera_id, candidate))
+            return batch
+
+    def _complete(self, batch: List, results: Optional[List], seconds: float):
+        """Record a finished batch."""
+        now = time.monotonic()
+        with self.condition:
+            self.batches += 1
+            self.batch_latency = seconds if self.batch_latency is None else (
+                EWMA_ALPHA * seconds + (1 - EWMA_ALPHA) * self.batch_latency
+            )
+            for camera_id, _ in batch:
+                queue = self.cameras.get(camera_id)
+                if queue is None:
+                    continue
+                if results is None:
+                    queue.failed += 1
+                    continue
+                queue.served += 1
+                queue.served_at.append(now)
+                queue.prune(now)
+            if results is not None:
+                self.frames_inferred += len(batch)
+
+    def run_once(self, timeout: Optional[float] = None) -> int:
+        """
+        Run one batch through inference and deliver the results.
+
+        Returns:
+            Number of frames analysed
+        """
+        batch = self.next_batch(timeout)
+        if not batch:
+            return 0
+
+        started = time.monotonic()
+        try:
+            results = self.infer(
+                [candidate.frame for _, candidate in batch],
+                [camera_id for camera_id, _ in batch]
+            )
+        except Exception as e:
+            logger.error(f"Inference batch of {len(batch)} failed: {str(e)}")
+            self._complete(batch, None, time.monotonic() - started)
+            return 0
+        self._complete(batch, results, time.monotonic() - started)
+
+        for (camera_id, candidate), result in zip(batch, results):
+            try:
+                candidate.callback(candidate.sequence, candidate.frame, result)
+            except Exception as e:
+                logger.error(f"Inference result handler failed on {camera_id}: {str(e)}")
+        return len(batch)
+
+    def _run(self):
+        """Worker loop; exits after a minute without candidates."""
+        while True:
+            if not self.run_once(timeout=60.0):
+                with self.condition:
+                    if not self._pending():
+                        self.thread = None
+                        return
+
+    def camera_stats(self, camera_id: str) -> Optional[Dict]:
+        """Scheduling counters for one camera, or None if it never submitted."""
+        now = time.monotonic()
+        with self.condition:
+            queue = self.cameras.get(camera_id)
+            if queue is None:
+                return None
+            queue.prune(now)
+            return {
+                'camera_id': camera_id,
+                'weight': queue.weight,
+                'submitted': queue.submitted,
+                'served': queue.served,
+                'served_fps': round(len(queue.served_at) / RATE_WINDOW, 2),
+                'dropped_superseded': queue.superseded,
+                'dropped_expired': queue.expired,
+                'failed': queue.failed,
+                'pending': queue.pending is not None,
+                'avg_wait_ms': round(queue.wait_total / queue.served * 1000, 1) if queue.served else 0.0
+            }
+
+    def stats(self) -> Dict:
+        """Scheduler counters plus every camera's share."""
+        with self.condition:
+            camera_ids = list(self.cameras)
+            summary = {
+                'batch_size': self.batch_size,
+                'deadline_s': self.deadline,
+                'batches': self.batches,
+                'frames_inferred': self.frames_inferred,
+                'avg_batch': round(self.frames_inferred / self.batches, 2) if self.batches else 0.0,
+                'batch_latency_ms': round(self.batch_latency * 1000, 1) if self.batch_latency is not None else None,
+                'virtual_time': round(self.virtual_time, 3)
+            }
+        summary['cameras'] = [stats for stats in map(self.camera_stats, camera_ids) if stats]
+        return summary
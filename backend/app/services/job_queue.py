@@ -0,0 +1,296 @@
+"""
+Processing Queue Service
+Durable job queue on the processing_queue table
+"""
+
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+from backend.app.config import get_setting
+from backend.app.models.database import ProcessingQueue
+
+logger = logging.getLogger(__name__)
+
+PENDING = "PENDING"
+PROCESSING = "PROCESSING"
+COMPLETED = "COMPLETED"
+FAILED = "FAILED"
+
+
+class JobQueue:
+    """
+    Enqueue, claim and settle processing jobs.
+
+    Claims use SELECT ... FOR UPDATE SKIP LOCKED on PostgreSQL so many
+    workers on many nodes never block on or double-claim a job. Other
+    databases (SQLite) fall back to a conditional UPDATE that only one
+    worker can win.
+    """
+
+    @staticmethod
+    def enqueue(
+        db: Session,
+        source_path: str,
+        source_type: str = "VIDEO",
+        camera_id: str = None,
+        priority: int = 0,
+        latitude: float = None,
+        longitude: float = None,
+        location_name: str = None,
+        max_attempts: int = None
+    ) -> ProcessingQueue:
+        """
+        Add a job to the queue.
+
+        Args:
+            db: Database session
+            source_path: Path to the image/video on shared storage
+            source_type: IMAGE or VIDEO
+            camera_id: Camera that recorded the source
+            priority: Higher runs first
+            latitude, longitude, location_name: Location if camera_id is unknown
+            max_attempts: Attempts before the job is marked FAILED
+
+        Returns:
+            Persisted job
+        """
+        job = ProcessingQueue(
+            source_path=source_path,
+            source_type=source_type,
+            camera_id=camera_id,
+            priority=priority,
+            latitude=latitude,
+            longitude=longitude,
+            location_name=location_name,
+            status=PENDING,
+            attempts=0,
+            max_attempts=max_attempts or get_setting("WORKER.MAX_ATTEMPTS", 3),
+            available_at=datetime.utcnow()
+        )
+        db.add(job)
+        db.commit()
+        logger.info(f"Enqueued {source_type} job {job.id}: {source_path}")
+        return job
+
+    @staticmethod
+    def claim(db: Session, worker_id: str) -> Optional[ProcessingQueue]:
+        """
+        Claim the next runnable job for worker_id.
+
+        Args:
+            db: Database session
+            worker_id: Unique id of the claiming worker
+
+        Returns:
+            Claimed job, or None if the queue is empty
+        """
+        now = datetime.utcnow()
+        Q = ProcessingQueue
+        candidates = db.query(Q).filter(
+            Q.status == PENDING,
+            or_(Q.available_at.is_(None), Q.available_at <= now)
+        ).order_by(Q.priority.desc(), Q.created_at, Q.id)
+
+        if db.get_bind().dialect.name == "postgresql":
+            job = candidates.with_for_update(skip_locked=True).limit(1).first()
+            if job is None:
+                db.rollback()
+                return None
+            job.status = PROCESSING
+            job.worker_id = worker_id
+            job.started_at = now
+            job.heartbeat_at = now
+            job.attempts = (job.attempts or 0) + 1
+            db.commit()
+            return job
+
+        # Portable fallback: whoever flips PENDING -> PROCESSING first wins
+        for (job_id,) in candidates.with_entities(Q.id).limit(5).all():
+            claimed = db.query(Q).filter(Q.id == job_id, Q.status == PENDING).update({
+                Q.status: PROCESSING,
+                Q.worker_id: worker_id,
+                Q.started_at: now,
+                Q.heartbeat_at: now,
+                Q.attempts: Q.attempts + 1
+            }, synchronize_session=False)
+            db.commit()
+            if claimed:
+                return db.query(Q).filter(Q.id == job_id).first()
+        return None
+
+    @staticmethod
+    def pending_count(db: Session) -> int:
+        """Number of jobs waiting to be claimed."""
+        return db.query(ProcessingQueue).filter(ProcessingQueue.status == PENDING).count()
+
+    @staticmethod
+    def heartbeat(db: Session, job_id: int, worker_id: str) -> bool:
+        """
+        Extend the worker's lease on a job.
+
+        Returns:
+            False if the job is no longer held by this worker
+        """
+        Q = ProcessingQueue
+        updated = db.query(Q).filter(
+            Q.id == job_id,
+            Q.worker_id == worker_id,
+            Q.status == PROCESSING
+        ).update({Q.heartbeat_at: datetime.utcnow()}, synchronize_session=False)
+        db.commit()
+        return bool(updated)
+
+    @staticmethod
+    def update_progress(
+        db: Session,
+        job_id: int,
+        worker_id: str,
+        frames_processed: int,
+        total_frames: Optional[int] = None,
+        fps: Optional[float] = None,
+        violations_found: int = 0
+    ) -> bool:
+        """
+        Record progress for a running job; also renews the lease.
+
+        Returns:
+            False if the job is no longer held by this worker
+        """
+        Q = ProcessingQueue
+        updated = db.query(Q).filter(
+            Q.id == job_id,
+            Q.worker_id == worker_id,
+            Q.status == PROCESSING
+        ).update({
+            Q.frames_processed: frames_processed,
+            Q.total_frames: total_frames,
+            Q.fps: fps,
+            Q.violations_found: violations_found,
+            Q.heartbeat_at: datetime.utcnow()
+        }, synchronize_session=False)
+        db.commit()
+        return bool(updated)
+
+    @staticmethod
+    def to_dict(job: ProcessingQueue) -> Dict:
+        """Serialize a job and its progress for API responses."""
+        progress = None
+        if job.total_frames:
+            progress = round(min(1.0, (job.frames_processed or 0) / job.total_frames), 4)
+        return {
+            'job_id': job.id,
+            'status': job.status,
+            'source_type': job.source_type,
+            'camera_id': job.camera_id,
+            'priority': job.priority,
+            'attempts': job.attempts,
+            'frames_processed': job.frames_processed or 0,
+            'total_frames': job.total_frames,
+            'progress': progress,
+            'fps': job.fps,
+            'violations_found': job.violations_found or 0,
+            'error_message': job.error_message,
+            'result': json.loads(job.result) if job.result else None,
+            'created_at': job.created_at.isoformat() if job.created_at else None,
+            'started_at': job.started_at.isoformat() if job.started_at else None,
+            'processed_at': job.processed_at.isoformat() if job.processed_at else None
+        }
+
+    @staticmethod
+    def complete(db: Session, job_id: int, worker_id: str, result: Dict = None) -> bool:
+        """
+        Mark a job COMPLETED if this worker still holds it.
+
+        Writes staged in `db` (e.g. the job's violations) commit together
+        with the completion, or are rolled back if the lease was lost, so
+        a retried or reclaimed job never stores its output twice.
+
+        Returns:
+            False if the job is no longer held by this worker
+        """
+        Q = ProcessingQueue
+        updated = db.query(Q).filter(
+            Q.id == job_id,
+            Q.worker_id == worker_id,
+            Q.status == PROCESSING
+        ).update({
+            Q.status: COMPLETED,
+            Q.processed_at: datetime.utcnow(),
+            Q.error_message: None,
+            Q.result: json.dumps(result, default=str) if result is not None else None
+        }, synchronize_session=False)
+        if not updated:
+            db.rollback()
+            return False
+        db.commit()
+        return True
+
+    @staticmethod
+    def fail(db: Session, job_id: int, worker_id: str, error_message: str) -> Optional[str]:
+        """
+        Record a failed attempt; requeue with backoff or mark FAILED.
+
+        Returns:
+            New status, or None if the worker no longer held the job
+        """
+        Q = ProcessingQueue
+        job = db.query(Q).filter(
+            Q.id == job_id, Q.worker_id == worker_id, Q.status == PROCESSING
+        ).first()
+        if job is None:
+            db.rollback()
+            return None
+
+        job.error_message = error_message
+        job.worker_id = None
+        if (job.attempts or 0) < (job.max_attempts or 1):
+            backoff = get_setting("WORKER.RETRY_BACKOFF", 30) * (2 ** ((job.attempts or 1) - 1))
+            job.status = PENDING
+            job.available_at = datetime.utcnow() + timedelta(seconds=backoff)
+        else:
+            job.status = FAILED
+            job.processed_at = datetime.utcnow()
+        db.commit()
+        logger.warning(f"Job {job_id} attempt {job.attempts} failed ({job.status}): {error_message}")
+        return job.status
+
+    @staticmethod
+    def requeue_stale(db: Session, stale_after_seconds: float = None) -> int:
+        """
+        Release jobs whose worker stopped heartbeating.
+
+        Returns:
+            Number of jobs released
+        """
+        stale_after_seconds = stale_after_seconds or get_setting("WORKER.STALE_AFTER", 60)
+        cutoff = datetime.utcnow() - timedelta(seconds=stale_after_seconds)
+        Q = ProcessingQueue
+        lost = "Worker heartbeat lost"
+
+        retried = db.query(Q).filter(
+            Q.status == PROCESSING,
+            Q.heartbeat_at < cutoff,
+            Q.attempts < Q.max_attempts
+        ).update({
+            Q.status: PENDING,
+            Q.worker_id: None,
+            Q.error_message: lost,
+            Q.available_at: datetime.utcnow()
+        }, synchronize_session=False)
+        failed = db.query(Q).filter(
+            Q.status == PROCESSING,
+            Q.heartbeat_at < cutoff
+        ).update({
+            Q.status: FAILED,
+            Q.worker_id: None,
+            Q.error_message: lost,
+            Q.processed_at: datetime.utcnow()
+        }, synchronize_session=False)
+        db.commit()
+
+        if retried or failed:
+            logger.warning(f"Released stale jobs: {retried} requeued, {failed} failed")
+        return retried + failed
@@ -0,0 +1,110 @@
+"""
+Live Frame Reader
+Drains a capture source on its own thread so consumers always get the newest frame
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class LatestFrameReader:
+    """
+    Reads a cv2.VideoCapture continuously, keeping only the newest frame
+
+    A slow consumer never lets OpenCV's internal buffer back up: frames it
+    does not take are overwritten and counted as dropped, and each frame
+    carries its capture time so the consumer can measure and bound lag.
+    """
+
+    def __init__(self, cap):
+        """
+        Initialize reader.
+
+        Args:
+            cap: Opened cv2.VideoCapture
+        """
+        self.cap = cap
+        self.condition = threading.Condition()
+        self.sequence = 0
+        self.frame = None
+        self.captured_at = None
+        self.ended = False
+        self._stopped = False
+        self.thread = None
+
+    def start(self) -> "LatestFrameReader":
+        """Start the reader thread."""
+        self.thread = threading.Thread(target=self._run, name="live-reader", daemon=True)
+        self.thread.start()
+        return self
+
+    def _run(self):
+        while not self._stopped:
+            ret, frame = self.cap.read()
+            captured_at = time.monotonic()
+            with self.condition:
+                if not ret:
+                    self.ended = True
+                    self.condition.notify_all()
+                    return
+                self.sequence += 1
+                self.frame = frame
+                self.captured_at = captured_at
+                self.condition.notify_all()
+
+    def latest(self, after: int = 0, timeout: Optional[float] = None) -> Optional[Tuple[int, float, object]]:
+        """
+        Wait for a frame newer than `after`.
+
+        Args:
+            after: Last sequence number the caller has seen
+            timeout: Seconds to wait
+
+        Returns:
+            (sequence, captured_at monotonic seconds, frame), or None on
+            timeout or end of stream
+        """
+        with self.condition:
+            self.condition.wait_for(lambda: self.ended or self.sequence > after, timeout=timeout)
+            if self.sequence <= after:
+                return None
+            return self.sequence, self.captured_at, self.frame
+
+    def stop(self):
+        """Stop reading; the caller releases the capture afterwards."""
+        self._stopped = True
+        if self.thread is not None:
+            self.thread.join(timeout=5)
+
+
+class LatencyStats:
+    """Capture-to-decision latency summary over the most recent decisions."""
+
+    def __init__(self, window: int = 1000):
+        self.samples = deque(maxlen=window)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def add(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.maximum = max(self.maximum, seconds)
+        self.samples.append(seconds)
+
+    def summary(self) -> Dict[str, float]:
+        """Average, p50, p95 and max latency in milliseconds."""
+        if not self.count:
+            return {'avg_ms': 0.0, 'p50_ms': 0.0, 'p95_ms': 0.0, 'max_ms': 0.0}
+        ordered = sorted(self.samples)
+        return {
+            'avg_ms': round(self.total / self.count * 1000, 1),
+            'p50_ms': round(ordered[len(ordered) // 2] * 1000, 1),
+            'p95_ms': round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000, 1),
+            'max_ms': round(self.maximum * 1000, 1)
+        }
@@ -0,0 +1,136 @@
+"""
+Detection Overlay Metadata
+Compact per-frame detection summaries for client-side rendering
+"""
+
+from typing import Dict, List, Optional
+
+
+def _box(detection: Dict) -> List[int]:
+    return [int(v) for v in detection['bbox']]
+
+
+def _iou(a: List[int], b: List[int]) -> float:
+    width = min(a[2], b[2]) - max(a[0], b[0])
+    height = min(a[3], b[3]) - max(a[1], b[1])
+    if width <= 0 or height <= 0:
+        return 0.0
+    inter = width * height
+    union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+    return inter / union if union > 0 else 0.0
+
+
+class ObjectTracker:
+    """
+    Stable track ids for one camera's overlay objects
+
+    Live detection batches frames from several cameras through
+    model.predict(), so the detector has no tracker state and boxes
+    arrive without ids. Each object is matched greedily to the previous
+    frames' boxes of the same class by IoU; unmatched objects get new ids
+    and tracks unseen for max_missed frames are dropped. Objects that
+    already carry a detector track id are left alone.
+    """
+
+    def __init__(self, iou_threshold: float = 0.3, max_missed: int = 5):
+        self.iou_threshold = iou_threshold
+        self.max_missed = max_missed
+        self.tracks: Dict[int, Dict] = {}
+        self.next_id = 1
+
+    def update(self, objects: List[Dict]) -> List[Dict]:
+        """
+        Set 'track' on each object of a new frame.
+
+        Args:
+            objects: detection_metadata()['objects'], updated in place
+
+        Returns:
+            The same objects
+        """
+        candidates = sorted(
+            (
+                (_iou(obj['box'], track['box']), index, track_id)
+                for index, obj in enumerate(objects) if obj.get('track') is None
+                for track_id, track in self.tracks.items() if track['cls'] == obj['cls']
+            ),
+            reverse=True
+        )
+        seen = set()
+        assigned = set()
+        for iou, index, track_id in candidates:
+            if iou < self.iou_threshold:
+                break
+            if index in assigned or track_id in seen:
+                continue
+            objects[index]['track'] = track_id
+            assigned.add(index)
+            seen.add(track_id)
+
+        for index, obj in enumerate(objects):
+            if obj.get('track') is None:
+                obj['track'] = self.next_id
+                self.next_id += 1
+                assigned.add(index)
+                seen.add(obj['track'])
+
+        for track_id in list(self.tracks):
+            if track_id not in seen:
+                self.tracks[track_id]['missed'] += 1
+                if self.tracks[track_id]['missed'] > self.max_missed:
+                    del self.tracks[track_id]
+        for index in assigned:
+            obj = objects[index]
+            self.tracks[obj['track']] = {'box': obj['box'], 'cls': obj['cls'], 'missed': 0}
+        return objects
+
+
+def detection_metadata(
+    frame_shape,
+    helmet_detections: Optional[Dict] = None,
+    plate_results: Optional[Dict] = None
+) -> Dict:
+    """
+    Summarize detections for a frame so viewers can draw overlays themselves.
+
+    Args:
+        frame_shape: Shape of the analysed frame (height, width, ...)
+        helmet_detections: Output of HelmetDetector.detect()
+        plate_results: Output of NumberPlateRecognitionPipeline.process_image()
+
+    Returns:
+        {"frame": [w, h], "objects": [...], "plates": [...], "violations": n}
+        with boxes in frame pixel coordinates
+    """
+    objects = []
+    if helmet_detections:
+        for detection in helmet_detections.get('helmets', []) + helmet_detections.get('no_helmets', []):
+            obj = {
+                'box': _box(detection),
+                'cls': detection.get('class_name'),
+                'conf': round(float(detection.get('confidence', 0.0)), 3)
+            }
+            if detection.get('track_id') is not None:
+                obj['track'] = detection['track_id']
+            objects.append(obj)
+
+    plates = []
+    if plate_results:
+        detections = plate_results.get('detections', {}).get('plates', [])
+        ocr_plates = (plate_results.get('ocr') or {}).get('plates', [])
+        for idx, detection in enumerate(detections):
+            plate = {
+                'box': _box(detection),
+                'conf': round(float(detection.get('confidence', 0.0)), 3)
+            }
+            if idx < len(ocr_plates) and ocr_plates[idx].get('cleaned_text'):
+                plate['text'] = ocr_plates[idx]['cleaned_text']
+                plate['valid'] = bool(ocr_plates[idx].get('is_valid_indian_plate'))
+            plates.append(plate)
+
+    return {
+        'frame': [int(frame_shape[1]), int(frame_shape[0])],
+        'objects': objects,
+        'plates': plates,
+        'violations': sum(1 for obj in objects if obj['cls'] == 'no_helmet')
+    }
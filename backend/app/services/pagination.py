@@ -0,0 +1,84 @@
+"""
+Keyset (cursor) pagination helpers
+Pages are ordered newest first on (timestamp, id)
+"""
+
+import base64
+from datetime import datetime
+from typing import List, Optional, Tuple
+from sqlalchemy import tuple_
+
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    """
+    Encode the last row of a page as an opaque cursor.
+
+    Args:
+        timestamp: Timestamp of the last row
+        row_id: Primary key of the last row
+
+    Returns:
+        URL-safe cursor string
+    """
+    raw = f"{timestamp.isoformat()}|{row_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor produced by encode_cursor().
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        ts_str, id_str = raw.rsplit("|", 1)
+        return datetime.fromisoformat(ts_str), int(id_str)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def keyset_paginate(
+    query,
+    timestamp_column,
+    id_column,
+    cursor: Optional[str] = None,
+    limit: int = 100
+) -> Tuple[List, Optional[str]]:
+    """
+    Fetch one page of a query ordered by (timestamp, id) descending.
+
+    Each page is a single index range scan starting after the cursor, so
+    deep pages cost the same as the first one.
+
+    Args:
+        query: SQLAlchemy query over the mapped rows
+        timestamp_column: Timestamp column of the sort key
+        id_column: Primary key column breaking timestamp ties
+        cursor: Cursor from the previous page, or None for the first page
+        limit: Page size
+
+    Returns:
+        (rows, next_cursor) where next_cursor is None on the last page
+    """
+    if cursor:
+        cursor_ts, cursor_id = decode_cursor(cursor)
+        query = query.filter(
+            tuple_(timestamp_column, id_column) < tuple_(cursor_ts, cursor_id)
+        )
+
+    rows = query.order_by(
+        timestamp_column.desc(), id_column.desc()
+    ).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            getattr(last, timestamp_column.key), getattr(last, id_column.key)
+        )
+
+    return rows, next_cursor
@@ -20,7 +20,8 @@ class NumberPlateDetector:
     Detects vehicle number plates in images/videos using YOLOv8
     """
     
-    def __init__(self, model_path: str, conf_threshold: float = 0.4, device: str = None):
+    def __init__(self, model_path: str, conf_threshold: float = 0.4, device: str = None,
+                 imgsz: int = None, iou: float = None, max_det: int = None):
         """
         Initialize number plate detector.
         
@@ -28,27 +29,72 @@ class NumberPlateDetector:
             model_path: Path to trained YOLO model
             conf_threshold: Confidence threshold
             device: 'cuda' or 'cpu'
+            imgsz: Inference input size (DETECTION.PLATE.MODEL_INPUT_SIZE)
+            iou: NMS IoU threshold (DETECTION.PLATE.IOU_THRESHOLD)
+            max_det: Maximum detections per image (DETECTION.PLATE.MAX_DETECTIONS)
         """
+        from backend.app.config import get_setting
+        
         self.conf_threshold = conf_threshold
+        self.imgsz = imgsz or get_setting("DETECTION.PLATE.MODEL_INPUT_SIZE", 640)
+        self.iou = iou or get_setting("DETECTION.PLATE.IOU_THRESHOLD", 0.45)
+        self.max_det = max_det or get_setting("DETECTION.PLATE.MAX_DETECTIONS", 100)
         self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
         
         logger.info(f"Loading number plate detection model from {model_path}")
         self.model = YOLO(model_path)
         self.model.to(self.device)
     
-    def detect(self, image: np.ndarray, return_crops: bool = True) -> dict:
+    def _predict_options(self, imgsz: int = None, iou: float = None, max_det: int = None) -> dict:
+        """model.predict() settings; per-call values override the detector's."""
+        return {
+            'conf': self.conf_threshold,
+            'imgsz': imgsz or self.imgsz,
+            'iou': iou or self.iou,
+            'max_det': max_det or self.max_det,
+            'verbose': False
+        }
+    
+    def detect(self, image: np.ndarray, return_crops: bool = True,
+               imgsz: int = None, iou: float = None, max_det: int = None) -> dict:
         """
         Detect number plates in image.
         
         Args:
             image: Input image (BGR)
             return_crops: If True, return cropped plate regions
+            imgsz, iou, max_det: Override the detector's inference settings
+                for this call (e.g. from a camera's inference profile)
             
         Returns:
             Dictionary with detections
         """
-        results = self.model.predict(source=image, conf=self.conf_threshold, verbose=False)
+        results = self.model.predict(source=image, **self._predict_options(imgsz, iou, max_det))
+        return self._parse_results(image, results, return_crops)
+    
+    def detect_batch(self, images: list, return_crops: bool = True,
+                     imgsz: int = None, iou: float = None, max_det: int = None) -> list:
+        """
+        Detect number plates in several images with one forward pass.
         
+        Args:
+            images: Input images (BGR)
+            return_crops: If True, return cropped plate regions
+            imgsz, iou, max_det: Override the detector's inference settings
+            
+        Returns:
+            One detections dictionary per image, in input order
+        """
+        if not images:
+            return []
+        results = self.model.predict(source=list(images), **self._predict_options(imgsz, iou, max_det))
+        return [
+            self._parse_results(image, [result], return_crops)
+            for image, result in zip(images, results)
+        ]
+    
+    def _parse_results(self, image: np.ndarray, results, return_crops: bool) -> dict:
+        """Convert YOLO results for one image into a detections dictionary."""
         detections = {
             'plates': [],
             'raw_results': results
@@ -290,19 +336,39 @@ class NumberPlateRecognitionPipeline:
         self.plate_detector = NumberPlateDetector(plate_detector_model)
         self.ocr = PlateOCR(languages=ocr_languages)
     
-    def process_image(self, image: np.ndarray) -> dict:
+    def process_image(self, image: np.ndarray, **options) -> dict:
         """
         Process image: detect plates and extract text.
         
         Args:
             image: Input image
+            **options: imgsz / iou / max_det overrides for plate detection
             
         Returns:
             Complete results with detections and OCR
         """
         # Detect plates
-        detections = self.plate_detector.detect(image, return_crops=True)
+        detections = self.plate_detector.detect(image, return_crops=True, **options)
+        return self._recognize(detections)
+    
+    def process_batch(self, images: list, **options) -> list:
+        """
+        Process several images with one plate-detection forward pass.
         
+        Args:
+            images: Input images
+            **options: imgsz / iou / max_det overrides for plate detection
+            
+        Returns:
+            One result dictionary per image, in input order
+        """
+        return [
+            self._recognize(detections)
+            for detections in self.plate_detector.detect_batch(images, return_crops=True, **options)
+        ]
+    
+    def _recognize(self, detections: dict) -> dict:
+        """Run OCR on detected plate crops and combine the results."""
         # Extract OCR from crops
         plate_crops = [d['crop'] for d in detections['plates']]
         ocr_results = self.ocr.extract_from_crops(plate_crops) if plate_crops else {}
@@ -369,10 +435,11 @@ class NumberPlateRecognitionPipeline:
                         'confidence': plate['confidence']
                     })
                 
-                # Draw on frame
-                frame = self.plate_detector.draw_detections(
-                    frame, results['detections'], results['ocr']
-                )
+                # Draw on frame (only needed for the output video)
+                if writer:
+                    frame = self.plate_detector.draw_detections(
+                        frame, results['detections'], results['ocr']
+                    )
             
             if writer:
                 writer.write(frame)
@@ -0,0 +1,318 @@
+"""
+Processing Worker Pool
+Drains the processing_queue table through CompletePipeline
+"""
+
+import argparse
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+import uuid
+from typing import Callable, Dict, Optional
+from backend.app.config import get_setting
+from backend.app.database.database import SessionLocal
+from backend.app.models.database import CameraLocation, ProcessingQueue
+from backend.app.services.job_queue import JobQueue
+
+logger = logging.getLogger(__name__)
+
+
+def default_pipeline_factory():
+    """Build a CompletePipeline from the configured model paths."""
+    from backend.app.services.complete_pipeline import CompletePipeline
+    return CompletePipeline(
+        helmet_model_path=get_setting("MODELS.HELMET_DETECTION", "models/helmet_detection/best.pt"),
+        plate_model_path=get_setting("MODELS.PLATE_DETECTION", "models/plate_detection/best.pt"),
+        auto_issue_challan=get_setting("ECHALLAN.AUTO_ISSUE", False)
+    )
+
+
+class ProcessingWorker:
+    """
+    One worker thread: claims a job, runs it, settles it, repeats
+    """
+
+    def __init__(
+        self,
+        worker_id: str,
+        stop_event: threading.Event,
+        pipeline_factory: Callable = default_pipeline_factory,
+        poll_interval: float = None,
+        heartbeat_interval: float = None
+    ):
+        """
+        Initialize worker.
+
+        Args:
+            worker_id: Unique id written to claimed jobs
+            stop_event: Set to stop after the current job
+            pipeline_factory: Builds the pipeline (once, on first job)
+            poll_interval: Seconds to sleep when the queue is empty
+            heartbeat_interval: Seconds between lease renewals
+        """
+        self.worker_id = worker_id
+        self.stop_event = stop_event
+        self.pipeline_factory = pipeline_factory
+        self.poll_interval = poll_interval or get_setting("WORKER.POLL_INTERVAL", 2.0)
+        self.heartbeat_interval = heartbeat_interval or get_setting("WORKER.HEARTBEAT_INTERVAL", 10)
+        self.pipeline = None
+        self.jobs_completed = 0
+        self.jobs_failed = 0
+
+    def run(self):
+        """Worker loop."""
+        logger.info(f"Worker {self.worker_id} started")
+        while not self.stop_event.is_set():
+            try:
+                if not self.run_once():
+                    self.stop_event.wait(self.poll_interval)
+            except Exception as e:
+                logger.error(f"Worker {self.worker_id} error: {str(e)}")
+                self.stop_event.wait(self.poll_interval)
+        logger.info(f"Worker {self.worker_id} stopped")
+
+    def run_once(self) -> bool:
+        """
+        Claim and run at most one job.
+
+        Returns:
+            True if a job was processed
+        """
+        db = SessionLocal()
+        try:
+            job = JobQueue.claim(db, self.worker_id)
+            if job is None:
+                return False
+
+            logger.info(f"Worker {self.worker_id} claimed job {job.id} ({job.source_type}: {job.source_path})")
+            heartbeat_stop = threading.Event()
+            lease_lost = threading.Event()
+            heartbeat = threading.Thread(
+                target=self._heartbeat_loop, args=(job.id, heartbeat_stop, lease_lost), daemon=True
+            )
+            heartbeat.start()
+
+            try:
+                result = self._execute(db, job, lease_lost)
+            except Exception as e:
+                heartbeat_stop.set()
+                heartbeat.join()
+                db.rollback()
+                if self.pipeline is not None:
+                    self.pipeline.db.rollback()
+                error = f"{type(e).__name__}: {e}\n{traceback.format_exc(limit=5)}"
+                JobQueue.fail(db, job.id, self.worker_id, error)
+                self.jobs_failed += 1
+                return True
+
+            heartbeat_stop.set()
+            heartbeat.join()
+            # Violations are staged in db and commit only with the completion
+            if not lease_lost.is_set() and JobQueue.complete(db, job.id, self.worker_id, result):
+                self.jobs_completed += 1
+            else:
+                db.rollback()
+                logger.warning(f"Job {job.id} lost its lease; its output was discarded")
+            return True
+        finally:
+            db.close()
+
+    def _heartbeat_loop(self, job_id: int, stop: threading.Event, lease_lost: threading.Event):
+        """Renew the job lease until the job finishes; set lease_lost if it is taken away."""
+        db = SessionLocal()
+        try:
+            while not stop.wait(self.heartbeat_interval):
+                try:
+                    if not JobQueue.heartbeat(db, job_id, self.worker_id):
+                        logger.warning(f"Worker {self.worker_id} lost lease on job {job_id}")
+                        lease_lost.set()
+                        return
+                except Exception as e:
+                    db.rollback()
+                    logger.error(f"Heartbeat failed for job {job_id}: {str(e)}")
+        finally:
+            db.close()
+
+    def _resolve_location(self, db, job: ProcessingQueue) -> Dict:
+        """Location for a job: registered camera, then job columns, then map centre."""
+        if job.camera_id:
+            camera = db.query(CameraLocation).filter(
+                CameraLocation.camera_id == job.camera_id
+            ).first()
+            if camera is not None and camera.latitude is not None:
+                return {
+                    'latitude': camera.latitude,
+                    'longitude': camera.longitude,
+                    'location_name': camera.location_name or camera.camera_name or job.camera_id
+                }
+
+        center = get_setting("HEATMAP.MAP_CENTER", [28.7041, 77.1025])
+        return {
+            'latitude': job.latitude if job.latitude is not None else center[0],
+            'longitude': job.longitude if job.longitude is not None else center[1],
+            'location_name': job.location_name or job.camera_id or "Unknown"
+        }
+
+    def _execute(self, db, job: ProcessingQueue, lease_lost: threading.Event) -> Dict:
+        """
+        Run a claimed job through the pipeline.
+
+        Violations are staged in `db` rather than committed, so a failed
+        attempt writes nothing and the retry starts clean. Processing stops
+        as soon as lease_lost is set.
+        """
+        if not os.path.exists(job.source_path):
+            raise FileNotFoundError(f"Source not found: {job.source_path}")
+
+        if self.pipeline is None:
+            self.pipeline = self.pipeline_factory()
+
+        location = self._resolve_location(db, job)
+
+        if (job.source_type or "VIDEO").upper() == "IMAGE":
+            results = self.pipeline.process_image(
+                image_path=job.source_path,
+                camera_id=job.camera_id,
+                persist=False,
+                **location
+            )
+            if results is None:
+                raise ValueError(f"Could not read image: {job.source_path}")
+            self.pipeline.store_violations(results['violations'], db=db, commit=False)
+            return {'violations_found': results['violations_found']}
+
+        last_report = [0.0]
+        report_interval = get_setting("WORKER.PROGRESS_INTERVAL", 1.0)
+
+        def report_progress(progress: Dict):
+            # Throttled so long videos do not write a row per frame
+            now = time.monotonic()
+            if now - last_report[0] >= report_interval:
+                last_report[0] = now
+                if not JobQueue.update_progress(db, job.id, self.worker_id, **progress):
+                    lease_lost.set()
+
+        # Adaptive sampling backs off while other jobs are waiting
+        stats = self.pipeline.process_video(
+            video_path=job.source_path,
+            camera_id=job.camera_id,
+            progress_callback=report_progress,
+            queue_depth=lambda: JobQueue.pending_count(db),
+            persist=False,
+            stop_event=lease_lost,
+            **location
+        )
+        violations = stats.pop('violations')
+        if stats['stopped']:
+            return stats
+
+        if not JobQueue.update_progress(
+            db, job.id, self.worker_id,
+            frames_processed=stats['total_frames'],
+            total_frames=stats['total_frames'],
+            violations_found=stats['total_violations']
+        ):
+            lease_lost.set()
+            return stats
+        self.pipeline.store_violations(violations, db=db, commit=False)
+        return stats
+
+
+class ProcessingWorkerPool:
+    """
+    Runs N workers in threads plus a reaper that requeues jobs whose
+    worker stopped heartbeating (e.g. the node died)
+    """
+
+    def __init__(
+        self,
+        concurrency: int = None,
+        pipeline_factory: Callable = default_pipeline_factory,
+        node_id: str = None
+    ):
+        """
+        Initialize pool.
+
+        Args:
+            concurrency: Number of worker threads (WORKER.CONCURRENCY)
+            pipeline_factory: Builds one pipeline per worker
+            node_id: Prefix for worker ids (defaults to hostname)
+        """
+        self.concurrency = concurrency or get_setting("WORKER.CONCURRENCY", 2)
+        self.pipeline_factory = pipeline_factory
+        self.node_id = node_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.stop_event = threading.Event()
+        self.workers = []
+        self.threads = []
+
+    def start(self):
+        """Start worker and reaper threads."""
+        for index in range(self.concurrency):
+            worker = ProcessingWorker(
+                worker_id=f"{self.node_id}-{index}-{uuid.uuid4().hex[:6]}",
+                stop_event=self.stop_event,
+                pipeline_factory=self.pipeline_factory
+            )
+            thread = threading.Thread(target=worker.run, daemon=True)
+            thread.start()
+            self.workers.append(worker)
+            self.threads.append(thread)
+
+        reaper = threading.Thread(target=self._reaper_loop, daemon=True)
+        reaper.start()
+        self.threads.append(reaper)
+        logger.info(f"Processing pool started with {self.concurrency} workers on {self.node_id}")
+
+    def _reaper_loop(self):
+        """Periodically release jobs from dead workers."""
+        interval = get_setting("WORKER.STALE_AFTER", 60) / 2
+        while not self.stop_event.wait(interval):
+            db = SessionLocal()
+            try:
+                JobQueue.requeue_stale(db)
+            except Exception as e:
+                db.rollback()
+                logger.error(f"Reaper error: {str(e)}")
+            finally:
+                db.close()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Stop after in-flight jobs finish."""
+        self.stop_event.set()
+        for thread in self.threads:
+            thread.join(timeout=timeout)
+        logger.info("Processing pool stopped")
+
+    def stats(self) -> Dict:
+        """Per-worker completion counts."""
+        return {
+            worker.worker_id: {
+                'completed': worker.jobs_completed,
+                'failed': worker.jobs_failed
+            }
+            for worker in self.workers
+        }
+
+
+def main():
+    """Run a worker pool until interrupted."""
+    parser = argparse.ArgumentParser(description="Process queued videos/images")
+    parser.add_argument("--concurrency", type=int, help="Worker threads (default: WORKER.CONCURRENCY)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    pool = ProcessingWorkerPool(concurrency=args.concurrency)
+    pool.start()
+    try:
+        pool.stop_event.wait()
+    except KeyboardInterrupt:
+        logger.info("Interrupted, waiting for in-flight jobs")
+        pool.stop()
+
+
+if __name__ == "__main__":
+    main()
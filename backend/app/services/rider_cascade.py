@@ -0,0 +1,221 @@
+"""
+Two-Stage Rider Cascade
+Small rider detector followed by a batched head-crop helmet classifier
+"""
+
+import logging
+import time
+from typing import Dict, List, Sequence, Tuple
+
+from backend.app.services.helmet_detection import HelmetDetector
+from backend.app.services.tiling import box_iou
+
+logger = logging.getLogger(__name__)
+
+Box = Tuple[int, int, int, int]
+
+
+def match_riders(persons: List[Dict], vehicles: List[Dict], min_overlap: float = 0.3) -> List[Dict]:
+    """
+    Persons riding a two-wheeler.
+
+    A person counts as a rider when their box and a two-wheeler's box
+    overlap by at least `min_overlap` of the smaller box. Without vehicle
+    classes (a detector trained on a "rider" class) every person is a rider.
+
+    Args:
+        persons: Detections with 'bbox'
+        vehicles: Two-wheeler detections with 'bbox', or None to skip matching
+        min_overlap: Intersection over the smaller box
+
+    Returns:
+        Rider detections
+    """
+    if vehicles is None:
+        return list(persons)
+    return [
+        person for person in persons
+        if any(box_iou(person['bbox'], vehicle['bbox'])[1] >= min_overlap for vehicle in vehicles)
+    ]
+
+
+def head_region(bbox: Sequence[int], frame_shape, ratio: float = 0.3, pad: float = 0.15) -> Box:
+    """
+    Head box of a rider: the top `ratio` of the rider box, roughly square,
+    centred horizontally and padded so helmets are not clipped.
+
+    Args:
+        bbox: Rider box (x1, y1, x2, y2)
+        frame_shape: (height, width, ...) of the frame
+        ratio: Share of the rider's height taken by the head
+        pad: Padding as a share of the head size
+
+    Returns:
+        (x1, y1, x2, y2) clipped to the frame
+    """
+    x1, y1, x2, y2 = bbox
+    height, width = int(frame_shape[0]), int(frame_shape[1])
+    head = max(1.0, (y2 - y1) * ratio)
+    side = min(x2 - x1, head) * (1 + pad)
+    cx = (x1 + x2) / 2
+    top = y1 - head * pad
+    return (
+        max(0, int(cx - side / 2)),
+        max(0, int(top)),
+        min(width, int(cx + side / 2) + 1),
+        min(height, int(top + head * (1 + 2 * pad)) + 1)
+    )
+
+
+class CascadeHelmetDetector(HelmetDetector):
+    """
+    Helmet detection as a cascade instead of one large detector
+
+    A small detector (e.g. YOLOv8n) finds persons and two-wheelers; for
+    every rider a head crop is cut from the frame, and the crops of all
+    frames in the call are classified helmet / no_helmet by a tiny image
+    classifier (e.g. YOLOv8n-cls at 64x64) in one batched call. Returns
+    the same dictionaries as HelmetDetector, with head boxes as 'bbox'
+    and the rider box as 'rider_bbox', so it drops into every pipeline.
+    """
+
+    def __init__(
+        self,
+        detector_model_path: str = None,
+        classifier_model_path: str = None,
+        conf_threshold: float = 0.5,
+        device: str = None,
+        imgsz: int = None,
+        iou: float = None,
+        max_det: int = None
+    ):
+        """
+        Initialize cascade.
+
+        Args:
+            detector_model_path: Rider/two-wheeler detector (MODELS.RIDER_DETECTION)
+            classifier_model_path: Head classifier (MODELS.HEAD_CLASSIFIER)
+            conf_threshold: Minimum helmet/no_helmet classification confidence
+            device: 'cuda' or 'cpu'
+            imgsz, iou, max_det: Stage-one detector settings (DETECTION.HELMET.*)
+        """
+        import torch
+        from ultralytics import YOLO
+        from backend.app.config import get_setting
+
+        self.conf_threshold = conf_threshold
+        self.device = device or ("cuda" if torch.cuda.is_available() else "cpu")
+        self.imgsz = imgsz or get_setting("DETECTION.HELMET.MODEL_INPUT_SIZE", 640)
+        self.iou = iou or get_setting("DETECTION.HELMET.IOU_THRESHOLD", 0.45)
+        self.max_det = max_det or get_setting("DETECTION.HELMET.MAX_DETECTIONS", 300)
+
+        self.rider_conf = get_setting("DETECTION.CASCADE.RIDER_CONFIDENCE", 0.35)
+        self.person_classes = list(get_setting("DETECTION.CASCADE.PERSON_CLASSES", [0]))
+        vehicle_classes = get_setting("DETECTION.CASCADE.VEHICLE_CLASSES", [3])
+        self.vehicle_classes = list(vehicle_classes) if vehicle_classes else None
+        self.min_overlap = get_setting("DETECTION.CASCADE.MIN_OVERLAP", 0.3)
+        self.head_ratio = get_setting("DETECTION.CASCADE.HEAD_RATIO", 0.3)
+        self.classifier_size = get_setting("DETECTION.CASCADE.CLASSIFIER_INPUT_SIZE", 64)
+
+        detector_model_path = detector_model_path or get_setting("MODELS.RIDER_DETECTION", "yolov8n.pt")
+        classifier_model_path = classifier_model_path or get_setting(
+            "MODELS.HEAD_CLASSIFIER", "models/helmet_detection/head_classifier.pt"
+        )
+        logger.info(f"Loading rider cascade: {detector_model_path} -> {classifier_model_path}")
+        self.model = YOLO(detector_model_path)
+        self.model.to(self.device)
+        self.classifier = YOLO(classifier_model_path)
+        self.classifier.to(self.device)
+
+        self.class_names = {0: "helmet", 1: "no_helmet"}
+        self.class_colors = {0: (0, 255, 0), 1: (0, 0, 255)}
+        # Classifier class index -> helmet/no_helmet class id
+        self.classifier_classes = {
+            index: 0 if name == "helmet" else 1
+            for index, name in self.classifier.names.items()
+        }
+        self.stage_latency: Dict[str, float] = {}
+
+    def _predict_options(self, imgsz: int = None, iou: float = None, max_det: int = None) -> dict:
+        options = super()._predict_options(imgsz, iou, max_det)
+        options['conf'] = self.rider_conf
+        options['classes'] = self.person_classes + (self.vehicle_classes or [])
+        return options
+
+    def _riders(self, result) -> List[Dict]:
+        """Rider detections from one stage-one result."""
+        persons, vehicles = [], []
+        if result.boxes is not None:
+            for box in result.boxes:
+                class_id = int(box.cls[0])
+                detection = {
+                    'bbox': tuple(map(int, box.xyxy[0])),
+                    'confidence': float(box.conf[0]),
+                    'track_id': int(box.id[0]) if box.id is not None else None
+                }
+                if class_id in self.person_classes:
+                    persons.append(detection)
+                elif self.vehicle_classes and class_id in self.vehicle_classes:
+                    vehicles.append(detection)
+        return match_riders(persons, vehicles if self.vehicle_classes else None, self.min_overlap)
+
+    def detect(self, image, return_crops: bool = False,
+               imgsz: int = None, iou: float = None, max_det: int = None) -> dict:
+        """Detect riders and classify their heads; see HelmetDetector.detect()."""
+        return self.detect_batch([image], return_crops, imgsz, iou, max_det)[0]
+
+    def detect_batch(self, images: list, return_crops: bool = False,
+                     imgsz: int = None, iou: float = None, max_det: int = None) -> list:
+        """
+        Run the cascade on several images.
+
+        Stage one is one detector pass over the images; stage two is one
+        classifier pass over the head crops of every rider found.
+
+        Returns:
+            One detections dictionary per image, in input order
+        """
+        if not images:
+            return []
+
+        started = time.perf_counter()
+        results = self.model.predict(source=list(images), **self._predict_options(imgsz, iou, max_det))
+        detected = time.perf_counter()
+
+        heads, owners = [], []
+        outputs = []
+        for index, (image, result) in enumerate(zip(images, results)):
+            outputs.append({'helmets': [], 'no_helmets': [], 'frame': image,
+                            'raw_results': [result], 'riders': 0})
+            for rider in self._riders(result):
+                head = head_region(rider['bbox'], image.shape, self.head_ratio)
+                if head[2] - head[0] < 2 or head[3] - head[1] < 2:
+                    continue
+                heads.append(image[head[1]:head[3], head[0]:head[2]])
+                owners.append((index, rider, head))
+                outputs[index]['riders'] += 1
+
+        if heads:
+            classified = self.classifier.predict(source=heads, imgsz=self.classifier_size, verbose=False)
+            for (index, rider, head), crop, result in zip(owners, heads, classified):
+                confidence = float(result.probs.top1conf)
+                if confidence < self.conf_threshold:
+                    continue
+                class_id = self.classifier_classes[int(result.probs.top1)]
+                detection = {
+                    'bbox': head,
+                    'confidence': confidence,
+                    'class_id': class_id,
+                    'class_name': self.class_names[class_id],
+                    'area': (head[2] - head[0]) * (head[3] - head[1]),
+                    'track_id': rider['track_id'],
+                    'rider_bbox': rider['bbox'],
+                    'rider_confidence': rider['confidence']
+                }
+                if return_crops:
+                    detection['crop'] = crop.copy()
+                outputs[index]['helmets' if class_id == 0 else 'no_helmets'].append(detection)
+
+        finished = time.perf_counter()
+        self.stage_latency = {'detector': detected - started, 'classifier': finished - detected}
+        return outputs
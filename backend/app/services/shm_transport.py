@@ -0,0 +1,362 @@
+"""
+Shared-Memory Frame Transport
+Hands camera frames from the capture process to inference processes without pickling
+"""
+
+import logging
+import multiprocessing
+import os
+import struct
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MAGIC = 0x46524D31  # "FRM1"
+
+# magic, slots, slot_bytes
+GLOBAL_HEADER = struct.Struct("<IIQ")
+GLOBAL_HEADER_SIZE = 64
+
+# Readers that can pin one slot at a time
+MAX_PINS = 8
+
+# state, refcount, sequence, timestamp, camera_id, height, width, channels,
+# nbytes, writer pid, then the pid of each pin (0 = unused)
+SLOT_HEADER = struct.Struct(f"<IIQd32sIIIQI{MAX_PINS}I")
+SLOT_HEADER_SIZE = 128
+# Header field indexes
+WRITER = 9
+PINS = 10
+NO_PINS = (0,) * MAX_PINS
+
+SLOT_FREE = 0
+SLOT_WRITING = 1
+SLOT_READY = 2
+
+# Frame data offsets are aligned for vectorized copies
+DATA_ALIGN = 64
+
+
+def _align(value: int) -> int:
+    return (value + DATA_ALIGN - 1) // DATA_ALIGN * DATA_ALIGN
+
+
+def _pid_alive(pid: int) -> bool:
+    if pid == os.getpid():
+        return True
+    if os.name == "nt":
+        # os.kill(pid, 0) terminates the process on Windows
+        return True
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
+
+
+class SharedFrame:
+    """
+    A frame pinned in a shared-memory slot
+
+    `array` is a read-only NumPy view of the slot; the slot is not reused
+    until release() is called, so keep it pinned only while it is used.
+    """
+
+    def __init__(self, ring: "SharedFrameRing", slot: int, camera_id: str,
+                 sequence: int, timestamp: float, array):
+        self.ring = ring
+        self.slot = slot
+        self.camera_id = camera_id
+        self.sequence = sequence
+        self.timestamp = timestamp
+        self.array = array
+
+    def release(self):
+        """Unpin the slot. The array must not be used afterwards."""
+        if self.array is not None:
+            self.array = None
+            self.ring._unpin(self.slot)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class SharedFrameRing:
+    """
+    Ring of frame slots in one shared-memory block
+
+    Layout: a global header, one fixed-size header per slot (state,
+    refcount, sequence, timestamp, camera id, shape, writer and pin
+    pids), then the slot data. Any number of writers may share a ring:
+    CameraManager hands the same ring to every camera, so each capture
+    thread copies its frames into the oldest unpinned slot. Readers in
+    other processes pin a slot, map it as a NumPy view and release it
+    when done. Header updates are guarded by a multiprocessing lock; a
+    slot is claimed under it and marked as being written, so frame data
+    is copied outside it without another writer or reader touching it.
+
+    Each pin records the reader's pid. A reader that dies holding pins
+    would otherwise keep its slots forever, so writers release the pins
+    of dead processes (and slots left half-written by a dead writer)
+    before dropping a frame for lack of slots; reclaim() does the same
+    on demand.
+
+    Readers are started with multiprocessing and given handle(); the lock
+    can only be shared with processes created that way.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, lock, owner: bool):
+        self.shm = shm
+        self.lock = lock
+        self.owner = owner
+        _, self.slots, self.slot_bytes = GLOBAL_HEADER.unpack_from(shm.buf, 0)
+        self.data_offset = _align(GLOBAL_HEADER_SIZE + self.slots * SLOT_HEADER_SIZE)
+        self.next_slot = 0
+        self.written = 0
+        self.dropped = 0
+
+    @classmethod
+    def create(cls, slots: int, slot_bytes: int, name: Optional[str] = None) -> "SharedFrameRing":
+        """
+        Allocate a new ring (capture side).
+
+        Args:
+            slots: Number of frame slots
+            slot_bytes: Largest frame size in bytes (e.g. 1920*1080*3)
+            name: Shared-memory block name (random if None)
+
+        Returns:
+            Owning SharedFrameRing
+        """
+        slot_bytes = _align(slot_bytes)
+        size = _align(GLOBAL_HEADER_SIZE + slots * SLOT_HEADER_SIZE) + slots * slot_bytes
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        shm.buf[:GLOBAL_HEADER_SIZE + slots * SLOT_HEADER_SIZE] = bytes(GLOBAL_HEADER_SIZE + slots * SLOT_HEADER_SIZE)
+        GLOBAL_HEADER.pack_into(shm.buf, 0, MAGIC, slots, slot_bytes)
+        logger.info(f"Shared frame ring {shm.name}: {slots} slots x {slot_bytes} bytes")
+        return cls(shm, multiprocessing.Lock(), owner=True)
+
+    @classmethod
+    def attach(cls, handle: Dict) -> "SharedFrameRing":
+        """
+        Map an existing ring (inference side).
+
+        Args:
+            handle: Output of handle() from the owning process
+        """
+        shm = shared_memory.SharedMemory(name=handle['name'])
+        magic = GLOBAL_HEADER.unpack_from(shm.buf, 0)[0]
+        if magic != MAGIC:
+            shm.close()
+            raise ValueError(f"{handle['name']} is not a shared frame ring")
+        return cls(shm, handle['lock'], owner=False)
+
+    def handle(self) -> Dict:
+        """Arguments for attach() in a child process."""
+        return {'name': self.shm.name, 'lock': self.lock}
+
+    def _header_offset(self, slot: int) -> int:
+        return GLOBAL_HEADER_SIZE + slot * SLOT_HEADER_SIZE
+
+    def _read_header(self, slot: int):
+        return SLOT_HEADER.unpack_from(self.shm.buf, self._header_offset(slot))
+
+    def _write_header(self, slot: int, *fields):
+        SLOT_HEADER.pack_into(self.shm.buf, self._header_offset(slot), *fields)
+
+    def _view(self, slot: int, shape, writeable: bool = False):
+        import numpy as np
+
+        array = np.ndarray(shape, dtype=np.uint8, buffer=self.shm.buf,
+                           offset=self.data_offset + slot * self.slot_bytes)
+        array.flags.writeable = writeable
+        return array
+
+    def write(self, camera_id: str, sequence: int, timestamp: float, frame) -> Optional[int]:
+        """
+        Copy a frame into the oldest unpinned slot.
+
+        Safe to call from several threads or processes at once.
+
+        Args:
+            camera_id: Camera the frame came from
+            sequence: Camera frame sequence number
+            timestamp: Capture time (epoch seconds)
+            frame: uint8 frame
+
+        Returns:
+            Slot index, or None if every slot is pinned (frame dropped)
+        """
+        if frame.nbytes > self.slot_bytes:
+            raise ValueError(f"Frame of {frame.nbytes} bytes exceeds slot size {self.slot_bytes}")
+
+        with self.lock:
+            slot = self._free_slot()
+            if slot is None and self._reclaim():
+                slot = self._free_slot()
+            if slot is None:
+                self.dropped += 1
+                return None
+            self._write_header(slot, SLOT_WRITING, 0, 0, 0.0, b"", 0, 0, 0, 0, os.getpid(), *NO_PINS)
+            self.next_slot = (slot + 1) % self.slots
+
+        # Readers skip slots being written, so the copy needs no lock
+        shape = frame.shape if frame.ndim == 3 else frame.shape + (1,)
+        self._view(slot, shape, writeable=True)[...] = frame.reshape(shape)
+
+        with self.lock:
+            self._write_header(
+                slot, SLOT_READY, 0, sequence, timestamp,
+                camera_id.encode()[:32], shape[0], shape[1], shape[2], frame.nbytes,
+                0, *NO_PINS
+            )
+            self.written += 1
+        return slot
+
+    def _free_slot(self) -> Optional[int]:
+        """Oldest slot that is neither pinned nor being written; caller holds the lock."""
+        for i in range(self.slots):
+            slot = (self.next_slot + i) % self.slots
+            state, refcount = self._read_header(slot)[:2]
+            if refcount == 0 and state != SLOT_WRITING:
+                return slot
+        return None
+
+    def _reclaim(self) -> int:
+        """Release pins and writes of dead processes; caller holds the lock."""
+        alive = {}
+        released = 0
+        for slot in range(self.slots):
+            header = list(self._read_header(slot))
+            pids = [pid for pid in header[PINS:] if pid]
+            if not pids and header[0] != SLOT_WRITING:
+                continue
+            for pid in set(pids + [header[WRITER]]) - {0} - set(alive):
+                alive[pid] = _pid_alive(pid)
+            live = [pid for pid in pids if alive[pid]]
+            released += len(pids) - len(live)
+            if header[0] == SLOT_WRITING and header[WRITER] and not alive[header[WRITER]]:
+                header[0] = SLOT_FREE
+                released += 1
+            header[1] = len(live)
+            header[PINS:] = live + [0] * (MAX_PINS - len(live))
+            self._write_header(slot, *header)
+        return released
+
+    def reclaim(self) -> int:
+        """
+        Release pins held by processes that have exited.
+
+        Returns:
+            Number of pins (and abandoned writes) released
+        """
+        with self.lock:
+            released = self._reclaim()
+        if released:
+            logger.warning(f"Shared frame ring {self.shm.name}: reclaimed {released} pins of exited processes")
+        return released
+
+    def _pin(self, slot: int, header) -> Optional[SharedFrame]:
+        """Record a pin by this process; caller holds the lock."""
+        header = list(header)
+        pins = header[PINS:]
+        if 0 not in pins:
+            return None
+        pins[pins.index(0)] = os.getpid()
+        header[1] += 1
+        header[PINS:] = pins
+        self._write_header(slot, *header)
+        camera_id, height, width, channels = header[4:8]
+        return SharedFrame(
+            self, slot, camera_id.rstrip(b"\0").decode(), header[2], header[3],
+            self._view(slot, (height, width, channels))
+        )
+
+    def _unpin(self, slot: int):
+        with self.lock:
+            header = list(self._read_header(slot))
+            pins = header[PINS:]
+            pid = os.getpid()
+            if pid in pins:
+                pins[pins.index(pid)] = 0
+                header[1] = max(0, header[1] - 1)
+                header[PINS:] = pins
+                self._write_header(slot, *header)
+
+    def _ready(self):
+        """(slot, header) of every readable slot; caller holds the lock."""
+        for slot in range(self.slots):
+            header = self._read_header(slot)
+            if header[0] == SLOT_READY:
+                yield slot, header
+
+    def latest(self, camera_id: str, after: int = 0) -> Optional[SharedFrame]:
+        """
+        Pin the newest frame of a camera.
+
+        Args:
+            camera_id: Camera to read
+            after: Only return frames with a higher sequence number
+
+        Returns:
+            SharedFrame (release it when done), or None if there is no
+            such frame or MAX_PINS readers already hold it
+        """
+        key = camera_id.encode()[:32]
+        with self.lock:
+            best = None
+            for slot, header in self._ready():
+                if header[4].rstrip(b"\0") == key and header[2] > after:
+                    if best is None or header[2] > best[1][2]:
+                        best = (slot, header)
+            return self._pin(*best) if best else None
+
+    def pending(self, after: Optional[Dict[str, int]] = None) -> List[SharedFrame]:
+        """
+        Pin the newest frame of every camera that has one newer than `after`.
+
+        Args:
+            after: Last sequence number seen per camera id
+
+        Returns:
+            List of SharedFrame, one per camera (release each when done)
+        """
+        after = after or {}
+        with self.lock:
+            newest = {}
+            for slot, header in self._ready():
+                camera_id = header[4].rstrip(b"\0").decode()
+                if header[2] <= after.get(camera_id, 0):
+                    continue
+                if camera_id not in newest or header[2] > newest[camera_id][1][2]:
+                    newest[camera_id] = (slot, header)
+            frames = [self._pin(slot, header) for slot, header in newest.values()]
+        return [frame for frame in frames if frame is not None]
+
+    def stats(self) -> Dict:
+        """Ring counters for status endpoints."""
+        with self.lock:
+            pinned = sum(1 for slot in range(self.slots) if self._read_header(slot)[1] > 0)
+        return {
+            'name': self.shm.name,
+            'slots': self.slots,
+            'slot_bytes': self.slot_bytes,
+            'pinned': pinned,
+            'written': self.written,
+            'dropped': self.dropped
+        }
+
+    def close(self):
+        """Unmap the block; the owner also frees it."""
+        try:
+            self.shm.close()
+        except BufferError:
+            logger.warning(f"Shared frame ring {self.shm.name} closed with frames still mapped")
+        if self.owner:
+            self.shm.unlink()
@@ -0,0 +1,142 @@
+"""
+Spatial Index Query Helpers
+Bounding-box and radius lookups over Violation.geohash
+"""
+
+import logging
+from datetime import datetime
+from typing import List, Optional
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Session, Query
+from backend.app.models.database import Violation
+from backend.app.services import geohash
+
+logger = logging.getLogger(__name__)
+
+# Precision stored on each violation (~5 m cells)
+GEOHASH_PRECISION = 9
+
+# Precision used to group violations into zones (~1.2 km x 0.6 km)
+ZONE_PRECISION = 6
+
+
+class SpatialIndex:
+    """
+    Query helpers that narrow Violation scans to the geohash cells
+    overlapping the requested area
+    """
+
+    @staticmethod
+    def geohash_for(latitude: Optional[float], longitude: Optional[float]) -> Optional[str]:
+        """Geohash stored on a violation, or None without coordinates."""
+        if latitude is None or longitude is None:
+            return None
+        return geohash.encode(latitude, longitude, GEOHASH_PRECISION)
+
+    @staticmethod
+    def cell_filter(cells: List[str], column=Violation.geohash):
+        """
+        Build an OR of prefix ranges over the geohash column.
+
+        Args:
+            cells: Geohash prefixes from geohash.covering_cells()
+            column: Geohash column to filter
+
+        Returns:
+            SQLAlchemy boolean clause
+        """
+        clauses = []
+        for cell in cells:
+            lo, hi = geohash.prefix_range(cell)
+            if hi is None:
+                clauses.append(column >= lo)
+            else:
+                clauses.append(and_(column >= lo, column < hi))
+        return or_(*clauses)
+
+    @staticmethod
+    def query_bbox(
+        db: Session,
+        min_lat: float,
+        max_lat: float,
+        min_lng: float,
+        max_lng: float,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        max_cells: int = 32
+    ) -> Query:
+        """
+        Violations inside a bounding box.
+
+        The geohash ranges let the (geohash, timestamp) index skip rows
+        outside the covering cells; the exact lat/lng test trims the cell
+        edges.
+
+        Args:
+            db: Database session
+            min_lat, max_lat, min_lng, max_lng: Bounding box
+            since: Only violations at or after this time
+            until: Only violations before this time
+            max_cells: Upper bound on index ranges scanned
+
+        Returns:
+            Query over Violation
+        """
+        cells = geohash.covering_cells(min_lat, max_lat, min_lng, max_lng, max_cells=max_cells)
+
+        query = db.query(Violation).filter(
+            SpatialIndex.cell_filter(cells),
+            Violation.latitude >= min_lat,
+            Violation.latitude <= max_lat,
+            Violation.longitude >= min_lng,
+            Violation.longitude <= max_lng
+        )
+        if since is not None:
+            query = query.filter(Violation.timestamp >= since)
+        if until is not None:
+            query = query.filter(Violation.timestamp < until)
+        return query
+
+    @staticmethod
+    def query_radius(
+        db: Session,
+        latitude: float,
+        longitude: float,
+        radius_m: float,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        limit: Optional[int] = None
+    ) -> List[Violation]:
+        """
+        Violations within radius_m meters of a point.
+
+        Args:
+            db: Database session
+            latitude: Centre latitude
+            longitude: Centre longitude
+            radius_m: Radius in meters
+            since: Only violations at or after this time
+            until: Only violations before this time
+            limit: Maximum violations to return
+
+        Returns:
+            Violations ordered by distance
+        """
+        min_lat, max_lat, min_lng, max_lng = geohash.radius_bbox(latitude, longitude, radius_m)
+        candidates = SpatialIndex.query_bbox(
+            db, min_lat, max_lat, min_lng, max_lng, since=since, until=until
+        ).all()
+
+        # Distance test in Python keeps this portable to SQLite, which has
+        # no trigonometric SQL functions by default
+        hits = []
+        for violation in candidates:
+            distance = geohash.haversine_m(
+                latitude, longitude, violation.latitude, violation.longitude
+            )
+            if distance <= radius_m:
+                hits.append((distance, violation))
+
+        hits.sort(key=lambda item: item[0])
+        violations = [violation for _, violation in hits]
+        return violations[:limit] if limit else violations
@@ -0,0 +1,321 @@
+"""
+Region-of-Interest and Tiled Inference
+Runs detectors on ROI crops or overlapping tiles of high-resolution frames
+"""
+
+import json
+import logging
+from typing import Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+Rect = Tuple[int, int, int, int]
+Polygon = List[Tuple[float, float]]
+
+# Detection lists merged back into frame coordinates
+DETECTION_KEYS = ("helmets", "no_helmets")
+
+
+def parse_roi(value) -> List[Polygon]:
+    """
+    Normalize an ROI definition to a list of polygons.
+
+    Args:
+        value: JSON string or list; either one polygon [[x, y], ...] or a
+            list of polygons. Coordinates are pixels, or fractions of the
+            frame size if every coordinate is between 0 and 1.
+
+    Returns:
+        List of polygons (empty if value is empty)
+    """
+    if not value:
+        return []
+    if isinstance(value, str):
+        value = json.loads(value)
+    if value and isinstance(value[0][0], (int, float)):
+        value = [value]
+    polygons = []
+    for polygon in value:
+        if len(polygon) < 3:
+            raise ValueError("An ROI polygon needs at least 3 points")
+        polygons.append([(float(x), float(y)) for x, y in polygon])
+    return polygons
+
+
+def point_in_polygon(x: float, y: float, polygon: Polygon) -> bool:
+    """Ray-casting test; points on an edge may fall either way."""
+    inside = False
+    j = len(polygon) - 1
+    for i in range(len(polygon)):
+        xi, yi = polygon[i]
+        xj, yj = polygon[j]
+        if (yi > y) != (yj > y) and x < (xj - xi) * (y - yi) / (yj - yi) + xi:
+            inside = not inside
+        j = i
+    return inside
+
+
+def tile_rect(rect: Rect, tile_size: int, overlap: float) -> List[Rect]:
+    """
+    Cover a rectangle with tiles of at most tile_size pixels.
+
+    Neighbouring tiles overlap by `overlap` of the tile size so that an
+    object cut by one tile edge is whole in the next; the last tile in
+    each direction is aligned to the rectangle's edge.
+
+    Args:
+        rect: (x1, y1, x2, y2)
+        tile_size: Tile side in pixels
+        overlap: Fraction of the tile shared with its neighbour (0-0.9)
+
+    Returns:
+        Tiles as (x1, y1, x2, y2), row by row
+    """
+    x1, y1, x2, y2 = rect
+    stride = max(1, int(tile_size * (1 - min(max(overlap, 0.0), 0.9))))
+
+    def starts(lo, hi):
+        if hi - lo <= tile_size:
+            return [lo]
+        positions = list(range(lo, hi - tile_size, stride))
+        return positions + [hi - tile_size]
+
+    return [
+        (x, y, min(x + tile_size, x2), min(y + tile_size, y2))
+        for y in starts(y1, y2)
+        for x in starts(x1, x2)
+    ]
+
+
+def box_iou(a: Sequence[float], b: Sequence[float]) -> Tuple[float, float]:
+    """
+    Overlap of two boxes.
+
+    Returns:
+        (intersection over union, intersection over the smaller box)
+    """
+    iw = min(a[2], b[2]) - max(a[0], b[0])
+    ih = min(a[3], b[3]) - max(a[1], b[1])
+    if iw <= 0 or ih <= 0:
+        return 0.0, 0.0
+    inter = iw * ih
+    area_a = (a[2] - a[0]) * (a[3] - a[1])
+    area_b = (b[2] - b[0]) * (b[3] - b[1])
+    return inter / (area_a + area_b - inter), inter / max(1, min(area_a, area_b))
+
+
+def nms(detections: List[Dict], iou_threshold: float = 0.5, containment: float = 0.8) -> List[Dict]:
+    """
+    Class-aware greedy non-maximum suppression.
+
+    Besides the usual IoU test, a box mostly inside a higher-scoring box
+    of the same class is suppressed: a rider cut by a tile edge yields a
+    partial box that overlaps the whole one from the neighbouring tile
+    by less than the IoU threshold.
+
+    Args:
+        detections: Dicts with 'bbox', 'confidence' and 'class_id'
+        iou_threshold: IoU above which the weaker box is dropped
+        containment: Share of the smaller box covered above which it is dropped
+
+    Returns:
+        Kept detections, highest confidence first
+    """
+    kept = []
+    for detection in sorted(detections, key=lambda d: d['confidence'], reverse=True):
+        duplicate = False
+        for other in kept:
+            if other.get('class_id') != detection.get('class_id'):
+                continue
+            iou, ios = box_iou(detection['bbox'], other['bbox'])
+            if iou >= iou_threshold or ios >= containment:
+                duplicate = True
+                break
+        if not duplicate:
+            kept.append(detection)
+    return kept
+
+
+class RegionLayout:
+    """
+    Where a camera's frames are analysed: ROI polygons and/or tiles
+
+    Without an ROI or tile size the whole frame is one region. With ROI
+    polygons, only their bounding boxes are analysed and detections whose
+    centre is outside every polygon are discarded. With a tile size, each
+    region is split into overlapping tiles near the model's input size,
+    so small distant riders are not downscaled away.
+    """
+
+    def __init__(self, roi=None, tile_size: Optional[int] = None, overlap: Optional[float] = None):
+        """
+        Initialize layout.
+
+        Args:
+            roi: ROI polygons (see parse_roi)
+            tile_size: Tile side in pixels; 0/None disables tiling
+                (DETECTION.TILING.TILE_SIZE)
+            overlap: Tile overlap fraction (DETECTION.TILING.OVERLAP)
+        """
+        from backend.app.config import get_setting
+
+        self.roi = parse_roi(roi)
+        self.tile_size = int(tile_size if tile_size is not None else get_setting("DETECTION.TILING.TILE_SIZE", 0) or 0)
+        self.overlap = overlap if overlap is not None else get_setting("DETECTION.TILING.OVERLAP", 0.2)
+        self._cache: Dict[Tuple[int, int], Tuple[List[Polygon], List[Rect]]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        """True if frames are not simply analysed whole."""
+        return bool(self.roi or self.tile_size)
+
+    def _plan(self, frame_shape) -> Tuple[List[Polygon], List[Rect]]:
+        """Pixel polygons and regions for a frame size (cached)."""
+        height, width = int(frame_shape[0]), int(frame_shape[1])
+        plan = self._cache.get((height, width))
+        if plan is not None:
+            return plan
+
+        polygons = []
+        for polygon in self.roi:
+            if all(0.0 <= x <= 1.0 and 0.0 <= y <= 1.0 for x, y in polygon):
+                polygon = [(x * width, y * height) for x, y in polygon]
+            polygons.append(polygon)
+
+        rects = []
+        for polygon in polygons:
+            xs = [x for x, _ in polygon]
+            ys = [y for _, y in polygon]
+            rect = (max(0, int(min(xs))), max(0, int(min(ys))),
+                    min(width, int(max(xs)) + 1), min(height, int(max(ys)) + 1))
+            if rect[2] > rect[0] and rect[3] > rect[1]:
+                rects.append(rect)
+        if not polygons:
+            rects = [(0, 0, width, height)]
+
+        regions = []
+        for rect in rects:
+            regions.extend(tile_rect(rect, self.tile_size, self.overlap) if self.tile_size else [rect])
+
+        plan = self._cache[(height, width)] = (polygons, regions)
+        return plan
+
+    def regions(self, frame_shape) -> List[Rect]:
+        """Crops to analyse, as (x1, y1, x2, y2) in frame pixels."""
+        return self._plan(frame_shape)[1]
+
+    def contains(self, bbox: Sequence[float], frame_shape) -> bool:
+        """True if a box's centre lies in the ROI (always without one)."""
+        polygons = self._plan(frame_shape)[0]
+        if not polygons:
+            return True
+        cx, cy = (bbox[0] + bbox[2]) / 2, (bbox[1] + bbox[3]) / 2
+        return any(point_in_polygon(cx, cy, polygon) for polygon in polygons)
+
+
+def detect_tiled(
+    detector,
+    images: list,
+    layouts: Sequence[Optional[RegionLayout]],
+    return_crops: bool = False,
+    nms_iou: Optional[float] = None,
+    options: Optional[Sequence[Dict]] = None
+) -> list:
+    """
+    Detect on every image's regions in one batch and merge per image.
+
+    Args:
+        detector: Detector with detect_batch() returning 'helmets'/'no_helmets' lists
+        images: Frames (BGR)
+        layouts: One RegionLayout per image (None analyses the whole frame)
+        return_crops: Add each detection's crop from the full frame
+        nms_iou: IoU threshold for merging overlapping tiles (DETECTION.TILING.NMS_IOU)
+        options: One imgsz / iou / max_det dict per image; crops with
+            different options run as separate batches
+
+    Returns:
+        One detections dictionary per image, boxes in frame coordinates
+    """
+    from backend.app.config import get_setting
+    from backend.app.services.inference_profile import run_grouped
+
+    nms_iou = nms_iou if nms_iou is not None else get_setting("DETECTION.TILING.NMS_IOU", 0.5)
+
+    crops, owners, crop_options = [], [], []
+    for index, (image, layout) in enumerate(zip(images, layouts)):
+        regions = layout.regions(image.shape) if layout is not None else [(0, 0, image.shape[1], image.shape[0])]
+        for rect in regions:
+            # Slices are views; no pixels are copied for the crops
+            crops.append(image[rect[1]:rect[3], rect[0]:rect[2]])
+            owners.append((index, rect))
+            crop_options.append(options[index] if options else None)
+
+    merged = [
+        dict({key: [] for key in DETECTION_KEYS}, frame=image, raw_results=[], regions=0)
+        for image in images
+    ]
+    results = run_grouped(detector.detect_batch, crops, crop_options if options else None)
+    for (index, rect), result in zip(owners, results):
+        target = merged[index]
+        target['raw_results'].extend(result.get('raw_results', []))
+        target['regions'] += 1
+        for key in DETECTION_KEYS:
+            for detection in result.get(key, []):
+                shifted = dict(detection)
+                for field in ('bbox', 'rider_bbox'):
+                    if field in detection:
+                        x1, y1, x2, y2 = detection[field]
+                        shifted[field] = (x1 + rect[0], y1 + rect[1], x2 + rect[0], y2 + rect[1])
+                target[key].append(shifted)
+
+    for image, layout, target in zip(images, layouts, merged):
+        kept = [d for key in DETECTION_KEYS for d in target[key]]
+        if target['regions'] > 1:
+            # Overlapping regions see the same object more than once
+            kept = nms(kept, nms_iou)
+        if layout is not None:
+            kept = [d for d in kept if layout.contains(d['bbox'], image.shape)]
+        kept_ids = {id(d) for d in kept}
+        for key in DETECTION_KEYS:
+            target[key] = [d for d in target[key] if id(d) in kept_ids]
+            if return_crops:
+                for detection in target[key]:
+                    x1, y1, x2, y2 = detection['bbox']
+                    detection['crop'] = image[y1:y2, x1:x2].copy()
+    return merged
+
+
+class TiledDetector:
+    """
+    HelmetDetector stand-in that analyses a camera's ROI crops or tiles
+
+    detect() and detect_batch() return the same dictionaries as the
+    wrapped detector, with boxes in full-frame coordinates; every other
+    attribute (detect_violations, draw_detections, ...) is the wrapped
+    detector's.
+    """
+
+    def __init__(self, detector, layout: RegionLayout, nms_iou: Optional[float] = None):
+        """
+        Initialize wrapper.
+
+        Args:
+            detector: HelmetDetector
+            layout: Regions to analyse
+            nms_iou: IoU threshold for merging tiles (DETECTION.TILING.NMS_IOU)
+        """
+        self.detector = detector
+        self.layout = layout
+        self.nms_iou = nms_iou
+
+    def __getattr__(self, name):
+        return getattr(self.detector, name)
+
+    def detect(self, image, return_crops: bool = False, **options) -> dict:
+        """Detect on the image's regions; see HelmetDetector.detect()."""
+        return self.detect_batch([image], return_crops, **options)[0]
+
+    def detect_batch(self, images: list, return_crops: bool = False, **options) -> list:
+        """Detect on every image's regions in one forward pass."""
+        return detect_tiled(self.detector, images, [self.layout] * len(images),
+                            return_crops, self.nms_iou, [options] * len(images) if options else None)
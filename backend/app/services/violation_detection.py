@@ -4,11 +4,16 @@ Core business logic for detecting violations
 """
 
 import logging
+import time
 from datetime import datetime
 from typing import Dict, List, Tuple
+from sqlalchemy.orm import Session
 from backend.app.models.database import (
     Violation, ViolationTypeEnum, ViolationSeverityEnum
 )
+from backend.app.services.analytics import AnalyticsService
+from backend.app.services.heatmap import HeatmapService
+from backend.app.services.spatial_index import SpatialIndex
 
 logger = logging.getLogger(__name__)
 
@@ -51,7 +56,8 @@ class ViolationDetectionService:
         location_name: str,
         image_path: str = None,
         detection_confidence: float = 0.0,
-        vehicle_type: str = None
+        vehicle_type: str = None,
+        camera_id: str = None
     ) -> Violation:
         """
         Create a violation record.
@@ -65,6 +71,7 @@ class ViolationDetectionService:
             image_path: Path to evidence image
             detection_confidence: Model detection confidence
             vehicle_type: Type of vehicle
+            camera_id: Camera that captured the violation
             
         Returns:
             Violation object
@@ -83,6 +90,8 @@ class ViolationDetectionService:
             latitude=latitude,
             longitude=longitude,
             location_name=location_name,
+            geohash=SpatialIndex.geohash_for(latitude, longitude),
+            camera_id=camera_id,
             image_path=image_path,
             detection_confidence=detection_confidence,
             timestamp=datetime.utcnow()
@@ -91,6 +100,28 @@ class ViolationDetectionService:
         logger.info(f"Created violation: {violation_type} for vehicle {vehicle_number}")
         return violation
     
+    @staticmethod
+    def persist_violation(db: Session, violation: Violation, commit: bool = True) -> Violation:
+        """
+        Save a violation and update the rollups derived from it.
+        
+        Args:
+            db: Database session
+            violation: Violation created by create_violation()
+            commit: Commit the transaction (False to batch several writes)
+            
+        Returns:
+            Persisted violation with its id assigned
+        """
+        db.add(violation)
+        db.flush()
+        HeatmapService.record_violation(db, violation)
+        AnalyticsService.record_violation(db, violation)
+        
+        if commit:
+            db.commit()
+        return violation
+    
     @staticmethod
     def detect_helmet_violation(
         has_helmet: bool,
@@ -149,16 +180,22 @@ class ProcessingPipeline:
     Processing pipeline for video/image streams
     """
     
-    def __init__(self, helmet_detector, plate_ocr_pipeline):
+    def __init__(self, helmet_detector, plate_ocr_pipeline,
+                 helmet_options: Dict = None, plate_options: Dict = None):
         """
         Initialize processing pipeline.
         
         Args:
             helmet_detector: HelmetDetector service instance
             plate_ocr_pipeline: NumberPlateRecognitionPipeline instance
+            helmet_options: imgsz / iou / max_det for helmet detection
+                (a camera's inference profile)
+            plate_options: imgsz / iou / max_det for plate detection
         """
         self.helmet_detector = helmet_detector
         self.plate_ocr_pipeline = plate_ocr_pipeline
+        self.helmet_options = helmet_options or {}
+        self.plate_options = plate_options or {}
         self.violations = []
     
     def process_frame(
@@ -180,36 +217,36 @@ class ProcessingPipeline:
             save_evidence: Whether to save evidence images
             
         Returns:
-            Dictionary with violations and detections
+            Dictionary with violations, detections and per-stage timings (seconds)
         """
         results = {
             'violations': [],
             'helmet_detections': None,
             'plate_detections': None,
-            'frame': frame
+            'frame': frame,
+            'timings': {}
         }
         
         try:
             # Detect helmets
-            helmet_detections = self.helmet_detector.detect(frame)
+            started = time.perf_counter()
+            helmet_detections = self.helmet_detector.detect(frame, **self.helmet_options)
             results['helmet_detections'] = helmet_detections
+            results['timings']['helmet'] = time.perf_counter() - started
             
             # Check for helmet violations
             helmet_violations = self.helmet_detector.detect_violations(helmet_detections)
             results['violations'].extend(helmet_violations)
             
             # Detect number plates
-            plate_results = self.plate_ocr_pipeline.process_image(frame)
+            started = time.perf_counter()
+            plate_results = self.plate_ocr_pipeline.process_image(frame, **self.plate_options)
             results['plate_detections'] = plate_results
+            results['timings']['plate'] = time.perf_counter() - started
             
             # Associate violations with vehicle numbers
-            for violation in results['violations']:
-                if plate_results.get('valid_plates_found', 0) > 0:
-                    for plate in plate_results['ocr'].get('valid_plates', []):
-                        violation['vehicle_number'] = plate['text']
-                        violation['latitude'] = latitude
-                        violation['longitude'] = longitude
-                        violation['location_name'] = location_name
+            self._associate_plates(results['violations'], plate_results,
+                                   latitude, longitude, location_name)
             
             logger.info(f"Frame processed: {len(results['violations'])} violations detected")
             
@@ -217,3 +254,62 @@ class ProcessingPipeline:
             logger.error(f"Error processing frame: {str(e)}")
         
         return results
+    
+    def process_batch(
+        self,
+        frames: list,
+        latitude: float,
+        longitude: float,
+        location_name: str
+    ) -> List[Dict]:
+        """
+        Process several frames with one detector forward pass per model.
+        
+        Args:
+            frames: Image frames (numpy arrays)
+            latitude: Location latitude
+            longitude: Location longitude
+            location_name: Location name
+            
+        Returns:
+            One result dictionary per frame, in input order
+        """
+        if not frames:
+            return []
+        
+        helmet_batch = self.helmet_detector.detect_batch(frames, **self.helmet_options)
+        plate_batch = self.plate_ocr_pipeline.process_batch(frames, **self.plate_options)
+        
+        batch_results = []
+        for frame, helmet_detections, plate_results in zip(frames, helmet_batch, plate_batch):
+            violations = self.helmet_detector.detect_violations(helmet_detections)
+            self._associate_plates(violations, plate_results, latitude, longitude, location_name)
+            batch_results.append({
+                'violations': violations,
+                'helmet_detections': helmet_detections,
+                'plate_detections': plate_results,
+                'frame': frame
+            })
+        
+        logger.info(
+            f"Batch of {len(frames)} frames processed: "
+            f"{sum(len(r['violations']) for r in batch_results)} violations detected"
+        )
+        return batch_results
+    
+    @staticmethod
+    def _associate_plates(
+        violations: List[Dict],
+        plate_results: Dict,
+        latitude: float,
+        longitude: float,
+        location_name: str
+    ):
+        """Attach recognized plates and location to each violation in place."""
+        for violation in violations:
+            if plate_results.get('valid_plates_found', 0) > 0:
+                for plate in plate_results['ocr'].get('valid_plates', []):
+                    violation['vehicle_number'] = plate['text']
+                    violation['latitude'] = latitude
+                    violation['longitude'] = longitude
+                    violation['location_name'] = location_name
@@ -0,0 +1,149 @@
+"""
+Benchmark: single-model helmet detector vs rider cascade
+
+Runs both helmet detection paths over the same frames and reports
+throughput at several batch sizes plus accuracy. With YOLO labels
+(class 0 helmet, 1 no_helmet, as produced by train_helmet_model.py) each
+path is scored against them; otherwise the single model's detections are
+the reference and the cascade is scored on agreement.
+"""
+
+import argparse
+import json
+import logging
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+import cv2
+
+from backend.app.config import get_setting
+from backend.app.services.tiling import box_iou
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+Labeled = List[Tuple[int, Tuple[int, int, int, int]]]
+
+
+def load_images(images_dir: str, labels_dir: str = None, limit: int = None) -> Tuple[List, List[Labeled]]:
+    """Read images and, if given, their YOLO-format labels as pixel boxes."""
+    frames, labels = [], []
+    for path in sorted(Path(images_dir).glob("*.[jp][pn]g"))[:limit]:
+        image = cv2.imread(str(path))
+        if image is None:
+            continue
+        frames.append(image)
+        if labels_dir:
+            height, width = image.shape[:2]
+            boxes = []
+            label_path = Path(labels_dir) / f"{path.stem}.txt"
+            if label_path.exists():
+                for line in label_path.read_text().splitlines():
+                    class_id, cx, cy, w, h = line.split()[:5]
+                    cx, cy, w, h = float(cx) * width, float(cy) * height, float(w) * width, float(h) * height
+                    boxes.append((int(class_id), (int(cx - w / 2), int(cy - h / 2), int(cx + w / 2), int(cy + h / 2))))
+            labels.append(boxes)
+    return frames, labels
+
+
+def boxes(detections: Dict) -> Labeled:
+    return [(d['class_id'], d['bbox']) for d in detections['helmets'] + detections['no_helmets']]
+
+
+def score(reference: List[Labeled], predicted: List[Labeled], match_iou: float) -> Dict:
+    """Precision, recall and class accuracy of predictions matched one-to-one to reference boxes."""
+    tp = fp = fn = same_class = 0
+    for ref_boxes, pred_boxes in zip(reference, predicted):
+        unused = list(pred_boxes)
+        for class_id, bbox in ref_boxes:
+            best = max(unused, key=lambda p: box_iou(bbox, p[1])[0], default=None)
+            if best is not None and box_iou(bbox, best[1])[0] >= match_iou:
+                unused.remove(best)
+                tp += 1
+                same_class += best[0] == class_id
+            else:
+                fn += 1
+        fp += len(unused)
+    return {
+        'precision': round(tp / (tp + fp), 3) if tp + fp else None,
+        'recall': round(tp / (tp + fn), 3) if tp + fn else None,
+        'class_accuracy': round(same_class / tp, 3) if tp else None
+    }
+
+
+def throughput(detector, frames: List, batch: int) -> Dict:
+    """Frames per second and ms per frame at one batch size, after a warm-up batch."""
+    detector.detect_batch(frames[:batch])
+    started = time.perf_counter()
+    for i in range(0, len(frames), batch):
+        detector.detect_batch(frames[i:i + batch])
+    elapsed = time.perf_counter() - started
+    return {'batch': batch, 'fps': round(len(frames) / elapsed, 2), 'ms_per_frame': round(elapsed * 1000 / len(frames), 2)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the single helmet detector with the rider cascade")
+    parser.add_argument("--images", type=str, help="Directory of sample images")
+    parser.add_argument("--labels", type=str, default=None, help="YOLO label directory for --images")
+    parser.add_argument("--video", type=str, help="Sample clip (instead of --images)")
+    parser.add_argument("--frames", type=int, default=200, help="Frames to use")
+    parser.add_argument("--batch-sizes", type=str, default="1,4,8", help="Comma-separated batch sizes")
+    parser.add_argument("--device", type=str, default="cpu", help="cpu or cuda")
+    parser.add_argument("--match-iou", type=float, default=0.3,
+                        help="IoU for a match (cascade head boxes are approximate)")
+    parser.add_argument("--json", type=str, default=None, help="Also write results to this file")
+
+    args = parser.parse_args()
+
+    if args.video:
+        from scripts.calibrate_input_size import sample_frames
+
+        frames, labels = sample_frames(args.video, args.frames), []
+    elif args.images:
+        frames, labels = load_images(args.images, args.labels, args.frames)
+    else:
+        parser.error("--images or --video is required")
+    if not frames:
+        raise SystemExit("No frames to benchmark")
+
+    from backend.app.services.helmet_detection import HelmetDetector
+    from backend.app.services.rider_cascade import CascadeHelmetDetector
+
+    detectors = {
+        'single': HelmetDetector(
+            get_setting("MODELS.HELMET_DETECTION", "models/helmet_detection/best.pt"), device=args.device
+        ),
+        'cascade': CascadeHelmetDetector(device=args.device)
+    }
+    batch_sizes = [int(size) for size in args.batch_sizes.split(",")]
+
+    report = {'frames': len(frames), 'device': args.device, 'labels': bool(labels), 'paths': {}}
+    predictions = {}
+    for name, detector in detectors.items():
+        predictions[name] = [boxes(d) for d in detector.detect_batch(frames)]
+        report['paths'][name] = {'throughput': [throughput(detector, frames, batch) for batch in batch_sizes]}
+
+    if labels:
+        for name in detectors:
+            report['paths'][name]['accuracy'] = score(labels, predictions[name], args.match_iou)
+    else:
+        report['paths']['cascade']['agreement_with_single'] = score(
+            predictions['single'], predictions['cascade'], args.match_iou
+        )
+
+    for name, result in report['paths'].items():
+        print(f"\n{name}")
+        for row in result['throughput']:
+            print(f"  batch {row['batch']:>3}: {row['fps']:>8.2f} fps  {row['ms_per_frame']:>8.2f} ms/frame")
+        for key in ('accuracy', 'agreement_with_single'):
+            if key in result:
+                print(f"  {key}: {result[key]}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2))
+        logger.info(f"Results written to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+Export and benchmark matrix for a trained detector
+
+Exports one checkpoint to the CPU deployment formats and runs every
+variant over the same sample frames: p50/p95 single-frame latency,
+throughput at several batch sizes, peak RSS and, with --data, mAP and
+its delta against the PyTorch checkpoint. Each variant runs in its own
+process so peak RSS is that variant's alone. Run once per hardware class
+and keep the fastest variant whose mAP delta is acceptable.
+"""
+
+import argparse
+import json
+import logging
+import multiprocessing
+import resource
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+# Variant -> ultralytics export arguments (None: the checkpoint itself)
+VARIANTS = {
+    'pytorch': None,
+    'torchscript': {'format': 'torchscript'},
+    'onnx': {'format': 'onnx', 'dynamic': True, 'simplify': True},
+    'onnx_int8': {'format': 'onnx', 'dynamic': True, 'simplify': True},
+    'openvino': {'format': 'openvino', 'dynamic': True},
+    'openvino_int8': {'format': 'openvino', 'int8': True},
+}
+
+
+def export_variant(checkpoint: str, variant: str, imgsz: int, data: Optional[str] = None) -> str:
+    """
+    Export a checkpoint to one variant.
+
+    onnx_int8 is the ONNX export with dynamic int8 weight quantization
+    (onnxruntime); openvino_int8 is post-training quantized by OpenVINO
+    NNCF and calibrates on the `data` dataset.
+
+    Returns:
+        Path that YOLO() can load
+    """
+    from ultralytics import YOLO
+
+    options = VARIANTS[variant]
+    if options is None:
+        return checkpoint
+    if variant == 'openvino_int8' and not data:
+        raise ValueError("openvino_int8 needs --data for calibration")
+
+    extra = {'data': data} if variant == 'openvino_int8' else {}
+    path = YOLO(checkpoint).export(imgsz=imgsz, device="cpu", **options, **extra)
+
+    if variant == 'onnx_int8':
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        quantized = str(Path(path).with_suffix('.int8.onnx'))
+        quantize_dynamic(path, quantized, weight_type=QuantType.QUInt8)
+        path = quantized
+    return str(path)
+
+
+def percentile(samples: List[float], share: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * share))]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident memory of this process in MB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def load_frames(images: Optional[str], video: Optional[str], count: int) -> List:
+    if video:
+        from scripts.calibrate_input_size import sample_frames
+
+        return sample_frames(video, count)
+    from scripts.benchmark_cascade import load_images
+
+    return load_images(images, limit=count)[0]
+
+
+def benchmark_variant(
+    path: str,
+    images: Optional[str],
+    video: Optional[str],
+    frames: int,
+    imgsz: int,
+    batch_sizes: List[int],
+    warmup: int,
+    data: Optional[str]
+) -> Dict:
+    """
+    Benchmark one exported model; meant to run in a fresh process.
+
+    Returns:
+        Latency, throughput per batch size, peak RSS and (with data) mAP
+    """
+    from ultralytics import YOLO
+
+    sample = load_frames(images, video, frames)
+    model = YOLO(path, task='detect')
+    options = {'imgsz': imgsz, 'device': 'cpu', 'verbose': False}
+
+    for frame in sample[:warmup]:
+        model.predict(source=frame, **options)
+    latencies = []
+    for frame in sample:
+        started = time.perf_counter()
+        model.predict(source=frame, **options)
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    result = {
+        'model': path,
+        'p50_ms': round(percentile(latencies, 0.5), 2),
+        'p95_ms': round(percentile(latencies, 0.95), 2),
+        'throughput': []
+    }
+    for batch in batch_sizes:
+        try:
+            model.predict(source=sample[:batch], **options)  # warm-up
+            started = time.perf_counter()
+            for i in range(0, len(sample), batch):
+                model.predict(source=sample[i:i + batch], **options)
+            elapsed = time.perf_counter() - started
+            result['throughput'].append({'batch': batch, 'fps': round(len(sample) / elapsed, 2)})
+        except Exception as e:
+            # Static-shape exports reject batches they were not traced for
+            result['throughput'].append({'batch': batch, 'fps': None, 'error': str(e)})
+
+    if data:
+        metrics = model.val(data=data, imgsz=imgsz, batch=1, device="cpu", verbose=False)
+        result['map50'] = round(float(metrics.box.map50), 4)
+        result['map50_95'] = round(float(metrics.box.map), 4)
+
+    result['peak_rss_mb'] = peak_rss_mb()
+    return result
+
+
+def markdown_table(report: Dict) -> str:
+    """Variants as a markdown table, one fps column per batch size."""
+    batch_sizes = report['batch_sizes']
+    header = ["variant", "p50 ms", "p95 ms"] + [f"fps@{b}" for b in batch_sizes] + ["peak RSS MB", "mAP50-95", "mAP delta"]
+    lines = ["| " + " | ".join(header) + " |", "|" + "---|" * len(header)]
+    for name, result in report['variants'].items():
+        if 'error' in result:
+            lines.append(f"| {name} | " + " | ".join(["-"] * (len(header) - 2)) + f" | {result['error']} |")
+            continue
+        fps = {row['batch']: row['fps'] for row in result['throughput']}
+        cells = [name, result['p50_ms'], result['p95_ms']] + [fps.get(b) for b in batch_sizes] + [
+            result['peak_rss_mb'], result.get('map50_95'), result.get('map50_95_delta')
+        ]
+        lines.append("| " + " | ".join("-" if c is None else str(c) for c in cells) + " |")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Export a detector to CPU formats and benchmark each variant")
+    parser.add_argument("--model", type=str, required=True, help="Trained checkpoint (best.pt)")
+    parser.add_argument("--images", type=str, help="Directory of sample frames")
+    parser.add_argument("--video", type=str, help="Sample clip (instead of --images)")
+    parser.add_argument("--frames", type=int, default=100, help="Frames to use")
+    parser.add_argument("--data", type=str, default=None,
+                        help="dataset.yaml for mAP and int8 calibration (mAP is skipped without it)")
+    parser.add_argument("--variants", type=str, default=",".join(VARIANTS), help="Comma-separated variants")
+    parser.add_argument("--img-size", type=int, default=640, help="Input image size")
+    parser.add_argument("--batch-sizes", type=str, default="1,4,8", help="Comma-separated batch sizes")
+    parser.add_argument("--warmup", type=int, default=10, help="Warm-up frames per variant")
+    parser.add_argument("--json", type=str, default=None, help="Write the report to this file")
+    parser.add_argument("--markdown", type=str, default=None, help="Write the table to this file")
+
+    args = parser.parse_args()
+
+    if not args.images and not args.video:
+        parser.error("--images or --video is required")
+    variants = [name.strip() for name in args.variants.split(",")]
+    unknown = [name for name in variants if name not in VARIANTS]
+    if unknown:
+        parser.error(f"Unknown variants: {', '.join(unknown)} (choose from {', '.join(VARIANTS)})")
+    batch_sizes = [int(size) for size in args.batch_sizes.split(",")]
+
+    report = {'checkpoint': args.model, 'imgsz': args.img_size, 'batch_sizes': batch_sizes, 'variants': {}}
+    context = multiprocessing.get_context("spawn")
+    for name in variants:
+        try:
+            path = export_variant(args.model, name, args.img_size, args.data)
+            logger.info(f"Benchmarking {name}: {path}")
+            with context.Pool(1) as pool:
+                report['variants'][name] = pool.apply(benchmark_variant, (
+                    path, args.images, args.video, args.frames, args.img_size,
+                    batch_sizes, args.warmup, args.data
+                ))
+        except Exception as e:
+            logger.error(f"{name} failed: {e}")
+            report['variants'][name] = {'error': str(e)}
+
+    baseline = report['variants'].get('pytorch', {}).get('map50_95')
+    for result in report['variants'].values():
+        if baseline is not None and result.get('map50_95') is not None:
+            result['map50_95_delta'] = round(result['map50_95'] - baseline, 4)
+
+    table = markdown_table(report)
+    print(table)
+    if args.json:
+        Path(args.json).write_text(json.dumps(report, indent=2))
+        logger.info(f"Report written to {args.json}")
+    if args.markdown:
+        Path(args.markdown).write_text(table + "\n")
+        logger.info(f"Table written to {args.markdown}")
+
+
+if __name__ == "__main__":
+    main()
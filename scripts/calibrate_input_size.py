@@ -0,0 +1,154 @@
+"""
+Input-size calibration for helmet and plate detection
+
+Sweeps model input sizes on a sample clip from a camera and picks the
+smallest one whose recall meets a target. The clip is unlabeled, so
+detections at a large reference size stand in for ground truth: recall
+at a size is the share of reference boxes found again (same class,
+IoU >= --match-iou). Close-range cameras usually keep their recall at
+320-416, which costs well under half the compute of 640.
+"""
+
+import argparse
+import json
+import logging
+import time
+from typing import Dict, List
+
+import cv2
+
+from backend.app.config import get_setting
+from backend.app.services.tiling import box_iou
+
+logger = logging.getLogger(__name__)
+logging.basicConfig(level=logging.INFO)
+
+
+def sample_frames(video_path: str, count: int) -> List:
+    """Read `count` frames spread evenly over the clip."""
+    cap = cv2.VideoCapture(video_path)
+    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) or count
+    step = max(1, total // count)
+    frames = []
+    index = 0
+    while len(frames) < count:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        if index % step == 0:
+            frames.append(frame)
+        index += 1
+    cap.release()
+    return frames
+
+
+def load_detector(stage: str, model_path: str = None):
+    """Detector for a stage and a function listing its boxes as (class_id, bbox)."""
+    if stage == "helmet":
+        from backend.app.services.helmet_detection import HelmetDetector
+
+        detector = HelmetDetector(model_path or get_setting("MODELS.HELMET_DETECTION", "models/helmet_detection/best.pt"))
+        return detector, lambda d: [(b['class_id'], b['bbox']) for b in d['helmets'] + d['no_helmets']]
+
+    from backend.app.services.plate_ocr import NumberPlateDetector
+
+    detector = NumberPlateDetector(model_path or get_setting("MODELS.PLATE_DETECTION", "models/plate_detection/best.pt"))
+    return detector, lambda d: [(0, b['bbox']) for b in d['plates']]
+
+
+def run(detector, boxes, frames: List, imgsz: int, batch: int) -> Dict:
+    """Detect at one input size; returns boxes per frame and ms per frame."""
+    detector.detect_batch(frames[:batch], return_crops=False, imgsz=imgsz)  # warm-up
+    found = []
+    started = time.perf_counter()
+    for i in range(0, len(frames), batch):
+        for detections in detector.detect_batch(frames[i:i + batch], return_crops=False, imgsz=imgsz):
+            found.append(boxes(detections))
+    elapsed = time.perf_counter() - started
+    return {'boxes': found, 'ms_per_frame': elapsed * 1000 / max(1, len(frames))}
+
+
+def recall(reference: List[List], candidate: List[List], match_iou: float) -> float:
+    """Share of reference boxes matched one-to-one by a candidate box of the same class."""
+    total = matched = 0
+    for ref_boxes, cand_boxes in zip(reference, candidate):
+        unused = list(cand_boxes)
+        for class_id, bbox in ref_boxes:
+            total += 1
+            best = None
+            for other in unused:
+                if other[0] == class_id and box_iou(bbox, other[1])[0] >= match_iou:
+                    best = other
+                    break
+            if best is not None:
+                unused.remove(best)
+                matched += 1
+    return matched / total if total else 1.0
+
+
+def save_profile(camera_id: str, stage: str, imgsz: int):
+    """Store the chosen size in the camera's inference_profile."""
+    from backend.app.database.database import SessionLocal
+    from backend.app.models.database import CameraLocation
+    from backend.app.services.inference_profile import parse_profile
+
+    db = SessionLocal()
+    try:
+        camera = db.query(CameraLocation).filter(CameraLocation.camera_id == camera_id).first()
+        if camera is None:
+            raise SystemExit(f"Camera {camera_id} not found in camera_locations")
+        profile = parse_profile(camera.inference_profile)
+        profile[stage]['imgsz'] = imgsz
+        camera.inference_profile = json.dumps({k: v for k, v in profile.items() if v})
+        db.commit()
+        logger.info(f"Saved {stage} imgsz={imgsz} to {camera_id}")
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pick the smallest detector input size meeting a recall target")
+    parser.add_argument("--video", type=str, required=True, help="Sample clip from the camera")
+    parser.add_argument("--stage", choices=["helmet", "plate"], default="helmet", help="Detector to calibrate")
+    parser.add_argument("--model", type=str, default=None, help="Model path (MODELS.* by default)")
+    parser.add_argument("--sizes", type=str, default="320,416,512,640", help="Comma-separated input sizes")
+    parser.add_argument("--reference-size", type=int, default=1280, help="Input size treated as ground truth")
+    parser.add_argument("--recall", type=float, default=0.95, help="Recall target")
+    parser.add_argument("--match-iou", type=float, default=0.5, help="IoU for a box to count as found")
+    parser.add_argument("--frames", type=int, default=200, help="Frames sampled from the clip")
+    parser.add_argument("--batch", type=int, default=8, help="Frames per forward pass")
+    parser.add_argument("--camera-id", type=str, default=None, help="Save the result to this camera")
+
+    args = parser.parse_args()
+
+    frames = sample_frames(args.video, args.frames)
+    if not frames:
+        raise SystemExit(f"No frames read from {args.video}")
+    detector, boxes = load_detector(args.stage, args.model)
+    sizes = sorted(int(size) for size in args.sizes.split(","))
+
+    reference = run(detector, boxes, frames, args.reference_size, args.batch)
+    logger.info(
+        f"Reference {args.reference_size}px: {sum(map(len, reference['boxes']))} boxes "
+        f"in {len(frames)} frames, {reference['ms_per_frame']:.1f} ms/frame"
+    )
+
+    chosen = None
+    print(f"{'imgsz':>6} {'recall':>7} {'ms/frame':>9}")
+    for size in sizes:
+        result = run(detector, boxes, frames, size, args.batch)
+        size_recall = recall(reference['boxes'], result['boxes'], args.match_iou)
+        print(f"{size:>6} {size_recall:>7.3f} {result['ms_per_frame']:>9.1f}")
+        if chosen is None and size_recall >= args.recall:
+            chosen = size
+
+    if chosen is None:
+        print(f"No size reached recall {args.recall}; keep {max(sizes)} or use tiling")
+        return
+    print(f"Smallest size meeting recall {args.recall}: {chosen}")
+    if args.camera_id:
+        save_profile(args.camera_id, args.stage, chosen)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Knowledge distillation for YOLO detectors
+Trains a small student on a trained teacher's predictions and compares the two
+"""
+
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import yaml
+
+from backend.app.services.tiling import box_iou
+
+logger = logging.getLogger(__name__)
+
+IMAGE_PATTERNS = ("*.jpg", "*.jpeg", "*.png")
+
+
+def _images(directory: Path) -> List[Path]:
+    return sorted(p for pattern in IMAGE_PATTERNS for p in directory.glob(pattern))
+
+
+def _split_dir(dataset: Dict, split: str) -> Path:
+    root = Path(dataset.get('path', '.'))
+    return root / dataset[split]
+
+
+def _read_labels(path: Path) -> List[List[float]]:
+    if not path.exists():
+        return []
+    return [[float(v) for v in line.split()[:5]] for line in path.read_text().splitlines() if line.strip()]
+
+
+def _xyxy(label: List[float]):
+    _, cx, cy, w, h = label
+    return (cx - w / 2, cy - h / 2, cx + w / 2, cy + h / 2)
+
+
+def teacher_labels(teacher, image: Path, conf: float, imgsz: int) -> List[List[float]]:
+    """Teacher detections for one image as normalized YOLO labels."""
+    result = teacher.predict(source=str(image), conf=conf, imgsz=imgsz, verbose=False)[0]
+    if result.boxes is None:
+        return []
+    return [
+        [int(cls), *map(float, xywhn)]
+        for cls, xywhn in zip(result.boxes.cls.tolist(), result.boxes.xywhn.tolist())
+    ]
+
+
+def build_distillation_dataset(
+    teacher_path: str,
+    dataset_yaml: str,
+    output_dir: str,
+    conf: float = 0.25,
+    imgsz: int = 640,
+    unlabeled_dir: Optional[str] = None,
+    match_iou: float = 0.5
+) -> str:
+    """
+    Create a training set labeled by the teacher.
+
+    Labeled training images keep their annotations plus any teacher box
+    that matches none of them (objects the annotators missed); images
+    from `unlabeled_dir` get teacher labels only. Images are symlinked,
+    not copied. Validation stays on the original ground truth, so student
+    and teacher are scored on the same labels.
+
+    Args:
+        teacher_path: Trained teacher weights (e.g. the medium model)
+        dataset_yaml: Original dataset.yaml
+        output_dir: Where the distillation dataset is written
+        conf: Teacher confidence for a pseudo-label
+        imgsz: Teacher input size
+        unlabeled_dir: Extra unlabeled images (e.g. frames from our cameras)
+        match_iou: IoU above which a teacher box duplicates an annotation
+
+    Returns:
+        Path of the distillation dataset.yaml
+    """
+    from ultralytics import YOLO
+
+    with open(dataset_yaml) as f:
+        dataset = yaml.safe_load(f)
+    teacher = YOLO(teacher_path)
+
+    out = Path(output_dir)
+    images_out = out / "train" / "images"
+    labels_out = out / "train" / "labels"
+    images_out.mkdir(parents=True, exist_ok=True)
+    labels_out.mkdir(parents=True, exist_ok=True)
+
+    train_images = _split_dir(dataset, 'train')
+    sources = [(image, image.parent.parent / "labels" / f"{image.stem}.txt") for image in _images(train_images)]
+    if unlabeled_dir:
+        sources += [(image, None) for image in _images(Path(unlabeled_dir))]
+
+    added = 0
+    for index, (image, label_path) in enumerate(sources):
+        truth = _read_labels(label_path) if label_path else []
+        extra = [
+            label for label in teacher_labels(teacher, image, conf, imgsz)
+            if not any(label[0] == t[0] and box_iou(_xyxy(label), _xyxy(t))[0] >= match_iou for t in truth)
+        ]
+        added += len(extra)
+
+        name = f"{index:06d}_{image.name}"
+        link = images_out / name
+        if not link.exists():
+            os.symlink(image.resolve(), link)
+        (labels_out / f"{Path(name).stem}.txt").write_text(
+            "".join(f"{int(c)} {x:.6f} {y:.6f} {w:.6f} {h:.6f}\n" for c, x, y, w, h in truth + extra)
+        )
+
+    distill_yaml = {
+        'path': str(out.resolve()),
+        'train': 'train/images',
+        'val': str(_split_dir(dataset, 'val').resolve()),
+        'nc': dataset['nc'],
+        'names': dataset['names']
+    }
+    yaml_path = out / "dataset.yaml"
+    with open(yaml_path, 'w') as f:
+        yaml.dump(distill_yaml, f)
+    logger.info(f"Distillation dataset: {len(sources)} images, {added} teacher labels added -> {yaml_path}")
+    return str(yaml_path)
+
+
+def cpu_latency(model_path: str, images: List[Path], imgsz: int = 640, warmup: int = 5) -> Dict[str, float]:
+    """p50/p95 single-image CPU latency in milliseconds."""
+    from ultralytics import YOLO
+
+    model = YOLO(model_path)
+    for image in images[:warmup]:
+        model.predict(source=str(image), imgsz=imgsz, device="cpu", verbose=False)
+    samples = []
+    for image in images:
+        started = time.perf_counter()
+        model.predict(source=str(image), imgsz=imgsz, device="cpu", verbose=False)
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        'p50_ms': round(samples[len(samples) // 2], 1),
+        'p95_ms': round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 1)
+    }
+
+
+def compare(teacher_path: str, student_path: str, dataset_yaml: str,
+            imgsz: int = 640, latency_images: int = 50) -> Dict:
+    """
+    Student vs teacher mAP on the validation split and CPU latency.
+
+    Returns:
+        {"teacher": {...}, "student": {...}, "map50_95_delta": ..., "speedup": ...}
+    """
+    from ultralytics import YOLO
+
+    with open(dataset_yaml) as f:
+        dataset = yaml.safe_load(f)
+    sample = _images(_split_dir(dataset, 'val'))[:latency_images]
+
+    report = {}
+    for role, path in (("teacher", teacher_path), ("student", student_path)):
+        metrics = YOLO(path).val(data=dataset_yaml, imgsz=imgsz, device="cpu", verbose=False)
+        report[role] = {
+            'model': str(path),
+            'map50': round(float(metrics.box.map50), 4),
+            'map50_95': round(float(metrics.box.map), 4),
+            **cpu_latency(path, sample, imgsz)
+        }
+
+    report['map50_95_delta'] = round(report['student']['map50_95'] - report['teacher']['map50_95'], 4)
+    report['speedup'] = round(report['teacher']['p50_ms'] / report['student']['p50_ms'], 2) if report['student']['p50_ms'] else None
+    return report
+
+
+def log_comparison(report: Dict):
+    """Print a student-vs-teacher summary."""
+    for role in ("teacher", "student"):
+        r = report[role]
+        logger.info(
+            f"{role:>7}: mAP50 {r['map50']:.3f}  mAP50-95 {r['map50_95']:.3f}  "
+            f"CPU p50 {r['p50_ms']} ms  p95 {r['p95_ms']} ms  ({r['model']})"
+        )
+    logger.info(f"mAP50-95 delta {report['map50_95_delta']:+.4f}, CPU speedup x{report['speedup']}")
@@ -95,7 +95,8 @@ class HelmetDetectionTrainer:
         return str(dataset_yaml_path)
     
     def train(self, dataset_yaml: str, epochs: int = 100, batch_size: int = 16, 
-              img_size: int = 640, patience: int = 20):
+              img_size: int = 640, patience: int = 20, model_name: str = "yolov8m.pt",
+              run_name: str = "helmet_detector"):
         """
         Train YOLOv8 model for helmet detection.
         
@@ -105,11 +106,13 @@ class HelmetDetectionTrainer:
             batch_size: Batch size for training
             img_size: Input image size
             patience: Early stopping patience
+            model_name: Base weights (yolov8n/s/m.pt)
+            run_name: Run directory under models/helmet_detection
         """
-        logger.info("Starting YOLOv8 Helmet Detection Training")
+        logger.info(f"Starting YOLOv8 Helmet Detection Training ({model_name})")
         
         # Load model
-        model = YOLO("yolov8m.pt")  # Use yolov8m (medium) model
+        model = YOLO(model_name)
         
         # Train model
         results = model.train(
@@ -120,7 +123,7 @@ class HelmetDetectionTrainer:
             patience=patience,
             device=self.device,
             project="models/helmet_detection",
-            name="helmet_detector",
+            name=run_name,
             save=True,
             half=True if self.device == "cuda" else False,
             optimizer='SGD',
@@ -140,6 +143,71 @@ class HelmetDetectionTrainer:
         logger.info("Training completed successfully")
         return model, results
     
+    def distill(self, teacher_path: str, dataset_yaml: str, student: str = "yolov8n.pt",
+                epochs: int = 100, batch_size: int = 16, img_size: int = 640,
+                pseudo_conf: float = 0.25, unlabeled_dir: str = None):
+        """
+        Train a small student on the teacher's predictions and compare them.
+        
+        Args:
+            teacher_path: Trained teacher weights (the medium model)
+            dataset_yaml: Path to dataset.yaml file
+            student: Student base weights (yolov8n.pt or yolov8s.pt)
+            epochs: Number of training epochs
+            batch_size: Batch size for training
+            img_size: Input image size
+            pseudo_conf: Teacher confidence for a pseudo-label
+            unlabeled_dir: Extra unlabeled images labeled by the teacher
+            
+        Returns:
+            (student model, student-vs-teacher report with mAP and CPU latency)
+        """
+        from scripts.distillation import build_distillation_dataset, compare, log_comparison
+        
+        distill_yaml = build_distillation_dataset(
+            teacher_path, dataset_yaml, "data/helmet/distill",
+            conf=pseudo_conf, imgsz=img_size, unlabeled_dir=unlabeled_dir
+        )
+        model, _ = self.train(distill_yaml, epochs=epochs, batch_size=batch_size, img_size=img_size,
+                              model_name=student, run_name="helmet_student")
+        report = compare(teacher_path, model.trainer.best, distill_yaml, imgsz=img_size)
+        log_comparison(report)
+        return model, report
+    
+    def train_head_classifier(self, data_dir: str, epochs: int = 50, batch_size: int = 128,
+                              img_size: int = 64):
+        """
+        Train the head classifier used by the rider cascade (DETECTION.HELMET.MODE: cascade).
+        
+        Expected directory structure (rider head crops):
+        data_dir/
+        ├── train/helmet/, train/no_helmet/
+        └── val/helmet/, val/no_helmet/
+        
+        Args:
+            data_dir: Head crop dataset
+            epochs: Number of training epochs
+            batch_size: Batch size for training
+            img_size: Classifier input size
+        """
+        logger.info("Starting head classifier training")
+        
+        model = YOLO("yolov8n-cls.pt")
+        results = model.train(
+            data=data_dir,
+            epochs=epochs,
+            imgsz=img_size,
+            batch=batch_size,
+            device=self.device,
+            project="models/helmet_detection",
+            name="head_classifier",
+            save=True,
+            verbose=True
+        )
+        
+        logger.info("Head classifier training completed")
+        return model, results
+    
     def evaluate(self, model, test_images_dir: str):
         """
         Evaluate model performance on test set.
@@ -199,23 +267,49 @@ def main():
     parser.add_argument("--img-size", type=int, default=640, help="Input image size")
     parser.add_argument("--config", type=str, default="config/config.yaml", help="Config file path")
     parser.add_argument("--eval-only", action="store_true", help="Only evaluate without training")
+    parser.add_argument("--head-classifier", type=str, default=None,
+                        help="Train the rider-cascade head classifier on this crop dataset instead")
+    parser.add_argument("--model", type=str, default="yolov8m.pt", help="Base weights to fine-tune")
+    parser.add_argument("--distill", action="store_true",
+                        help="Train a small student against --teacher instead of fine-tuning --model")
+    parser.add_argument("--teacher", type=str, default="models/helmet_detection/helmet_detector/weights/best.pt",
+                        help="Teacher weights for --distill")
+    parser.add_argument("--student", type=str, default="yolov8n.pt", help="Student base weights for --distill")
+    parser.add_argument("--pseudo-conf", type=float, default=0.25, help="Teacher confidence for pseudo-labels")
+    parser.add_argument("--unlabeled", type=str, default=None,
+                        help="Unlabeled images (e.g. camera frames) for the teacher to label")
     
     args = parser.parse_args()
     
     # Initialize trainer
     trainer = HelmetDetectionTrainer(config_path=args.config)
     
-    if not args.eval_only:
+    if args.head_classifier:
+        trainer.train_head_classifier(args.head_classifier, epochs=args.epochs)
+    elif not args.eval_only:
         # Prepare dataset
         dataset_yaml = trainer.prepare_dataset(args.data)
         
-        # Train model
-        model, results = trainer.train(
-            dataset_yaml=dataset_yaml,
-            epochs=args.epochs,
-            batch_size=args.batch_size,
-            img_size=args.img_size
-        )
+        if args.distill:
+            model, report = trainer.distill(
+                teacher_path=args.teacher,
+                dataset_yaml=dataset_yaml,
+                student=args.student,
+                epochs=args.epochs,
+                batch_size=args.batch_size,
+                img_size=args.img_size,
+                pseudo_conf=args.pseudo_conf,
+                unlabeled_dir=args.unlabeled
+            )
+        else:
+            # Train model
+            model, results = trainer.train(
+                dataset_yaml=dataset_yaml,
+                epochs=args.epochs,
+                batch_size=args.batch_size,
+                img_size=args.img_size,
+                model_name=args.model
+            )
         
         # Export model
         trainer.export_model(model, export_format="onnx")
@@ -64,11 +64,11 @@ class PlateDetectionTrainer:
         return str(dataset_yaml_path)
     
     def train(self, dataset_yaml: str, epochs: int = 80, batch_size: int = 16, 
-              img_size: int = 640):
+              img_size: int = 640, model_name: str = "yolov8m.pt", run_name: str = "plate_detector"):
         """Train YOLO plate detection model."""
-        logger.info("Starting YOLOv8 Plate Detection Training")
+        logger.info(f"Starting YOLOv8 Plate Detection Training ({model_name})")
         
-        model = YOLO("yolov8m.pt")
+        model = YOLO(model_name)
         
         results = model.train(
             data=dataset_yaml,
@@ -77,7 +77,7 @@ class PlateDetectionTrainer:
             batch=batch_size,
             device=self.device,
             project="models/plate_detection",
-            name="plate_detector",
+            name=run_name,
             save=True,
             half=True if self.device == "cuda" else False,
             patience=15
@@ -85,6 +85,29 @@ class PlateDetectionTrainer:
         
         logger.info("Training completed")
         return model, results
+    
+    def distill(self, teacher_path: str, dataset_yaml: str, student: str = "yolov8n.pt",
+                epochs: int = 80, batch_size: int = 16, img_size: int = 640,
+                pseudo_conf: float = 0.25, unlabeled_dir: str = None):
+        """
+        Train a small student on the teacher's predictions and compare them.
+        
+        See HelmetDetectionTrainer.distill() in train_helmet_model.py.
+        
+        Returns:
+            (student model, student-vs-teacher report)
+        """
+        from scripts.distillation import build_distillation_dataset, compare, log_comparison
+        
+        distill_yaml = build_distillation_dataset(
+            teacher_path, dataset_yaml, "data/number_plate/distill",
+            conf=pseudo_conf, imgsz=img_size, unlabeled_dir=unlabeled_dir
+        )
+        model, _ = self.train(distill_yaml, epochs=epochs, batch_size=batch_size, img_size=img_size,
+                              model_name=student, run_name="plate_student")
+        report = compare(teacher_path, model.trainer.best, distill_yaml, imgsz=img_size)
+        log_comparison(report)
+        return model, report
 
 
 def main():
@@ -94,17 +117,39 @@ def main():
     parser.add_argument("--epochs", type=int, default=80, help="Number of epochs")
     parser.add_argument("--batch-size", type=int, default=16, help="Batch size")
     parser.add_argument("--img-size", type=int, default=640, help="Image size")
+    parser.add_argument("--model", type=str, default="yolov8m.pt", help="Base weights to fine-tune")
+    parser.add_argument("--distill", action="store_true",
+                        help="Train a small student against --teacher instead of fine-tuning --model")
+    parser.add_argument("--teacher", type=str, default="models/plate_detection/plate_detector/weights/best.pt",
+                        help="Teacher weights for --distill")
+    parser.add_argument("--student", type=str, default="yolov8n.pt", help="Student base weights for --distill")
+    parser.add_argument("--pseudo-conf", type=float, default=0.25, help="Teacher confidence for pseudo-labels")
+    parser.add_argument("--unlabeled", type=str, default=None,
+                        help="Unlabeled images (e.g. camera frames) for the teacher to label")
     
     args = parser.parse_args()
     
     trainer = PlateDetectionTrainer()
     dataset_yaml = trainer.prepare_dataset(args.data)
-    model, results = trainer.train(
-        dataset_yaml=dataset_yaml,
-        epochs=args.epochs,
-        batch_size=args.batch_size,
-        img_size=args.img_size
-    )
+    if args.distill:
+        model, report = trainer.distill(
+            teacher_path=args.teacher,
+            dataset_yaml=dataset_yaml,
+            student=args.student,
+            epochs=args.epochs,
+            batch_size=args.batch_size,
+            img_size=args.img_size,
+            pseudo_conf=args.pseudo_conf,
+            unlabeled_dir=args.unlabeled
+        )
+    else:
+        model, results = trainer.train(
+            dataset_yaml=dataset_yaml,
+            epochs=args.epochs,
+            batch_size=args.batch_size,
+            img_size=args.img_size,
+            model_name=args.model
+        )
     
     logger.info("Plate detection training completed!")
 
@@ -0,0 +1,145 @@
+"""
+Unit tests for analytics counter invalidation and challan payments (SQLite)
+"""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from backend.app.database.database import get_db
+from backend.app.models.database import Base, ViolationTypeEnum
+from backend.app.routes.challan import router as challan_router
+from backend.app.services.analytics import AnalyticsService, analytics_cache
+from backend.app.services.echallan import EChallanService
+from backend.app.services.violation_detection import ViolationDetectionService
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'analytics.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+def make_violation(db):
+    violation = ViolationDetectionService.create_violation(
+        violation_type=ViolationTypeEnum.HELMET_NOT_WORN,
+        vehicle_number="KA01AB1234",
+        latitude=12.97,
+        longitude=77.59,
+        location_name="MG Road"
+    )
+    return ViolationDetectionService.persist_violation(db, violation)
+
+
+def cached_total(db):
+    return analytics_cache.get_or_compute(
+        ("summary", 1), lambda: AnalyticsService.get_summary(db, 1)['total_violations']
+    )
+
+
+class TestCounterInvalidation:
+    """Test cases for analytics cache invalidation"""
+    
+    def test_cache_invalidated_after_commit(self, db, session_factory):
+        """A read between a counter write and its commit cannot pin stale totals"""
+        analytics_cache.invalidate()
+        make_violation(db)
+        assert cached_total(db) == 1
+        
+        writer = session_factory()
+        violation = ViolationDetectionService.create_violation(
+            violation_type=ViolationTypeEnum.HELMET_NOT_WORN,
+            vehicle_number="KA01AB9999",
+            latitude=12.97,
+            longitude=77.59,
+            location_name="MG Road"
+        )
+        ViolationDetectionService.persist_violation(writer, violation, commit=False)
+        # Not committed yet: cached value stays
+        assert cached_total(db) == 1
+        writer.commit()
+        writer.close()
+        assert cached_total(db) == 2
+    
+    def test_rollback_keeps_cache(self, db):
+        """Counter writes that are rolled back do not invalidate"""
+        analytics_cache.invalidate()
+        assert cached_total(db) == 0
+        violation = ViolationDetectionService.create_violation(
+            violation_type=ViolationTypeEnum.HELMET_NOT_WORN,
+            vehicle_number="KA01AB1234",
+            latitude=12.97,
+            longitude=77.59,
+            location_name="MG Road"
+        )
+        ViolationDetectionService.persist_violation(db, violation, commit=False)
+        db.rollback()
+        generation = analytics_cache._generation
+        db.commit()
+        assert analytics_cache._generation == generation
+
+
+class TestChallanPayment:
+    """Test cases for the payment route"""
+    
+    @pytest.fixture
+    def client(self, session_factory):
+        app = FastAPI()
+        app.include_router(challan_router)
+        
+        def override_db():
+            session = session_factory()
+            try:
+                yield session
+            finally:
+                session.close()
+        
+        app.dependency_overrides[get_db] = override_db
+        return TestClient(app)
+    
+    @pytest.fixture
+    def challan(self, db):
+        violation = make_violation(db)
+        challan = EChallanService.create_challan(violation_id=violation.id, violation=violation)
+        challan.penalty_amount = 1000.0
+        return EChallanService.persist_challan(db, challan)
+    
+    def revenue(self, db):
+        return AnalyticsService.get_summary(db, 1)['total_revenue_collected']
+    
+    def test_partial_payments_add_up(self, client, challan, db):
+        """Each payment adds its own amount to the revenue"""
+        first = client.post(f"/api/challan/{challan.id}/payment", params={"amount": 600})
+        second = client.post(f"/api/challan/{challan.id}/payment", params={"amount": 300})
+        assert first.status_code == 200 and second.status_code == 200
+        assert second.json()["amount_applied"] == 300
+        assert second.json()["balance_amount"] == 100
+        assert self.revenue(db) == 900
+    
+    def test_overpayment_applies_balance_only(self, client, challan, db):
+        """Only the outstanding balance is applied; a paid challan rejects more"""
+        response = client.post(f"/api/challan/{challan.id}/payment", params={"amount": 1500})
+        assert response.json()["amount_applied"] == 1000
+        assert response.json()["challan_status"] == "PAID"
+        assert client.post(f"/api/challan/{challan.id}/payment", params={"amount": 10}).status_code == 409
+        assert self.revenue(db) == 1000
+    
+    def test_rejects_non_positive_amount(self, client, challan, db):
+        """Zero and negative payments are refused"""
+        assert client.post(f"/api/challan/{challan.id}/payment", params={"amount": 0}).status_code == 400
+        assert client.post(f"/api/challan/{challan.id}/payment", params={"amount": -50}).status_code == 400
+        assert self.revenue(db) == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,37 @@
+"""
+Unit tests for the analytics TTL cache
+"""
+
+import time
+import pytest
+from backend.app.services.cache import TTLCache
+
+
+class TestTTLCache:
+    """Test cases for TTLCache"""
+    
+    def test_hit_skips_compute(self):
+        """A fresh entry is served without recomputing"""
+        cache = TTLCache(ttl_seconds=60)
+        calls = []
+        assert cache.get_or_compute("k", lambda: calls.append(1) or 1) == 1
+        assert cache.get_or_compute("k", lambda: calls.append(1) or 2) == 1
+        assert len(calls) == 1
+    
+    def test_entries_expire(self):
+        """Expired entries are recomputed"""
+        cache = TTLCache(ttl_seconds=0.01)
+        cache.get_or_compute("k", lambda: 1)
+        time.sleep(0.02)
+        assert cache.get_or_compute("k", lambda: 2) == 2
+    
+    def test_invalidate(self):
+        """Invalidation drops cached entries"""
+        cache = TTLCache(ttl_seconds=60)
+        cache.get_or_compute("k", lambda: 1)
+        cache.invalidate()
+        assert cache.get_or_compute("k", lambda: 2) == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
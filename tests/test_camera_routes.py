@@ -0,0 +1,165 @@
+"""
+Unit tests for the live camera stream endpoints
+"""
+
+import anyio
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.testclient import TestClient
+from backend.app.routes import camera as camera_routes
+
+
+class FakeSession:
+    """Stream session that serves a fixed number of frames, then stops."""
+    
+    def __init__(self, frames, missing=False):
+        self.frames = frames
+        self.missing = missing
+        self.closed = False
+    
+    def next_frame(self, camera_id, after=0, timeout=1.0, width=None, quality=80, *args):
+        if after >= self.frames:
+            return {"sequence": None, "closed": True, "running": False}
+        return {"sequence": after + 1, "jpeg": b"jpeg-%d" % (after + 1), "closed": False, "running": True}
+    
+    def event_version(self, camera_id):
+        if self.missing:
+            from backend.app.services.camera_owner import CameraNotFound
+            raise CameraNotFound(camera_id)
+        return 0
+    
+    def close(self):
+        self.closed = True
+
+
+class FakeBackend:
+    """Camera backend with one running camera."""
+    
+    def __init__(self, frames=2):
+        self.frames = frames
+        self.missing = False
+        self.sessions = []
+        self.started = []
+    
+    def start(self, *args):
+        self.started.append(args)
+        return True
+    
+    def status(self, camera_id):
+        return {"camera_id": camera_id, "status": "running"}
+    
+    def session(self):
+        session = FakeSession(self.frames, self.missing)
+        self.sessions.append(session)
+        return session
+
+
+@pytest.fixture
+def backend(monkeypatch):
+    backend = FakeBackend()
+    monkeypatch.setattr(camera_routes, "_backend", lambda: backend)
+    monkeypatch.setattr(camera_routes, "_viewers", 0)
+    return backend
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(camera_routes.router)
+    return TestClient(app)
+
+
+class TestCameraControl:
+    """Test cases for starting cameras"""
+    
+    def test_start_ignores_caller_sources(self, backend, client):
+        """Only registered cameras start; a caller cannot supply a source URL"""
+        response = client.post("/api/camera/CAM001/start", params={"source": "http://169.254.169.254/"})
+        assert response.status_code == 200
+        assert backend.started == [("CAM001",)]
+
+
+class TestCameraStreams:
+    """Test cases for MJPEG and WebSocket streaming"""
+    
+    def test_mjpeg_streams_frames_and_releases_session(self, backend, client):
+        """Frames are streamed until the camera stops, then the session is closed"""
+        response = client.get("/api/camera/CAM001/stream")
+        assert response.status_code == 200
+        assert b"jpeg-1" in response.content and b"jpeg-2" in response.content
+        assert backend.sessions[0].closed
+        assert camera_routes._viewers == 0
+    
+    def test_viewer_cap(self, backend, client, monkeypatch):
+        """Viewers beyond CAMERA.MAX_VIEWERS are turned away"""
+        monkeypatch.setattr(camera_routes, "_max_viewers", lambda: 1)
+        monkeypatch.setattr(camera_routes, "_viewers", 1)
+        response = client.get("/api/camera/CAM001/stream")
+        assert response.status_code == 503
+        assert backend.sessions == []
+    
+    def test_burst_is_capped_before_streaming(self, backend, monkeypatch):
+        """The slot is taken by the handler, so a burst cannot overshoot the cap"""
+        monkeypatch.setattr(camera_routes, "_max_viewers", lambda: 1)
+        
+        async def burst():
+            first = await camera_routes.camera_stream_by_id("CAM001", width=None, quality=80)
+            with pytest.raises(HTTPException) as rejected:
+                await camera_routes.camera_stream_by_id("CAM001", width=None, quality=80)
+            assert rejected.value.status_code == 503
+            assert camera_routes._viewers == 1
+            
+            # The client goes away before the body is ever sent
+            async def receive():
+                return {"type": "http.disconnect"}
+            
+            async def send(message):
+                pass
+            
+            await first({"type": "http"}, receive, send)
+        
+        anyio.run(burst)
+        assert camera_routes._viewers == 0
+        assert backend.sessions[0].closed
+    
+    def test_websocket_pushes_frames_until_stopped(self, backend, client):
+        """Binary frames carry a sequence prefix; a stopped camera ends the socket"""
+        with client.websocket_connect("/api/camera/CAM001/ws?fps=30") as websocket:
+            first = websocket.receive_bytes()
+            second = websocket.receive_bytes()
+            assert first == (1).to_bytes(4, "big") + b"jpeg-1"
+            assert second[4:] == b"jpeg-2"
+            assert websocket.receive_json()["status"] == "stopped"
+        assert backend.sessions[0].closed
+        assert camera_routes._viewers == 0
+    
+    def test_websocket_viewer_cap(self, backend, client, monkeypatch):
+        """WebSocket viewers beyond the cap are told so and closed"""
+        monkeypatch.setattr(camera_routes, "_max_viewers", lambda: 1)
+        monkeypatch.setattr(camera_routes, "_viewers", 1)
+        with client.websocket_connect("/api/camera/CAM001/ws") as websocket:
+            assert websocket.receive_json()["status"] == "too_many_viewers"
+        assert backend.sessions == []
+
+    
+    def test_websocket_slot_held_while_connected(self, backend, client, monkeypatch):
+        """A connected socket counts against the cap until it closes"""
+        monkeypatch.setattr(camera_routes, "_max_viewers", lambda: 1)
+        backend.frames = 10 ** 6
+        with client.websocket_connect("/api/camera/CAM001/ws?fps=30") as first:
+            first.receive_bytes()
+            with client.websocket_connect("/api/camera/CAM001/ws") as second:
+                assert second.receive_json()["status"] == "too_many_viewers"
+            assert camera_routes._viewers == 1
+    
+    def test_websocket_early_return_releases_slot(self, backend, client):
+        """A socket for an unknown camera gives its slot back"""
+        backend.missing = True
+        with client.websocket_connect("/api/camera/CAM404/ws") as websocket:
+            assert websocket.receive_json()["status"] == "not_found"
+        assert camera_routes._viewers == 0
+        assert backend.sessions[0].closed
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
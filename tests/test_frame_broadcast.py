@@ -0,0 +1,75 @@
+"""
+Unit tests for the encode-once frame broadcaster
+"""
+
+import threading
+import pytest
+from backend.app.services.frame_broadcast import FrameBroadcaster
+
+
+def fake_encoder(frame, width, quality):
+    return f"{frame}@{width}@{quality}".encode()
+
+
+class TestFrameBroadcaster:
+    """Test cases for FrameBroadcaster"""
+    
+    def test_encodes_once_per_frame(self):
+        """Many viewers of one frame share one encode"""
+        broadcaster = FrameBroadcaster(encoder=fake_encoder)
+        broadcaster.publish("f1")
+        results = [broadcaster.wait_for_jpeg(0, timeout=1) for _ in range(10)]
+        assert all(r == (1, b"f1@None@80") for r in results)
+        assert broadcaster.encodes == 1
+    
+    def test_variants_encoded_separately(self):
+        """Each size/quality variant is encoded once"""
+        broadcaster = FrameBroadcaster(encoder=fake_encoder)
+        broadcaster.publish("f1")
+        broadcaster.wait_for_jpeg(0, timeout=1, width=320)
+        broadcaster.wait_for_jpeg(0, timeout=1, width=320)
+        broadcaster.wait_for_jpeg(0, timeout=1)
+        assert broadcaster.encodes == 2
+    
+    def test_slow_viewer_skips_to_latest(self):
+        """A viewer that falls behind gets the newest frame"""
+        broadcaster = FrameBroadcaster(encoder=fake_encoder)
+        for frame in ("f1", "f2", "f3"):
+            broadcaster.publish(frame)
+        sequence, jpeg = broadcaster.wait_for_jpeg(1, timeout=1)
+        assert sequence == 3
+        assert jpeg.startswith(b"f3")
+    
+    def test_wait_times_out_without_new_frame(self):
+        """No newer frame means no result and no encode"""
+        broadcaster = FrameBroadcaster(encoder=fake_encoder)
+        sequence = broadcaster.publish("f1")
+        assert broadcaster.wait_for_jpeg(sequence, timeout=0.01) is None
+        assert broadcaster.encodes == 0
+    
+    def test_waiter_woken_by_publish(self):
+        """Blocked viewers wake when a frame is published"""
+        broadcaster = FrameBroadcaster(encoder=fake_encoder)
+        results = []
+        waiter = threading.Thread(
+            target=lambda: results.append(broadcaster.wait_for_frame(0, timeout=2))
+        )
+        waiter.start()
+        broadcaster.publish("f1")
+        waiter.join(timeout=2)
+        assert results == [(1, "f1")]
+    
+    def test_close_ends_stream(self):
+        """Closing the broadcaster ends viewer streams"""
+        broadcaster = FrameBroadcaster(encoder=fake_encoder)
+        broadcaster.publish("f1")
+        stream = broadcaster.stream(idle_timeout=0.01)
+        assert next(stream)[0] == 1
+        assert broadcaster.viewers == 1
+        broadcaster.close()
+        assert list(stream) == []
+        assert broadcaster.viewers == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
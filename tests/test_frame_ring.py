@@ -0,0 +1,73 @@
+"""
+Unit tests for the frame ring buffer
+"""
+
+import numpy as np
+import pytest
+from backend.app.services.frame_ring import FrameRing
+
+
+def _frame(value):
+    return np.full((4, 6, 3), value, dtype=np.uint8)
+
+
+class TestFrameRing:
+    """Test cases for FrameRing"""
+    
+    def test_empty(self):
+        """An empty ring has no frames"""
+        ring = FrameRing(3)
+        assert ring.latest() is None
+        assert ring.since(0) == []
+        assert ring.stats()["buffered"] == 0
+    
+    def test_latest_is_shared_read_only(self):
+        """Readers share the published frame, which cannot be modified"""
+        ring = FrameRing(2)
+        published = _frame(1)
+        ring.write(published, timestamp=100.0)
+        sequence, timestamp, frame = ring.latest()
+        assert (sequence, timestamp) == (1, 100.0)
+        assert frame is published
+        with pytest.raises(ValueError):
+            frame[0, 0, 0] = 9
+        ring.write(_frame(2))
+        ring.write(_frame(3))
+        assert frame[0, 0, 0] == 1
+        assert ring.stats()["bytes_copied"] == 0
+    
+    def test_wraparound_keeps_newest(self):
+        """Only the last `capacity` frames are kept, oldest first"""
+        ring = FrameRing(3)
+        for value in range(1, 6):
+            ring.write(_frame(value), timestamp=float(value))
+        assert [entry[0] for entry in ring.since(0)] == [3, 4, 5]
+        assert [entry[0] for entry in ring.since(4)] == [5]
+        assert ring.since(4)[0][2][0, 0, 0] == 5
+    
+    def test_copies_are_counted(self):
+        """Writable copies are metered in bytes"""
+        ring = FrameRing(3)
+        ring.write(_frame(1))
+        frame = ring.copy(ring.latest()[2])
+        frame[0, 0, 0] = 9
+        assert ring.latest()[2][0, 0, 0] == 1
+        assert ring.stats()["bytes_copied"] == frame.nbytes
+    
+    def test_time_window(self):
+        """Frames are selected by capture timestamp"""
+        ring = FrameRing(5)
+        for value in range(1, 6):
+            ring.write(_frame(value), timestamp=float(value))
+        assert [entry[0] for entry in ring.window(2.0, 4.0)] == [2, 3, 4]
+    
+    def test_clear(self):
+        """Cleared rings report no frames"""
+        ring = FrameRing(3)
+        ring.write(_frame(1))
+        ring.clear()
+        assert ring.latest() is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,87 @@
+"""
+Unit tests for adaptive frame sampling
+"""
+
+import pytest
+from backend.app.services.frame_skip import FrameSkipController
+
+
+def _controller(**kwargs):
+    defaults = dict(source_fps=30, initial_skip=5, min_skip=1, max_skip=30,
+                    target_utilization=0.8, adjust_every=1)
+    defaults.update(kwargs)
+    return FrameSkipController(**defaults)
+
+
+class TestFrameSkipController:
+    """Test cases for FrameSkipController"""
+    
+    def test_fixed_skip(self):
+        """Equal bounds sample exactly every nth frame"""
+        controller = _controller(initial_skip=5, min_skip=5, max_skip=5)
+        processed = [i for i in range(20) if controller.should_process()]
+        assert processed == [0, 5, 10, 15]
+    
+    def test_slow_inference_raises_skip(self):
+        """Latency above the budget raises skip to what can be sustained"""
+        controller = _controller()
+        controller.record({"helmet": 0.2, "plate": 0.1})
+        # 0.3 s per frame at 30 fps and 80% utilization needs every 12th frame
+        assert controller.skip == 12
+        assert controller.last_reason == "over budget"
+    
+    def test_headroom_recovers_one_step_at_a_time(self):
+        """Fast inference lowers skip gradually down to the minimum"""
+        controller = _controller(initial_skip=4)
+        for _ in range(10):
+            controller.record({"helmet": 0.001})
+        assert controller.skip == 1
+        assert controller.adjustments == 3
+    
+    def test_backlog_backs_off(self):
+        """A pending-work backlog doubles the skip"""
+        controller = _controller(initial_skip=4, queue_depth=lambda: 3, max_queue_depth=2)
+        controller.record({"helmet": 0.001})
+        assert controller.skip == 8
+        assert controller.telemetry()["queue_depth"] == 3
+    
+    def test_normal_queue_load_does_not_back_off(self):
+        """Pending jobs within max_queue_depth leave sampling alone"""
+        controller = _controller(initial_skip=4, queue_depth=lambda: 2, max_queue_depth=2)
+        controller.record({"helmet": 0.001})
+        assert controller.skip == 3
+    
+    def test_zero_depth_disables_backoff(self):
+        """max_queue_depth 0 never polls the queue"""
+        calls = []
+        controller = _controller(initial_skip=4, queue_depth=lambda: calls.append(1) or 50, max_queue_depth=0)
+        controller.record({"helmet": 0.001})
+        assert controller.skip == 3
+        assert calls == []
+    
+    def test_queue_depth_is_cached(self):
+        """The backlog is polled at most once per interval"""
+        calls = []
+        controller = _controller(initial_skip=4, queue_depth=lambda: calls.append(1) or 1, max_queue_depth=2)
+        for _ in range(5):
+            controller.record({"helmet": 0.001})
+        assert len(calls) == 1
+    
+    def test_bounds(self):
+        """Skip never leaves [min_skip, max_skip]"""
+        controller = _controller(max_skip=6)
+        controller.record({"helmet": 2.0})
+        assert controller.skip == 6
+    
+    def test_telemetry(self):
+        """Telemetry reports per-stage latency and the analysed rate"""
+        controller = _controller(initial_skip=3, min_skip=3, max_skip=3)
+        controller.record({"helmet": 0.02, "plate": 0.01}, detections=2)
+        telemetry = controller.telemetry()
+        assert telemetry["stage_ms"] == {"helmet": 20.0, "plate": 10.0}
+        assert telemetry["analysed_fps"] == 10.0
+        assert telemetry["frames_processed"] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
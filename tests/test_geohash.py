@@ -0,0 +1,38 @@
+"""
+Unit tests for geohash spatial indexing utilities
+"""
+
+import pytest
+from backend.app.services import geohash
+
+
+class TestGeohash:
+    """Test cases for geohash encode/decode and cell covers"""
+    
+    def test_encode_known_value(self):
+        """Encoding matches the reference geohash"""
+        assert geohash.encode(57.64911, 10.40744, 11) == "u4pruydqqvj"
+    
+    def test_decode_round_trip(self):
+        """Decoded centre lies within a few meters of the input"""
+        lat, lng = geohash.decode(geohash.encode(28.7041, 77.1025, 9))
+        assert geohash.haversine_m(lat, lng, 28.7041, 77.1025) < 5
+    
+    def test_covering_cells_contain_bbox_points(self):
+        """Every point in the box falls under one of the covering cells"""
+        cells = geohash.covering_cells(28.60, 28.75, 77.00, 77.25, max_cells=32)
+        assert 0 < len(cells) <= 32
+        for lat in (28.60, 28.67, 28.75):
+            for lng in (77.00, 77.12, 77.25):
+                point = geohash.encode(lat, lng, 9)
+                assert any(point.startswith(cell) for cell in cells)
+    
+    def test_prefix_range(self):
+        """Prefix ranges are half-open and carry past 'z'"""
+        assert geohash.prefix_range("tt3") == ("tt3", "tt4")
+        assert geohash.prefix_range("ttz") == ("ttz", "tu")
+        assert geohash.prefix_range("zz") == ("zz", None)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,31 @@
+"""
+Unit tests for heatmap rollup grid snapping
+"""
+
+import pytest
+from backend.app.services.heatmap import HeatmapService
+
+
+class TestHeatmapGrid:
+    """Test cases for HeatmapService.snap_to_grid"""
+    
+    def test_nearby_points_share_cell(self):
+        """Points a few meters apart land in the same cell"""
+        a = HeatmapService.snap_to_grid(28.70410, 77.10250, cell_size_m=100)
+        b = HeatmapService.snap_to_grid(28.70412, 77.10251, cell_size_m=100)
+        assert a == b
+    
+    def test_distant_points_split_cells(self):
+        """Points ~1 km apart land in different cells"""
+        a = HeatmapService.snap_to_grid(28.7041, 77.1025, cell_size_m=100)
+        b = HeatmapService.snap_to_grid(28.7131, 77.1025, cell_size_m=100)
+        assert a != b
+    
+    def test_cell_centre_is_stable(self):
+        """Snapping a cell centre returns the same centre"""
+        centre = HeatmapService.snap_to_grid(19.0760, 72.8777, cell_size_m=100)
+        assert HeatmapService.snap_to_grid(*centre, cell_size_m=100) == centre
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
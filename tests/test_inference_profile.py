@@ -0,0 +1,46 @@
+"""
+Unit tests for per-camera inference profiles
+"""
+
+import pytest
+from backend.app.services.inference_profile import parse_profile, run_grouped
+
+
+class TestInferenceProfile:
+    """Test cases for profile parsing and grouped batches"""
+    
+    def test_parse_json_profile(self):
+        """Settings are typed per stage; missing stages are empty"""
+        profile = parse_profile('{"helmet": {"imgsz": "416", "iou": 0.5}}')
+        assert profile == {"helmet": {"imgsz": 416, "iou": 0.5}, "plate": {}}
+        assert parse_profile(None) == {"helmet": {}, "plate": {}}
+    
+    def test_unknown_settings_rejected(self):
+        """Typos in a profile fail loudly instead of being ignored"""
+        with pytest.raises(ValueError):
+            parse_profile({"helmet": {"img_size": 416}})
+        with pytest.raises(ValueError):
+            parse_profile({"vehicle": {"imgsz": 416}})
+    
+    def test_run_grouped_splits_by_options(self):
+        """One call per distinct option set, results in input order"""
+        calls = []
+        
+        def batch(items, **options):
+            calls.append((list(items), options))
+            return [f"{item}@{options.get('imgsz', 'default')}" for item in items]
+        
+        results = run_grouped(batch, ["a", "b", "c"], [{"imgsz": 320}, {}, {"imgsz": 320}])
+        assert results == ["a@320", "b@default", "c@320"]
+        assert len(calls) == 2
+    
+    def test_run_grouped_without_options(self):
+        """Without options the whole batch is one call"""
+        calls = []
+        results = run_grouped(lambda items: calls.append(items) or items, [1, 2])
+        assert results == [1, 2]
+        assert calls == [[1, 2]]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
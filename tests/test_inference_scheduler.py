@@ -0,0 +1,170 @@
+"""
+Unit tests for the cross-camera inference scheduler
+"""
+
+import time
+
+import numpy as np
+import pytest
+from backend.app.services import camera_service
+from backend.app.services.inference_scheduler import RATE_WINDOW, FairInferenceScheduler
+
+
+class _Recorder:
+    """Inference stub returning each frame's label and remembering batches."""
+    
+    def __init__(self):
+        self.batches = []
+    
+    def __call__(self, frames, camera_ids):
+        self.batches.append(list(frames))
+        return [f"result-{frame}" for frame in frames]
+
+
+def _scheduler(infer=None, **kwargs):
+    defaults = dict(batch_size=1, batch_wait=0.0, deadline=10.0, default_weight=1, autostart=False)
+    defaults.update(kwargs)
+    return FairInferenceScheduler(infer or _Recorder(), **defaults)
+
+
+def _served(scheduler, camera_weights, rounds):
+    """Keep every camera backlogged and count which camera each slot goes to."""
+    served = {camera_id: 0 for camera_id in camera_weights}
+    
+    def on_result(camera_id):
+        return lambda sequence, frame, result: served.__setitem__(camera_id, served[camera_id] + 1)
+    
+    for i in range(rounds):
+        for camera_id, weight in camera_weights.items():
+            scheduler.submit(camera_id, i, camera_id, on_result(camera_id), weight=weight)
+        scheduler.run_once(timeout=0)
+    return served
+
+
+class TestFairInferenceScheduler:
+    """Test cases for FairInferenceScheduler"""
+    
+    def test_equal_weights_share_equally(self):
+        """Backlogged cameras with equal weight get equal slots"""
+        served = _served(_scheduler(), {"cam1": 1, "cam2": 1}, 100)
+        assert abs(served["cam1"] - served["cam2"]) <= 1
+    
+    def test_slots_follow_weights(self):
+        """A camera with three times the weight is served three times as often"""
+        served = _served(_scheduler(), {"junction": 3, "quiet": 1}, 400)
+        assert served["junction"] == pytest.approx(300, abs=2)
+        assert served["quiet"] == pytest.approx(100, abs=2)
+    
+    def test_idle_camera_does_not_bank_credit(self):
+        """A camera returning from idle does not monopolize slots"""
+        scheduler = _scheduler()
+        _served(scheduler, {"busy": 1}, 50)
+        served = _served(scheduler, {"busy": 1, "returning": 1}, 20)
+        assert served["busy"] >= 9
+    
+    def test_newer_frame_supersedes_waiting_one(self):
+        """Only the newest frame of a camera is analysed"""
+        infer = _Recorder()
+        scheduler = _scheduler(infer)
+        results = []
+        for sequence in (1, 2, 3):
+            scheduler.submit("cam1", sequence, f"frame{sequence}", lambda *args: results.append(args))
+        
+        assert scheduler.run_once(timeout=0) == 1
+        assert results == [(3, "frame3", "result-frame3")]
+        stats = scheduler.camera_stats("cam1")
+        assert stats["served"] == 1
+        assert stats["dropped_superseded"] == 2
+    
+    def test_batches_span_cameras(self):
+        """One inference call analyses frames from several cameras"""
+        infer = _Recorder()
+        scheduler = _scheduler(infer, batch_size=4)
+        for camera_id in ("cam1", "cam2", "cam3"):
+            scheduler.submit(camera_id, 1, camera_id, lambda *args: None)
+        
+        assert scheduler.run_once(timeout=0) == 3
+        assert sorted(infer.batches[0]) == ["cam1", "cam2", "cam3"]
+        assert scheduler.stats()["avg_batch"] == 3.0
+    
+    def test_expired_frames_are_dropped(self):
+        """Frames past their deadline are never analysed"""
+        infer = _Recorder()
+        scheduler = _scheduler(infer, deadline=0.5)
+        scheduler.submit("cam1", 1, "stale", lambda *args: None, captured_at=time.monotonic() - 1.0)
+        scheduler.submit("cam2", 1, "fresh", lambda *args: None)
+        
+        scheduler.run_once(timeout=0)
+        assert infer.batches == [["fresh"]]
+        assert scheduler.camera_stats("cam1")["dropped_expired"] == 1
+        assert scheduler.camera_stats("cam2")["served"] == 1
+    
+    def test_failed_batch_is_counted(self):
+        """Inference errors are counted and do not reach callbacks"""
+        def fail(frames, camera_ids):
+            raise RuntimeError("model error")
+        
+        results = []
+        scheduler = _scheduler(fail)
+        scheduler.submit("cam1", 1, "frame", lambda *args: results.append(args))
+        assert scheduler.run_once(timeout=0) == 0
+        assert results == []
+        assert scheduler.camera_stats("cam1")["failed"] == 1
+    
+    def test_serve_times_stay_bounded(self):
+        """Serve times outside the rate window are dropped as frames are served"""
+        scheduler = _scheduler()
+        scheduler.submit("cam1", 1, "a", lambda *args: None)
+        scheduler.run_once(timeout=0)
+        queue = scheduler.cameras["cam1"]
+        queue.served_at[0] -= RATE_WINDOW + 1
+        
+        scheduler.submit("cam1", 2, "b", lambda *args: None)
+        scheduler.run_once(timeout=0)
+        assert len(queue.served_at) == 1
+    
+    def test_invalid_weight(self):
+        """Weights must be positive"""
+        with pytest.raises(ValueError):
+            _scheduler().set_weight("cam1", 0)
+    
+    def test_worker_serves_submissions(self):
+        """The worker thread starts on demand and delivers results"""
+        scheduler = _scheduler(autostart=True)
+        results = []
+        scheduler.submit("cam1", 7, "frame", lambda *args: results.append(args))
+        deadline = time.monotonic() + 2.0
+        while not results and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert results == [(7, "frame", "result-frame")]
+        assert scheduler.camera_stats("cam1")["served_fps"] > 0
+
+    
+    def test_live_frames_keep_their_capture_time(self, monkeypatch):
+        """Frames submitted by a camera's annotator age from capture, not submission"""
+        camera = camera_service.CameraCapture(camera_index="rtsp://10.0.0.5/stream", camera_id="CAM001")
+        frame = np.zeros((4, 4, 3), dtype=np.uint8)
+        camera.ring.write(frame, time.time() - 5.0)
+        camera.broadcaster.publish(frame)
+        camera.is_running = True
+        
+        scheduler = _scheduler(deadline=1.0)
+        submitted = []
+        original_submit = scheduler.submit
+        
+        def submit(*args, **kwargs):
+            submitted.append(kwargs["captured_at"])
+            original_submit(*args, **kwargs)
+            camera.is_running = False
+        
+        monkeypatch.setattr(scheduler, "submit", submit, raising=False)
+        monkeypatch.setattr(camera_service, "get_inference_scheduler", lambda: scheduler)
+        camera.annotator.subscribers = 1
+        camera.annotator._run()
+        
+        assert time.monotonic() - submitted[0] == pytest.approx(5.0, abs=0.5)
+        assert scheduler.run_once(timeout=0) == 0
+        assert scheduler.camera_stats("CAM001")["dropped_expired"] == 1
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,208 @@
+"""
+Unit tests for the durable processing queue and worker leases (SQLite)
+"""
+
+import pytest
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from backend.app.models.database import Base, ProcessingQueue, Violation, ViolationTypeEnum
+from backend.app.services import processing_worker
+from backend.app.services.complete_pipeline import CompletePipeline
+from backend.app.services.job_queue import COMPLETED, FAILED, PENDING, PROCESSING, JobQueue
+from backend.app.services.violation_detection import ViolationDetectionService
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'queue.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    yield sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    engine.dispose()
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+def make_violation():
+    return ViolationDetectionService.create_violation(
+        violation_type=ViolationTypeEnum.HELMET_NOT_WORN,
+        vehicle_number="KA01AB1234",
+        latitude=12.97,
+        longitude=77.59,
+        location_name="MG Road"
+    )
+
+
+class TestJobQueue:
+    """Test cases for JobQueue"""
+    
+    def test_claim_order_and_exclusivity(self, db):
+        """Higher priority first; a claimed job is never handed out again"""
+        low = JobQueue.enqueue(db, "low.mp4", priority=0)
+        high = JobQueue.enqueue(db, "high.mp4", priority=5)
+        
+        first = JobQueue.claim(db, "w1")
+        second = JobQueue.claim(db, "w2")
+        assert (first.id, second.id) == (high.id, low.id)
+        assert first.status == PROCESSING and first.worker_id == "w1"
+        assert first.attempts == 1
+        assert JobQueue.claim(db, "w3") is None
+    
+    def test_heartbeat_only_for_holder(self, db):
+        """Only the worker holding the lease can renew it"""
+        job = JobQueue.enqueue(db, "a.mp4")
+        JobQueue.claim(db, "w1")
+        assert JobQueue.heartbeat(db, job.id, "w1")
+        assert not JobQueue.heartbeat(db, job.id, "w2")
+    
+    def test_fail_backs_off_then_fails(self, db):
+        """A failed attempt waits out its backoff; the last attempt marks FAILED"""
+        job = JobQueue.enqueue(db, "a.mp4", max_attempts=2)
+        JobQueue.claim(db, "w1")
+        assert JobQueue.fail(db, job.id, "w1", "boom") == PENDING
+        db.refresh(job)
+        assert job.available_at > datetime.utcnow()
+        assert job.worker_id is None
+        assert JobQueue.claim(db, "w1") is None
+        
+        job.available_at = datetime.utcnow() - timedelta(seconds=1)
+        db.commit()
+        assert JobQueue.claim(db, "w2").id == job.id
+        assert JobQueue.fail(db, job.id, "w2", "boom again") == FAILED
+        assert JobQueue.fail(db, job.id, "w2", "late") is None
+    
+    def test_requeue_stale(self, db):
+        """Jobs without a recent heartbeat are released, and the old holder loses them"""
+        job = JobQueue.enqueue(db, "a.mp4")
+        JobQueue.claim(db, "w1")
+        job.heartbeat_at = datetime.utcnow() - timedelta(seconds=120)
+        db.commit()
+        
+        assert JobQueue.requeue_stale(db, stale_after_seconds=60) == 1
+        db.refresh(job)
+        assert job.status == PENDING and job.worker_id is None
+        assert not JobQueue.heartbeat(db, job.id, "w1")
+        assert JobQueue.claim(db, "w2").id == job.id
+    
+    def test_complete_commits_staged_writes(self, db):
+        """Violations staged before complete() are saved with it"""
+        job = JobQueue.enqueue(db, "a.mp4")
+        JobQueue.claim(db, "w1")
+        ViolationDetectionService.persist_violation(db, make_violation(), commit=False)
+        
+        assert JobQueue.complete(db, job.id, "w1", {'total_violations': 1})
+        db.refresh(job)
+        assert job.status == COMPLETED
+        assert db.query(Violation).count() == 1
+    
+    def test_complete_after_lost_lease_discards_writes(self, db):
+        """A worker that lost its lease cannot complete the job or save its output"""
+        job = JobQueue.enqueue(db, "a.mp4")
+        JobQueue.claim(db, "w1")
+        job.heartbeat_at = datetime.utcnow() - timedelta(seconds=120)
+        db.commit()
+        JobQueue.requeue_stale(db, stale_after_seconds=60)
+        
+        ViolationDetectionService.persist_violation(db, make_violation(), commit=False)
+        assert not JobQueue.complete(db, job.id, "w1", {'total_violations': 1})
+        assert db.query(Violation).count() == 0
+        db.refresh(job)
+        assert job.status == PENDING
+
+
+class FakePipeline:
+    """Pipeline stand-in that reports one violation per video"""
+    
+    store_violations = CompletePipeline.store_violations
+    
+    def __init__(self, session_factory, on_video=None):
+        self.db = session_factory()
+        self.auto_issue_challan = False
+        self.on_video = on_video
+    
+    def process_video(self, video_path, stop_event=None, persist=True, **kwargs):
+        if self.on_video:
+            self.on_video(stop_event)
+        return {
+            'total_frames': 10,
+            'total_violations': 1,
+            'stopped': bool(stop_event and stop_event.is_set()),
+            'violations': [make_violation()]
+        }
+
+
+class TestProcessingWorker:
+    """Test cases for ProcessingWorker leases and retries"""
+    
+    @pytest.fixture
+    def worker_env(self, session_factory, monkeypatch, tmp_path):
+        monkeypatch.setattr(processing_worker, "SessionLocal", session_factory)
+        video = tmp_path / "clip.mp4"
+        video.write_bytes(b"")
+        return session_factory, str(video)
+    
+    def make_worker(self, session_factory, on_video=None):
+        return processing_worker.ProcessingWorker(
+            worker_id="w1",
+            stop_event=threading.Event(),
+            pipeline_factory=lambda: FakePipeline(session_factory, on_video),
+            heartbeat_interval=0.05
+        )
+    
+    def test_retry_stores_violations_once(self, worker_env):
+        """A failed attempt writes nothing, so the retry does not duplicate rows"""
+        session_factory, video = worker_env
+        db = session_factory()
+        job = JobQueue.enqueue(db, video)
+        calls = []
+        
+        def fail_first(stop_event):
+            calls.append(1)
+            if len(calls) == 1:
+                raise RuntimeError("decoder crashed")
+        
+        worker = self.make_worker(session_factory, fail_first)
+        assert worker.run_once()
+        db.refresh(job)
+        assert job.status == PENDING
+        job.available_at = datetime.utcnow() - timedelta(seconds=1)
+        db.commit()
+        
+        assert worker.run_once()
+        db.refresh(job)
+        assert job.status == COMPLETED
+        assert db.query(Violation).count() == 1
+        db.close()
+    
+    def test_lost_lease_stops_job_without_writes(self, worker_env):
+        """When another worker takes the job, the original stops and saves nothing"""
+        session_factory, video = worker_env
+        db = session_factory()
+        job = JobQueue.enqueue(db, video)
+        
+        def reclaimed(stop_event):
+            other = session_factory()
+            other.query(ProcessingQueue).filter(ProcessingQueue.id == job.id).update(
+                {ProcessingQueue.worker_id: "w2"}, synchronize_session=False
+            )
+            other.commit()
+            other.close()
+            assert stop_event.wait(2.0)
+        
+        worker = self.make_worker(session_factory, reclaimed)
+        assert worker.run_once()
+        db.refresh(job)
+        assert job.worker_id == "w2" and job.status == PROCESSING
+        assert db.query(Violation).count() == 0
+        assert worker.jobs_completed == 0
+        db.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,137 @@
+"""
+Unit tests for the video job upload, polling and progress stream endpoints
+"""
+
+import pytest
+import threading
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from backend.app.database import database
+from backend.app.models.database import Base, ProcessingQueue
+from backend.app.routes import jobs as jobs_routes
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    monkeypatch.setattr(database, "SessionLocal", factory)
+    yield factory
+    engine.dispose()
+
+
+@pytest.fixture
+def upload_dir(tmp_path, monkeypatch):
+    directory = tmp_path / "uploads"
+    settings = {
+        "STORAGE.UPLOAD_DIR": str(directory),
+        "STORAGE.MAX_VIDEO_SIZE": 4096,
+        "WORKER.PROGRESS_INTERVAL": 0.05
+    }
+    monkeypatch.setattr(jobs_routes, "get_setting", lambda key, default=None: settings.get(key, default))
+    return directory
+
+
+@pytest.fixture
+def client(session_factory, upload_dir):
+    app = FastAPI()
+    app.include_router(jobs_routes.router)
+    return TestClient(app)
+
+
+def set_status(session_factory, job_id, status):
+    db = session_factory()
+    db.query(ProcessingQueue).filter(ProcessingQueue.id == job_id).update({ProcessingQueue.status: status})
+    db.commit()
+    db.close()
+
+
+class TestVideoUpload:
+    """Test cases for POST /api/jobs/video"""
+    
+    def test_raw_upload_is_queued_and_polled(self, client, upload_dir):
+        """A raw body is saved under its file name's suffix and can be polled"""
+        response = client.post(
+            "/api/jobs/video",
+            params={"filename": "clip.avi", "camera_id": "CAM001"},
+            content=b"x" * 1000,
+            headers={"content-type": "application/octet-stream"}
+        )
+        assert response.status_code == 200
+        body = response.json()
+        assert body["bytes_received"] == 1000
+        
+        job = client.get(body["status_url"]).json()["job"]
+        assert job["status"] == "PENDING"
+        assert job["camera_id"] == "CAM001"
+        assert [path.suffix for path in upload_dir.iterdir()] == [".avi"]
+        assert client.get("/api/jobs/999").status_code == 404
+    
+    def test_multipart_upload_is_streamed(self, client, upload_dir):
+        """The file field is written once, with no partial file left behind"""
+        response = client.post(
+            "/api/jobs/video",
+            files={"file": ("clip.mkv", b"v" * 3000, "video/x-matroska")},
+            data={"note": "ignored"}
+        )
+        assert response.status_code == 200
+        assert response.json()["bytes_received"] == 3000
+        saved = list(upload_dir.iterdir())
+        assert len(saved) == 1 and saved[0].suffix == ".mkv"
+        assert saved[0].read_bytes() == b"v" * 3000
+    
+    def test_multipart_over_limit_is_rejected(self, client, upload_dir):
+        """An oversized multipart body is refused without being kept"""
+        response = client.post("/api/jobs/video", files={"file": ("clip.mp4", b"v" * 5000, "video/mp4")})
+        assert response.status_code == 413
+        assert list(upload_dir.iterdir()) == []
+    
+    def test_multipart_missing_field(self, client):
+        """A form without a file field is a bad request"""
+        response = client.post("/api/jobs/video", files={"video": ("clip.mp4", b"v" * 10, "video/mp4")})
+        assert response.status_code == 400
+        assert "file" in response.json()["detail"]
+    
+    def test_unsupported_type(self, client, upload_dir):
+        """Only video extensions are accepted"""
+        response = client.post("/api/jobs/video", files={"file": ("notes.txt", b"hello", "text/plain")})
+        assert response.status_code == 400
+        assert list(upload_dir.iterdir()) == []
+
+
+class TestJobEvents:
+    """Test cases for the server-sent progress stream"""
+    
+    def submit(self, client):
+        response = client.post(
+            "/api/jobs/video",
+            params={"filename": "clip.mp4"},
+            content=b"x" * 100,
+            headers={"content-type": "application/octet-stream"}
+        )
+        return response.json()["job_id"]
+    
+    def test_stream_ends_with_done(self, client, session_factory):
+        """Progress events are sent until the job reaches a terminal status"""
+        job_id = self.submit(client)
+        timer = threading.Timer(0.2, set_status, (session_factory, job_id, "COMPLETED"))
+        timer.start()
+        try:
+            response = client.get(f"/api/jobs/{job_id}/events")
+        finally:
+            timer.join()
+        assert response.status_code == 200
+        events = [line for line in response.text.splitlines() if line.startswith("event:")]
+        assert events[0] == "event: progress"
+        assert events[-1] == "event: done"
+    
+    def test_unknown_job(self, client):
+        """Streaming a missing job is a 404"""
+        assert client.get("/api/jobs/999/events").status_code == 404
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,71 @@
+"""
+Unit tests for the live frame reader
+"""
+
+import time
+import pytest
+from backend.app.services.live_reader import LatencyStats, LatestFrameReader
+
+
+class FakeCapture:
+    """Produces numbered frames at a fixed rate, then ends"""
+    
+    def __init__(self, frames, interval=0.005):
+        self.remaining = frames
+        self.interval = interval
+        self.produced = 0
+    
+    def read(self):
+        time.sleep(self.interval)
+        if self.remaining == 0:
+            return False, None
+        self.remaining -= 1
+        self.produced += 1
+        return True, self.produced
+
+
+class TestLatestFrameReader:
+    """Test cases for LatestFrameReader"""
+    
+    def test_slow_consumer_gets_newest_frame(self):
+        """Frames produced while the consumer is busy are skipped"""
+        reader = LatestFrameReader(FakeCapture(frames=1000)).start()
+        sequence, captured_at, frame = reader.latest(0, timeout=1.0)
+        time.sleep(0.1)
+        newer = reader.latest(sequence, timeout=1.0)
+        reader.stop()
+        assert newer[0] > sequence + 1
+        assert newer[2] == newer[0]
+        assert newer[1] >= captured_at
+    
+    def test_end_of_stream(self):
+        """latest() returns None once the source ends and is drained"""
+        reader = LatestFrameReader(FakeCapture(frames=3)).start()
+        time.sleep(0.1)
+        sequence = reader.latest(0, timeout=1.0)[0]
+        assert sequence == 3
+        assert reader.latest(sequence, timeout=1.0) is None
+        assert reader.ended
+        reader.stop()
+
+
+class TestLatencyStats:
+    """Test cases for LatencyStats"""
+    
+    def test_summary(self):
+        """Percentiles are reported in milliseconds"""
+        stats = LatencyStats()
+        for ms in range(1, 101):
+            stats.add(ms / 1000)
+        summary = stats.summary()
+        assert summary["max_ms"] == 100.0
+        assert summary["p50_ms"] == 51.0
+        assert summary["p95_ms"] == 96.0
+    
+    def test_empty(self):
+        """No decisions yields zeros"""
+        assert LatencyStats().summary()["avg_ms"] == 0.0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
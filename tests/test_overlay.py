@@ -0,0 +1,93 @@
+"""
+Unit tests for overlay metadata
+"""
+
+import pytest
+from backend.app.services.camera_service import CameraCapture
+from backend.app.services.overlay import ObjectTracker, detection_metadata
+
+
+def helmets(*boxes):
+    return {'helmets': [], 'no_helmets': [
+        {'bbox': box, 'confidence': 0.8, 'class_name': 'no_helmet', 'track_id': None} for box in boxes
+    ]}
+
+
+class TestDetectionMetadata:
+    """Test cases for detection_metadata"""
+    
+    def test_objects_and_violations(self):
+        """Helmet detections become compact objects"""
+        helmet_detections = {
+            'helmets': [{'bbox': (1, 2, 3, 4), 'confidence': 0.91234, 'class_name': 'helmet', 'track_id': None}],
+            'no_helmets': [{'bbox': (5, 6, 7, 8), 'confidence': 0.8, 'class_name': 'no_helmet', 'track_id': 7}]
+        }
+        metadata = detection_metadata((720, 1280, 3), helmet_detections)
+        assert metadata['frame'] == [1280, 720]
+        assert metadata['objects'][0] == {'box': [1, 2, 3, 4], 'cls': 'helmet', 'conf': 0.912}
+        assert metadata['objects'][1]['track'] == 7
+        assert metadata['violations'] == 1
+        assert metadata['plates'] == []
+    
+    def test_plate_text_matched_by_index(self):
+        """OCR text is attached to the plate crop it came from"""
+        plate_results = {
+            'detections': {'plates': [
+                {'bbox': (10, 10, 50, 30), 'confidence': 0.7},
+                {'bbox': (60, 10, 90, 30), 'confidence': 0.6}
+            ]},
+            'ocr': {'plates': [
+                {'cleaned_text': 'DL01AB1234', 'is_valid_indian_plate': True},
+                {'cleaned_text': '', 'is_valid_indian_plate': False}
+            ]}
+        }
+        metadata = detection_metadata((720, 1280, 3), plate_results=plate_results)
+        assert metadata['plates'][0]['text'] == 'DL01AB1234'
+        assert metadata['plates'][0]['valid'] is True
+        assert 'text' not in metadata['plates'][1]
+    
+    def test_no_detections(self):
+        """Missing inputs give an empty overlay"""
+        metadata = detection_metadata((480, 640))
+        assert metadata == {'frame': [640, 480], 'objects': [], 'plates': [], 'violations': 0}
+
+
+
+class TestObjectTracker:
+    """Test cases for ObjectTracker"""
+    
+    def test_ids_follow_moving_objects(self):
+        """Overlapping boxes keep their id; new objects get new ones"""
+        tracker = ObjectTracker()
+        first = tracker.update(detection_metadata((720, 1280), helmets((0, 0, 100, 100), (500, 500, 600, 600)))['objects'])
+        second = tracker.update(detection_metadata((720, 1280), helmets((510, 505, 610, 605), (10, 5, 110, 105), (900, 0, 950, 50)))['objects'])
+        assert [obj['track'] for obj in first] == [1, 2]
+        assert [obj['track'] for obj in second] == [2, 1, 3]
+    
+    def test_lost_tracks_expire(self):
+        """A track unseen for more than max_missed frames is not revived"""
+        tracker = ObjectTracker(max_missed=1)
+        tracker.update(detection_metadata((720, 1280), helmets((0, 0, 100, 100)))['objects'])
+        tracker.update([])
+        tracker.update([])
+        objects = tracker.update(detection_metadata((720, 1280), helmets((0, 0, 100, 100)))['objects'])
+        assert objects[0]['track'] == 2
+    
+    def test_detector_ids_are_kept(self):
+        """Ids from a tracking detector pass through unchanged"""
+        tracker = ObjectTracker()
+        objects = tracker.update([{'box': [0, 0, 10, 10], 'cls': 'helmet', 'conf': 0.9, 'track': 42}])
+        assert objects[0]['track'] == 42
+    
+    def test_live_overlay_carries_track_ids(self):
+        """Overlays published to viewers include track ids"""
+        camera = CameraCapture(camera_index="rtsp://10.0.0.5/stream", camera_id="CAM001")
+        camera.annotator._publish(1, None, detection_metadata((720, 1280), helmets((0, 0, 100, 100))))
+        assert camera.broadcaster.overlay['objects'][0]['track'] == 1
+        camera.annotator._publish(2, None, detection_metadata((720, 1280), helmets((5, 0, 105, 100))))
+        assert camera.broadcaster.overlay['sequence'] == 2
+        assert camera.broadcaster.overlay['objects'][0]['track'] == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
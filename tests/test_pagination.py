@@ -0,0 +1,30 @@
+"""
+Unit tests for keyset pagination cursors
+"""
+
+import pytest
+from datetime import datetime
+from backend.app.services.pagination import encode_cursor, decode_cursor
+
+
+class TestPaginationCursor:
+    """Test cases for cursor encoding"""
+    
+    def test_round_trip(self):
+        """Decoding returns the encoded sort key"""
+        ts = datetime(2024, 1, 15, 10, 30, 0, 123456)
+        assert decode_cursor(encode_cursor(ts, 42)) == (ts, 42)
+    
+    def test_cursor_is_url_safe(self):
+        """Cursors can be passed as query parameters unescaped"""
+        cursor = encode_cursor(datetime(2024, 1, 15, 10, 30), 7)
+        assert all(c.isalnum() or c in "-_" for c in cursor)
+    
+    def test_invalid_cursor(self):
+        """Malformed cursors raise ValueError"""
+        with pytest.raises(ValueError):
+            decode_cursor("not-a-cursor")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
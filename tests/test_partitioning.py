@@ -0,0 +1,111 @@
+"""
+Unit tests for monthly partition naming, date math and challan archival
+"""
+
+import gzip
+import json
+import pytest
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from backend.app.database.archive import archive_closed_challans
+from backend.app.database.partitioning import add_months, month_start, partition_name
+from backend.app.models.database import Base, Challan, ChallanStatusEnum, Violation, ViolationTypeEnum
+from backend.app.services.echallan import EChallanService
+
+
+class TestPartitioning:
+    """Test cases for partition helpers"""
+    
+    def test_month_start(self):
+        """Any instant maps to the first of its month"""
+        assert month_start(datetime(2025, 3, 17, 13, 45)) == datetime(2025, 3, 1)
+    
+    def test_add_months_crosses_year(self):
+        """Month arithmetic rolls over year boundaries both ways"""
+        assert add_months(datetime(2025, 11, 1), 3) == datetime(2026, 2, 1)
+        assert add_months(datetime(2025, 1, 1), -1) == datetime(2024, 12, 1)
+    
+    def test_partition_name(self):
+        """Partition names sort chronologically"""
+        assert partition_name("violations", datetime(2025, 1, 1)) == "violations_y2025m01"
+    
+    def test_challan_numbers_are_unique(self):
+        """Challan numbers stay unique without a unique index on the partitioned table"""
+        numbers = {EChallanService.generate_challan_number() for _ in range(10000)}
+        assert len(numbers) == 10000
+        assert all(len(number) <= 50 and number.startswith("ECH-") for number in numbers)
+
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'archive.db'}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def add_challan(db, status, issued):
+    violation = Violation(violation_type=ViolationTypeEnum.HELMET_NOT_WORN, vehicle_number="KA01AB1234", timestamp=issued)
+    db.add(violation)
+    db.flush()
+    challan = Challan(
+        challan_number=EChallanService.generate_challan_number(),
+        status=status,
+        violation_id=violation.id,
+        penalty_amount=500.0,
+        issued_date=issued
+    )
+    db.add(challan)
+    db.commit()
+    return challan.id, violation.id
+
+
+def read_archive(path):
+    with gzip.open(path, "rt") as f:
+        return [json.loads(line) for line in f]
+
+
+class TestArchive:
+    """Test cases for archive_closed_challans"""
+    
+    def test_archives_only_closed_old_challans(self, db, tmp_path):
+        """Closed challans past retention move to gzip files; everything else stays"""
+        now = datetime.utcnow()
+        jan = datetime(now.year - 2, 1, 15)
+        feb = datetime(now.year - 2, 2, 10)
+        paid_jan = add_challan(db, ChallanStatusEnum.PAID, jan)
+        cancelled_feb = add_challan(db, ChallanStatusEnum.CANCELLED, feb)
+        paid_feb = add_challan(db, ChallanStatusEnum.PAID, feb)
+        open_old = add_challan(db, ChallanStatusEnum.ISSUED, jan)
+        paid_recent = add_challan(db, ChallanStatusEnum.PAID, now - timedelta(days=10))
+        archive_dir = tmp_path / "archive"
+        
+        stats = archive_closed_challans(db, older_than_days=365, archive_dir=str(archive_dir), batch_size=2)
+        assert stats == {'challans': 3, 'violations': 3}
+        
+        remaining = {c.id for c in db.query(Challan).all()}
+        assert remaining == {open_old[0], paid_recent[0]}
+        assert {v.id for v in db.query(Violation).all()} == {open_old[1], paid_recent[1]}
+        
+        jan_rows = read_archive(archive_dir / "challans" / jan.strftime("%Y-%m.jsonl.gz"))
+        feb_rows = read_archive(archive_dir / "challans" / feb.strftime("%Y-%m.jsonl.gz"))
+        assert [row['id'] for row in jan_rows] == [paid_jan[0]]
+        assert sorted(row['id'] for row in feb_rows) == sorted([cancelled_feb[0], paid_feb[0]])
+        assert jan_rows[0]['status'] == "PAID" and jan_rows[0]['penalty_amount'] == 500.0
+        assert jan_rows[0]['issued_date'] == jan.isoformat()
+        violation_rows = read_archive(archive_dir / "violations" / feb.strftime("%Y-%m.jsonl.gz"))
+        assert sorted(row['id'] for row in violation_rows) == sorted([cancelled_feb[1], paid_feb[1]])
+        
+        files = sorted(archive_dir.rglob("*.jsonl.gz"))
+        sizes = [path.stat().st_size for path in files]
+        assert archive_closed_challans(db, older_than_days=365, archive_dir=str(archive_dir)) == {'challans': 0, 'violations': 0}
+        assert [path.stat().st_size for path in sorted(archive_dir.rglob("*.jsonl.gz"))] == sizes
+        assert {c.id for c in db.query(Challan).all()} == remaining
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
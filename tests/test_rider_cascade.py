@@ -0,0 +1,39 @@
+"""
+Unit tests for the rider cascade geometry
+"""
+
+import pytest
+from backend.app.services.rider_cascade import head_region, match_riders
+
+
+class TestRiderCascade:
+    """Test cases for rider matching and head crops"""
+    
+    def test_persons_on_two_wheelers_are_riders(self):
+        """Only persons overlapping a two-wheeler are kept"""
+        rider = {'bbox': (100, 50, 160, 250)}
+        pedestrian = {'bbox': (400, 50, 460, 250)}
+        motorcycle = {'bbox': (80, 150, 190, 300)}
+        assert match_riders([rider, pedestrian], [motorcycle]) == [rider]
+    
+    def test_without_vehicle_classes_every_person_rides(self):
+        """A detector trained on riders needs no vehicle matching"""
+        persons = [{'bbox': (0, 0, 10, 30)}, {'bbox': (50, 0, 60, 30)}]
+        assert match_riders(persons, None) == persons
+    
+    def test_head_region_is_top_of_rider(self):
+        """The head crop sits at the top of the rider box, centred and padded"""
+        x1, y1, x2, y2 = head_region((100, 100, 200, 400), (1080, 1920, 3), ratio=0.3, pad=0.1)
+        assert y1 < 100 < y2 <= 100 + 90 * 1.3
+        assert x1 < 150 < x2
+        assert x2 - x1 <= 100 * 1.1 + 1
+    
+    def test_head_region_clipped_to_frame(self):
+        """Riders at the frame edge give crops inside the frame"""
+        x1, y1, x2, y2 = head_region((0, 0, 20, 100), (50, 50, 3))
+        assert (x1, y1) == (0, 0)
+        assert x2 <= 50 and y2 <= 50
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
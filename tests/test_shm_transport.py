@@ -0,0 +1,141 @@
+"""
+Unit tests for the shared-memory frame transport
+"""
+
+import multiprocessing
+import os
+import threading
+import numpy as np
+import pytest
+from backend.app.services.shm_transport import NO_PINS, SLOT_WRITING, SharedFrameRing
+
+
+@pytest.fixture
+def ring():
+    ring = SharedFrameRing.create(slots=3, slot_bytes=4 * 6 * 3)
+    yield ring
+    ring.close()
+
+
+def _frame(value):
+    return np.full((4, 6, 3), value, dtype=np.uint8)
+
+
+def _pin_and_crash(handle, camera_id):
+    """Reader that exits without releasing its pin."""
+    ring = SharedFrameRing.attach(handle)
+    ring.latest(camera_id)
+    os._exit(0)
+
+
+def _dead_pid(handle, camera_id):
+    process = multiprocessing.get_context("fork").Process(target=_pin_and_crash, args=(handle, camera_id))
+    process.start()
+    process.join()
+    return process.pid
+
+
+class TestSharedFrameRing:
+    """Test cases for SharedFrameRing"""
+    
+    def test_roundtrip(self, ring):
+        """Readers see the frame and its header"""
+        ring.write("CAM001", 7, 123.5, _frame(42))
+        with ring.latest("CAM001") as frame:
+            assert (frame.camera_id, frame.sequence, frame.timestamp) == ("CAM001", 7, 123.5)
+            assert frame.array.shape == (4, 6, 3)
+            assert frame.array[0, 0, 0] == 42
+            assert not frame.array.flags.writeable
+    
+    def test_latest_per_camera(self, ring):
+        """The newest frame of the requested camera is returned"""
+        ring.write("CAM001", 1, 1.0, _frame(1))
+        ring.write("CAM002", 1, 1.0, _frame(2))
+        ring.write("CAM001", 2, 2.0, _frame(3))
+        with ring.latest("CAM001") as frame:
+            assert frame.sequence == 2
+        assert ring.latest("CAM001", after=2) is None
+        assert ring.latest("CAM003") is None
+    
+    def test_pinned_slots_are_not_overwritten(self, ring):
+        """Writers skip pinned slots and drop frames when all are pinned"""
+        ring.write("CAM001", 1, 1.0, _frame(1))
+        pinned = ring.latest("CAM001")
+        for sequence in range(2, 6):
+            ring.write("CAM001", sequence, float(sequence), _frame(sequence))
+        assert pinned.array[0, 0, 0] == 1
+        
+        held = [pinned, ring.latest("CAM001", after=4)]
+        ring.write("CAM001", 6, 6.0, _frame(6))
+        held.append(ring.latest("CAM001", after=5))
+        assert ring.write("CAM001", 7, 7.0, _frame(7)) is None
+        assert ring.stats()["dropped"] == 1
+        for frame in held:
+            frame.release()
+        assert ring.stats()["pinned"] == 0
+    
+    def test_pending_returns_one_frame_per_camera(self, ring):
+        """pending() pins the newest unseen frame of each camera"""
+        ring.write("CAM001", 1, 1.0, _frame(1))
+        ring.write("CAM002", 4, 1.0, _frame(2))
+        frames = ring.pending({"CAM002": 4})
+        assert [frame.camera_id for frame in frames] == ["CAM001"]
+        for frame in frames:
+            frame.release()
+    
+    def test_concurrent_writers(self):
+        """Capture threads of several cameras can share one ring"""
+        ring = SharedFrameRing.create(slots=8, slot_bytes=4 * 6 * 3)
+        cameras = [f"CAM00{i}" for i in range(1, 5)]
+        
+        def capture(index):
+            for sequence in range(1, 201):
+                ring.write(cameras[index], sequence, float(sequence), _frame(index + 1))
+        
+        threads = [threading.Thread(target=capture, args=(i,)) for i in range(len(cameras))]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        try:
+            assert ring.stats()["written"] + ring.stats()["dropped"] == 800
+            frames = ring.pending()
+            assert frames and ring.stats()["pinned"] == len(frames)
+            for frame in frames:
+                # Every slot holds one whole frame of the camera in its header
+                assert (frame.array == cameras.index(frame.camera_id) + 1).all()
+                frame.release()
+            assert all(ring._read_header(slot)[0] != SLOT_WRITING for slot in range(ring.slots))
+        finally:
+            ring.close()
+    
+    def test_pins_of_exited_reader_are_reclaimed(self, ring):
+        """A reader that dies holding a pin does not keep the slot forever"""
+        ring.write("CAM001", 1, 1.0, _frame(1))
+        _dead_pid(ring.handle(), "CAM001")
+        assert ring.stats()["pinned"] == 1
+        assert ring.reclaim() == 1
+        assert ring.stats()["pinned"] == 0
+    
+    def test_writer_reclaims_before_dropping(self, ring):
+        """Slots pinned by exited readers or left half-written are reused"""
+        ring.write("CAM001", 1, 1.0, _frame(1))
+        _dead_pid(ring.handle(), "CAM001")
+        ring.write("CAM001", 2, 2.0, _frame(2))
+        ring._write_header(2, SLOT_WRITING, 0, 0, 0.0, b"", 0, 0, 0, 0, _dead_pid(ring.handle(), "CAM001"), *NO_PINS)
+        held = ring.latest("CAM001")
+        
+        assert ring.write("CAM001", 3, 3.0, _frame(3)) is not None
+        assert ring.write("CAM001", 4, 4.0, _frame(4)) is not None
+        assert ring.stats()["dropped"] == 0
+        held.release()
+    
+    def test_oversized_frame(self, ring):
+        """Frames larger than a slot are rejected"""
+        with pytest.raises(ValueError):
+            ring.write("CAM001", 1, 1.0, np.zeros((10, 10, 3), dtype=np.uint8))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
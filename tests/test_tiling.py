@@ -0,0 +1,124 @@
+"""
+Unit tests for ROI-cropped and tiled inference
+"""
+
+import pytest
+from backend.app.services.tiling import (
+    RegionLayout, detect_tiled, nms, parse_roi, point_in_polygon, tile_rect
+)
+
+
+def _box(x1, y1, x2, y2, conf=0.9, class_id=1):
+    return {'bbox': (x1, y1, x2, y2), 'confidence': conf, 'class_id': class_id,
+            'class_name': 'no_helmet' if class_id else 'helmet'}
+
+
+class _GridDetector:
+    """Detector stub that finds a no-helmet rider wherever a marked pixel block lies in a crop."""
+    
+    def __init__(self):
+        self.batch_sizes = []
+    
+    def detect_batch(self, images, return_crops=False):
+        self.batch_sizes.append(len(images))
+        results = []
+        for image in images:
+            ys, xs = image[:, :, 0].nonzero()
+            found = {'helmets': [], 'no_helmets': [], 'raw_results': []}
+            if len(xs):
+                found['no_helmets'].append(_box(int(xs.min()), int(ys.min()), int(xs.max()) + 1, int(ys.max()) + 1))
+            results.append(found)
+        return results
+
+
+class TestTilingGeometry:
+    """Test cases for ROI parsing and tile planning"""
+    
+    def test_parse_single_and_multiple_polygons(self):
+        """A bare polygon and a JSON list of polygons both parse"""
+        assert parse_roi([[0, 0], [10, 0], [10, 10]]) == [[(0.0, 0.0), (10.0, 0.0), (10.0, 10.0)]]
+        assert len(parse_roi("[[[0,0],[1,0],[1,1]], [[0,0],[0,1],[1,1]]]")) == 2
+        assert parse_roi(None) == []
+        with pytest.raises(ValueError):
+            parse_roi([[0, 0], [1, 1]])
+    
+    def test_point_in_polygon(self):
+        """Ray casting distinguishes inside from outside"""
+        triangle = [(0, 0), (10, 0), (0, 10)]
+        assert point_in_polygon(2, 2, triangle)
+        assert not point_in_polygon(8, 8, triangle)
+    
+    def test_tiles_cover_with_overlap(self):
+        """Tiles overlap by the requested share and end flush with the region"""
+        tiles = tile_rect((0, 0, 1920, 1080), 640, 0.25)
+        xs = sorted({tile[0] for tile in tiles})
+        ys = sorted({tile[1] for tile in tiles})
+        assert xs == [0, 480, 960, 1280]
+        assert ys == [0, 440]
+        assert all(x2 - x1 == 640 and y2 - y1 == 640 for x1, y1, x2, y2 in tiles)
+    
+    def test_small_region_is_one_tile(self):
+        """A region smaller than a tile is analysed as is"""
+        assert tile_rect((100, 100, 400, 300), 640, 0.2) == [(100, 100, 400, 300)]
+    
+    def test_normalized_roi_regions(self):
+        """Fractional ROI coordinates scale to the frame and bound the crop"""
+        layout = RegionLayout(roi=[[0.5, 0.5], [1.0, 0.5], [1.0, 1.0], [0.5, 1.0]], tile_size=0)
+        assert layout.regions((1080, 1920, 3)) == [(960, 540, 1920, 1080)]
+        assert layout.contains((1000, 600, 1100, 700), (1080, 1920, 3))
+        assert not layout.contains((10, 10, 50, 50), (1080, 1920, 3))
+    
+    def test_whole_frame_without_layout(self):
+        """No ROI and no tiling analyses the whole frame"""
+        layout = RegionLayout(roi=None, tile_size=0)
+        assert not layout.enabled
+        assert layout.regions((720, 1280, 3)) == [(0, 0, 1280, 720)]
+
+
+class TestTiledMerge:
+    """Test cases for merging tile detections"""
+    
+    def test_nms_keeps_best_per_class(self):
+        """Overlapping boxes of one class collapse; other classes are kept"""
+        kept = nms([
+            _box(0, 0, 100, 100, 0.9),
+            _box(5, 5, 100, 100, 0.8),
+            _box(0, 0, 100, 100, 0.7, class_id=0)
+        ], 0.5)
+        assert [d['confidence'] for d in kept] == [0.9, 0.7]
+    
+    def test_nms_drops_partial_box_from_tile_edge(self):
+        """A box cut by a tile edge is suppressed by the whole one"""
+        kept = nms([_box(100, 100, 200, 200, 0.9), _box(100, 100, 140, 200, 0.8)], 0.5)
+        assert len(kept) == 1
+    
+    def test_detect_tiled_maps_to_frame_coordinates(self):
+        """Tile detections are offset to frame pixels, deduplicated and batched once"""
+        np = pytest.importorskip("numpy")
+        frame = np.zeros((1080, 1920, 3), dtype=np.uint8)
+        frame[500:540, 1000:1040, 0] = 255
+        detector = _GridDetector()
+        
+        result = detect_tiled(detector, [frame], [RegionLayout(tile_size=640, overlap=0.25)])[0]
+        assert detector.batch_sizes == [8]
+        assert [d['bbox'] for d in result['no_helmets']] == [(1000, 500, 1040, 540)]
+    
+    def test_detect_tiled_filters_outside_roi(self):
+        """Detections outside the ROI polygon are discarded"""
+        np = pytest.importorskip("numpy")
+        frame = np.zeros((720, 1280, 3), dtype=np.uint8)
+        frame[100:120, 100:120, 0] = 255
+        layout = RegionLayout(roi=[[0, 0], [640, 0], [0, 360]], tile_size=0)
+        
+        result = detect_tiled(_GridDetector(), [frame], [layout])[0]
+        assert [d['bbox'] for d in result['no_helmets']] == [(100, 100, 120, 120)]
+        
+        # Inside the crop's bounding box, but beyond the polygon's diagonal
+        frame[:] = 0
+        frame[300:320, 500:520, 0] = 255
+        result = detect_tiled(_GridDetector(), [frame], [layout])[0]
+        assert result['no_helmets'] == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,155 @@
+"""
+Unit tests for the batch detection endpoint
+"""
+
+import io
+import json
+import zipfile
+import cv2
+import numpy as np
+import pytest
+from fastapi import FastAPI, UploadFile
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+from backend.app.models.database import Base, Violation, ViolationTypeEnum
+from backend.app.routes import violations as violation_routes
+from backend.app.services.complete_pipeline import CompletePipeline
+
+
+class TrackingSession(Session):
+    """Session that remembers whether it was closed."""
+    
+    closed = False
+    
+    def close(self):
+        self.closed = True
+        super().close()
+
+
+class FakeDetector:
+    """Reports one helmet violation per frame"""
+    
+    def process_batch(self, frames, latitude, longitude, location_name):
+        return [
+            {'violations': [{'type': ViolationTypeEnum.HELMET_NOT_WORN, 'vehicle_number': 'KA01AB1234', 'confidence': 0.9}]}
+            for _ in frames
+        ]
+
+
+class FakePipeline:
+    """Pipeline stand-in without a session of its own"""
+    
+    process_batch = CompletePipeline.process_batch
+    
+    def __init__(self):
+        self.db = None
+        self.auto_issue_challan = False
+        self.sessions = []
+    
+    def _pipeline(self, camera_id=None, db=None):
+        self.sessions.append(db)
+        return FakeDetector()
+
+
+def png(value=0):
+    return cv2.imencode(".png", np.full((8, 8, 3), value, dtype=np.uint8))[1].tobytes()
+
+
+def archive(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as zf:
+        for name, data in members.items():
+            zf.writestr(name, data)
+    return buffer.getvalue()
+
+
+FORM = {"latitude": "12.97", "longitude": "77.59", "location_name": "MG Road", "batch_size": "2"}
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'batch.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine, class_=TrackingSession)
+    monkeypatch.setattr(violation_routes, "SessionLocal", factory)
+    yield factory
+    engine.dispose()
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    pipeline = FakePipeline()
+    monkeypatch.setattr(violation_routes, "_batch_pipeline", pipeline)
+    return pipeline
+
+
+@pytest.fixture
+def client(session_factory, pipeline):
+    app = FastAPI()
+    app.include_router(violation_routes.router)
+    return TestClient(app)
+
+
+def results(response):
+    return [json.loads(line) for line in response.text.splitlines()]
+
+
+class TestDetectBatch:
+    """Test cases for POST /api/violations/detect/batch"""
+    
+    def test_images_and_archives_are_processed(self, client, session_factory):
+        """Uploads are still readable while the response streams"""
+        files = [
+            ("files", ("a.png", png(1), "image/png")),
+            ("files", ("b.png", png(2), "image/png")),
+            ("files", ("more.zip", archive({"c.png": png(3), "d.jpg": b"not an image", "notes.txt": b"x"}), "application/zip")),
+        ]
+        response = client.post("/api/violations/detect/batch", files=files, data=FORM)
+        assert response.status_code == 200
+        
+        lines = results(response)
+        summary = lines[-1]
+        assert summary["images"] == 4
+        assert (summary["processed"], summary["failed"], summary["violations_detected"]) == (3, 1, 3)
+        statuses = {line["filename"]: line["status"] for line in lines[:-1]}
+        assert statuses == {"a.png": "success", "b.png": "success",
+                            "more.zip/c.png": "success", "more.zip/d.jpg": "error"}
+        
+        db = session_factory()
+        assert db.query(Violation).count() == 3
+        db.close()
+    
+    def test_session_per_request(self, client, pipeline):
+        """Each request writes through its own session, closed when the stream ends"""
+        for _ in range(2):
+            response = client.post("/api/violations/detect/batch",
+                                   files=[("files", ("a.png", png(), "image/png"))], data=FORM)
+            assert results(response)[-1]["processed"] == 1
+        
+        first, second = pipeline.sessions
+        assert first is not None and first is not second
+        assert first.closed and second.closed
+    
+    def test_spooled_copies_outlive_uploads(self):
+        """The batch reads its own copies, not the form's files"""
+        upload = UploadFile(io.BytesIO(png()), filename="a.png")
+        spooled = violation_routes._spool_uploads([upload])
+        upload.file.close()
+        try:
+            assert spooled[0][0] == "a.png"
+            assert spooled[0][2].read() == png()
+        finally:
+            violation_routes._close_spooled(spooled)
+    
+    def test_no_images(self, client, pipeline):
+        """An upload without images is rejected before streaming"""
+        response = client.post("/api/violations/detect/batch",
+                               files=[("files", ("notes.zip", archive({"notes.txt": b"x"}), "application/zip"))],
+                               data=FORM)
+        assert response.status_code == 400
+        assert pipeline.sessions == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])